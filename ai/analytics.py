@@ -0,0 +1,144 @@
+# ai/analytics.py
+"""
+내장 컬럼형 SQL 엔진(DuckDB) 기반 지표 집계 백엔드 (선택 사항).
+
+config.settings.ANALYTICS_BACKEND=duckdb 이면
+- 로컬 스냅샷(현재 세대의 Parquet 파티션)을 프로세스 전역 in-memory DuckDB 의 뷰로 등록하고
+  스냅샷이 바뀌면(refresh → CURRENT 교체) 해당 뷰만 새 세대로 다시 만든다.
+  데이터는 복사하지 않고 쿼리마다 Parquet 를 직접 읽는다 (pandas 프레임 적재 없음).
+- 리포트 집계(QueryFanout)와 지역 추천 지표 평균을 MySQL 왕복 없이 이 엔진에서 실행한다.
+  (필요한 컬럼만 읽고 row group min/max 통계로 조건 푸시다운, 쿼리 내부는 멀티스레드 실행)
+- 쿼리는 기존 pymysql 자리표시자(%s) 그대로 쓰고, 실행 직전에 DuckDB(?)로 바꾼다.
+
+duckdb 가 설치되어 있지 않거나 ANALYTICS_BACKEND=mysql(기본)이면 enabled() 가 False 이고
+호출자는 기존 경로(MySQL / pandas)를 그대로 사용한다.
+"""
+import os
+import re
+import threading
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+from config.settings import ANALYTICS_BACKEND, ANALYTICS_THREADS
+from ai import snapshots
+from ai.dataset_registry import STR_COLUMNS
+
+try:
+    import duckdb
+except ImportError:   # 선택 의존성
+    duckdb = None
+
+_TABLE_RE = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_][A-Za-z0-9_]*)", re.IGNORECASE)
+
+# 뷰에는 rowid 가 없으므로 원본 행 순서(파일 경로, 파일 내 행 번호)를 구조체 열로 노출
+# (MIN(ROW_ORDER) → 그룹의 첫 등장 행, 레지스트리 프레임의 행 순서와 같음)
+ROW_ORDER = "_row_order"
+
+
+def enabled() -> bool:
+    return ANALYTICS_BACKEND == "duckdb" and duckdb is not None
+
+
+def referenced_tables(sql: str) -> List[str]:
+    return list(dict.fromkeys(_TABLE_RE.findall(sql)))
+
+
+def _sql_literal(text: str) -> str:
+    return "'" + text.replace("'", "''") + "'"
+
+
+def snapshot_signature(table: str):
+    """CURRENT 포인터(세대 도입 전 배치면 _SUCCESS)의 (inode, mtime, size) — 프레임은 읽지 않음"""
+    try:
+        st = os.stat(snapshots.snapshot_marker(table))
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class AnalyticsEngine:
+    """스냅샷 → DuckDB 뷰 동기화 + 스레드별 커서로 쿼리 실행"""
+
+    def __init__(self, threads: int = 0):
+        self._con = duckdb.connect(database=":memory:")
+        if threads > 0:
+            self._con.execute(f"SET threads TO {int(threads)}")
+        self._loaded: Dict[str, tuple] = {}   # table → 뷰 생성 시점 스냅샷 signature
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self._local = threading.local()
+
+    def _cursor(self):
+        cur = getattr(self._local, "cursor", None)
+        if cur is None:
+            cur = self._local.cursor = self._con.cursor()
+        return cur
+
+    def _lock_for(self, table: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(table, threading.Lock())
+
+    def ensure(self, table: str) -> None:
+        """스냅샷이 바뀌었을 때만 DuckDB 뷰를 현재 세대의 Parquet 파티션으로 다시 만든다"""
+        sig = snapshot_signature(table)
+        if sig is not None and self._loaded.get(table) == sig:
+            return
+        with self._lock_for(table):
+            if sig is None:
+                snapshots.ensure_snapshot(table)
+                sig = snapshot_signature(table)
+            if self._loaded.get(table) == sig:
+                return
+            path = snapshots.snapshot_path(table)
+            files = os.path.join(path, f"{snapshots.PARTITION_YEAR}=*", f"{snapshots.PARTITION_GU}=*", "*.parquet")
+            source = (f"read_parquet({_sql_literal(files)}, hive_partitioning = true, union_by_name = true, "
+                      f"filename = true, file_row_number = true)")
+            cur = self._con.cursor()
+            try:
+                types = {row[0]: row[1] for row in cur.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()}
+                # 레지스트리와 같은 dtype 정규화(키 컬럼 → 문자열), 파티션 컬럼은 숨김
+                casts = [f'CAST("{c}" AS VARCHAR) AS "{c}"' for c in STR_COLUMNS
+                         if c in types and types[c] != "VARCHAR"]
+                hidden = [f'"{c}"' for c in (snapshots.PARTITION_YEAR, snapshots.PARTITION_GU,
+                                             "filename", "file_row_number") if c in types]
+                select = f"* EXCLUDE ({', '.join(hidden)})"
+                if casts:
+                    select += f" REPLACE ({', '.join(casts)})"
+                select += f", {{'file': filename, 'row': file_row_number}} AS {ROW_ORDER}"
+                cur.execute(f'CREATE OR REPLACE VIEW "{table}" AS SELECT {select} FROM {source}')
+            finally:
+                cur.close()
+            self._loaded[table] = sig
+            print(f"🦆 분석 뷰 등록: {table} → {path}")
+
+    def query(self, sql: str, params: Iterable = ()) -> pd.DataFrame:
+        for table in referenced_tables(sql):
+            self.ensure(table)
+        return self._cursor().execute(sql.replace("%s", "?"), list(params or ())).df()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_analytics() -> AnalyticsEngine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = AnalyticsEngine(threads=ANALYTICS_THREADS)
+    return _engine
+
+
+def read_sql(sql: str, engine, params=()) -> pd.DataFrame:
+    """
+    분석 백엔드가 켜져 있으면 DuckDB 에서, 아니면(또는 실패 시) 기존처럼 DB 에서 실행.
+    스냅샷으로 관리하지 않는 테이블 등으로 실패하면 원격 DB 로 되돌아간다.
+    """
+    if enabled():
+        try:
+            return get_analytics().query(sql, params)
+        except Exception as e:
+            print(f"⚠️ [analytics] DuckDB 실행 실패 → DB 조회로 대체: {e}")
+    return pd.read_sql_query(sql, engine, params=params)
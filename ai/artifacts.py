@@ -0,0 +1,80 @@
+# ai/artifacts.py
+"""
+추천 파이프라인 중간 산출물(JSON/CSV) 내보내기 — 디버깅/분석용, 기본 꺼짐.
+
+- EXPORT_ARTIFACTS=1 일 때만 동작 (기본 요청 경로는 파일 I/O 없음)
+- 요청마다 별도 디렉토리: ARTIFACT_DIR/<kind>/<키>-<시각>-<id>/
+  → 동시 요청이 서로의 파일을 덮어쓰지 않음
+- 쓰기는 전용 스레드 1개에서 비동기로 수행 (응답 지연 없음)
+
+사용 예:
+    export_artifacts("area", (gu_name, category_small), {"merged_dong": merged_df, ...})
+"""
+import os
+import re
+import json
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+
+import pandas as pd
+
+from config.settings import CACHE_DIR
+
+EXPORT_ARTIFACTS = os.getenv("EXPORT_ARTIFACTS", "0") == "1"
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", os.path.join(CACHE_DIR, "artifacts"))
+
+# CSV 로도 남길 산출물 (엑셀 확인용)
+CSV_ARTIFACTS = {"filtered_result_dong", "filtered_result_industry"}
+
+_RE_UNSAFE = re.compile(r'[^0-9A-Za-z가-힣_.-]+')
+
+_writer: Optional[ThreadPoolExecutor] = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer() -> ThreadPoolExecutor:
+    """쓰기 전용 스레드 1개 (동시 첫 요청에도 1개만 생성 → 쓰기 직렬화 유지)"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact")
+    return _writer
+
+
+def _namespace(kind: str, key_parts: Iterable[Any]) -> str:
+    slug = "_".join(_RE_UNSAFE.sub("", str(p)) for p in key_parts) or "request"
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(ARTIFACT_DIR, kind, f"{slug}-{stamp}-{uuid.uuid4().hex[:8]}")
+
+
+def _write(out_dir: str, items: Dict[str, Any]) -> None:
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+        for name, obj in items.items():
+            path = os.path.join(out_dir, name)
+            if isinstance(obj, pd.DataFrame):
+                obj.to_json(f"{path}.json", orient="records", force_ascii=False, indent=4)
+                if name in CSV_ARTIFACTS:
+                    obj.to_csv(f"{path}.csv", index=False, encoding="utf-8-sig")
+            else:
+                with open(f"{path}.json", "w", encoding="utf-8") as f:
+                    json.dump(obj, f, ensure_ascii=False, indent=4, default=str)
+        print(f"📝 산출물 저장: {out_dir}")
+    except Exception as e:
+        print(f"⚠️ 산출물 저장 실패 ({out_dir}): {e}")
+
+
+def export_artifacts(kind: str, key_parts: Iterable[Any], items: Dict[str, Any]) -> Optional[str]:
+    """
+    EXPORT_ARTIFACTS 가 켜져 있으면 items(이름 → DataFrame/JSON 객체)를 백그라운드로 저장.
+    호출 이후 items 의 객체를 수정하지 말 것. return: 저장 디렉토리 (꺼져 있으면 None)
+    """
+    if not EXPORT_ARTIFACTS or not items:
+        return None
+    out_dir = _namespace(kind, key_parts)
+    _get_writer().submit(_write, out_dir, dict(items))
+    return out_dir
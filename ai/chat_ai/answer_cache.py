@@ -0,0 +1,200 @@
+# ai/chat_ai/answer_cache.py
+"""
+/api/chat 답변 캐시 (프로세스 메모리, 의미 유사도 매칭).
+
+- 범위(scope): (지역, 업종, 레포트 종류) → 같은 맥락의 질문끼리만 재사용
+- 맥락(context): 레포트 본문 + 이전 대화의 지문. 답변이 이것에 의존하는 라우트(RAG)의 항목은
+  맥락까지 같을 때만 재사용하고, 그 밖의 라우트(CSV 수치/추천)는 맥락과 무관하게 재사용
+- 항목: 정규화된 질문 + 분류된 라우트(question_type) + (맥락) + 질문 임베딩 + 답변
+- 조회 순서: ① 정규화 질문 완전 일치 ② 같은 범위 항목과 임베딩 코사인 유사도 ≥ 임계값
+  → 적중하면 분류 LLM 호출과 답변 LLM 호출을 모두 생략
+- TTL 경과 항목은 무시/삭제, 항목 수 상한 초과 시 LRU 삭제
+- 스냅샷 data_version 또는 벡터 인덱스 파일이 바뀌면 전체 비움
+
+사용 예:
+    probe = ANSWER_CACHE.lookup(question, scope, context)
+    if probe.answer is not None:
+        return probe.answer
+    ... 분류/답변 ...
+    ANSWER_CACHE.store(probe, route, answer, uses_context=route_uses_context)
+"""
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+CHAT_CACHE_ENABLED = os.getenv("CHAT_CACHE_ENABLED", "1") == "1"
+CHAT_CACHE_TTL_SEC = int(os.getenv("CHAT_CACHE_TTL_SEC", "3600"))
+CHAT_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "1000"))
+CHAT_CACHE_SIM_THRESHOLD = float(os.getenv("CHAT_CACHE_SIM_THRESHOLD", "0.95"))
+
+_RE_WS = re.compile(r"\s+")
+_RE_TRAILING = re.compile(r"[\s?!.~…？！。]+$")
+
+
+def normalize_question(question: str) -> str:
+    """소문자 + 공백 정리 + 끝의 물음표/마침표 제거 ("임대료 얼마야?" == "임대료  얼마야")"""
+    q = _RE_WS.sub(" ", str(question or "")).strip().lower()
+    return _RE_TRAILING.sub("", q)
+
+
+@dataclass
+class CacheProbe:
+    """lookup 결과. 미스면 store() 에 그대로 넘겨 정규화/임베딩을 재사용"""
+    scope: Tuple
+    question: str
+    context: Optional[Hashable] = None
+    vector: Optional[np.ndarray] = None
+    answer: Optional[str] = None
+    route: Optional[str] = None
+    match: str = "miss"          # exact | semantic | miss | disabled
+
+
+class AnswerCache:
+    def __init__(self, embed: Optional[Callable[[str], List[float]]] = None,
+                 version: Optional[Callable[[], Hashable]] = None,
+                 ttl_sec: int = CHAT_CACHE_TTL_SEC, max_entries: int = CHAT_CACHE_MAX_ENTRIES,
+                 threshold: float = CHAT_CACHE_SIM_THRESHOLD, enabled: bool = CHAT_CACHE_ENABLED):
+        self.embed = embed
+        self.version = version
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.enabled = enabled
+        # (scope, route, 정규화 질문, 맥락 | None) → {vector, answer, stored_at}
+        self._entries: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.exact_hits = self.semantic_hits = self.misses = self.invalidations = 0
+
+    # ── 내부 ──────────────────────────────────────────────────────────────
+    def _check_version(self) -> None:
+        """lock 보유 상태에서 호출. 데이터/인덱스 버전이 바뀌면 전부 비움"""
+        if self.version is None:
+            return
+        current = self.version()
+        if current != self._version:
+            if self._entries:
+                self.invalidations += 1
+                print(f"🧹 채팅 답변 캐시 비움 (버전 변경: {self._version} → {current})")
+            self._entries.clear()
+            self._version = current
+
+    def _expired(self, entry: Dict, now: float) -> bool:
+        return bool(self.ttl_sec) and now - entry["stored_at"] > self.ttl_sec
+
+    def _embed(self, question: str) -> Optional[np.ndarray]:
+        if self.embed is None or not question:
+            return None
+        try:
+            vec = np.asarray(self.embed(question), dtype=np.float32)
+        except Exception as e:
+            print(f"⚠️ [answer_cache] 임베딩 실패 → 완전 일치만 사용: {e}")
+            return None
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else None
+
+    def _hit(self, key: Tuple, probe: CacheProbe, match: str) -> CacheProbe:
+        entry = self._entries[key]
+        self._entries.move_to_end(key)
+        probe.answer, probe.route, probe.match = entry["answer"], key[1], match
+        if match == "exact":
+            self.exact_hits += 1
+        else:
+            self.semantic_hits += 1
+        return probe
+
+    @staticmethod
+    def _matches(key: Tuple, probe: CacheProbe) -> bool:
+        """같은 범위 + (맥락 무관 항목이거나 맥락이 같은 항목)"""
+        return key[0] == probe.scope and key[3] in (None, probe.context)
+
+    # ── 조회/저장 ─────────────────────────────────────────────────────────
+    def lookup(self, question: str, scope: Tuple, context: Optional[Hashable] = None) -> CacheProbe:
+        probe = CacheProbe(scope=tuple(scope), question=normalize_question(question), context=context)
+        if not self.enabled or not probe.question:
+            probe.match = "disabled"
+            return probe
+
+        now = time.time()
+        with self._lock:
+            self._check_version()
+            for key in [k for k, e in self._entries.items() if self._expired(e, now)]:
+                del self._entries[key]
+            for key in reversed(self._entries):
+                if key[2] == probe.question and self._matches(key, probe):
+                    return self._hit(key, probe, "exact")
+            has_scope = any(self._matches(key, probe) for key in self._entries)
+
+        # 임베딩은 원격 호출이므로 lock 밖에서 (범위에 항목이 없어도 store 용으로 계산)
+        probe.vector = self._embed(probe.question)
+        if probe.vector is None or not has_scope:
+            with self._lock:
+                self.misses += 1
+            return probe
+
+        with self._lock:
+            keys = [k for k, e in self._entries.items()
+                    if self._matches(k, probe) and e["vector"] is not None and not self._expired(e, now)]
+            if keys:
+                sims = np.stack([self._entries[k]["vector"] for k in keys]) @ probe.vector
+                best = int(np.argmax(sims))
+                if sims[best] >= self.threshold:
+                    return self._hit(keys[best], probe, "semantic")
+            self.misses += 1
+        return probe
+
+    def store(self, probe: CacheProbe, route: str, answer: str, uses_context: bool = False) -> None:
+        """uses_context: 답변이 레포트 본문/이전 대화에 의존하는 라우트면 True (맥락이 같을 때만 재사용)"""
+        if not self.enabled or probe.match != "miss" or not answer:
+            return
+        key = (probe.scope, route, probe.question, probe.context if uses_context else None)
+        with self._lock:
+            self._check_version()
+            self._entries[key] = {"vector": probe.vector, "answer": answer, "stored_at": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = len(self._entries)
+        hits = self.exact_hits + self.semantic_hits
+        total = hits + self.misses
+        return {
+            "entries": entries,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "invalidations": self.invalidations,
+            "threshold": self.threshold,
+            "ttl_sec": self.ttl_sec,
+            "max_entries": self.max_entries,
+        }
+
+
+# ====== 프로세스 전역 캐시 ======
+def _embed_question(question: str) -> List[float]:
+    from .gpt_consultant import embedding   # RAG 와 같은 임베딩 모델 재사용
+    return embedding.embed_query(question)
+
+
+def _chat_data_version() -> Tuple:
+    """(스냅샷 data_version, 벡터 인덱스 (mtime, size)) — 둘 중 하나라도 바뀌면 캐시 무효화"""
+    from ..snapshots import get_data_version
+    from .vector_store import index_signature
+    from .config import VECTOR_DB_DIR
+    return get_data_version(), index_signature(VECTOR_DB_DIR)
+
+
+ANSWER_CACHE = AnswerCache(embed=_embed_question, version=_chat_data_version)
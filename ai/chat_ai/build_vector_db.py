@@ -1,50 +1,165 @@
 import os
+import json
+import hashlib
+import argparse
+from typing import Dict, List, Tuple
+
 from .pdf_loader import extract_text_from_pdf
 from .text_splitter import split_text
-from .rag_embedder import save_to_vectorstore
+from .rag_embedder import save_to_vectorstore, update_vectorstore
+from .vector_store import MANIFEST_NAME, index_path, index_signature
 from .config import PROJECT_ROOT
 
 # PDF와 벡터 저장 경로 지정
 PDF_DIR_DEFAULT = os.path.join(PROJECT_ROOT, "data")
 VECTOR_DB_DIR_DEFAULT = os.path.join(PROJECT_ROOT, "data", "vector_db")
 
+# 매니페스트(인덱스 세대 폴더의 MANIFEST_NAME): 빌드 설정 + PDF 내용 해시 + 문서별 청크 ID
+# (인덱스와 함께 CURRENT 교체로 공개되므로 둘이 어긋나지 않음, 설정이 바뀌면 전체 재구축)
+EMBEDDING_MODEL = "text-embedding-3-small"
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+
+
+def _build_settings() -> Dict:
+    return {"embedding_model": EMBEDDING_MODEL, "chunk_size": CHUNK_SIZE, "chunk_overlap": CHUNK_OVERLAP}
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def chunk_ids(filename: str, chunks: List[str]) -> List[str]:
+    """청크 ID = (파일명, 청크 내용) 해시 + 같은 내용 반복 순번 → 내용이 같으면 같은 ID"""
+    seen: Dict[str, int] = {}
+    out = []
+    for chunk in chunks:
+        digest = hashlib.sha256(f"{filename}\0{chunk}".encode("utf-8")).hexdigest()[:24]
+        n = seen.get(digest, 0)
+        seen[digest] = n + 1
+        out.append(f"{digest}-{n}")
+    return out
+
+
+def load_manifest(vector_dir: str) -> Dict:
+    """현재 인덱스 세대의 매니페스트 (없으면 {} → 전체 재구축)"""
+    path = os.path.join(index_path(vector_dir), MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ 매니페스트 읽기 실패 → 전체 재구축: {e}")
+        return {}
+
+
+def _save_manifest(vector_dir: str, manifest: Dict) -> None:
+    """인덱스는 그대로이고 매니페스트만 바뀔 때 (현재 세대 폴더에 원자적으로 덮어씀)"""
+    path = os.path.join(index_path(vector_dir), MANIFEST_NAME)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _index_exists(vector_dir: str) -> bool:
+    return index_signature(vector_dir) is not None
+
+
+def _document_chunks(path: str, filename: str) -> Tuple[List[str], List[str]]:
+    text = extract_text_from_pdf(path)
+    if not text:
+        print(f"⚠️ 텍스트 추출 실패: {filename}")
+        return [], []
+    chunks = [c.strip() for c in split_text(text, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)]
+    chunks = [c for c in chunks if c]
+    return chunks, chunk_ids(filename, chunks)
+
+
 def process_all_pdfs(pdf_dir=PDF_DIR_DEFAULT,
-                     vector_dir=VECTOR_DB_DIR_DEFAULT):
+                     vector_dir=VECTOR_DB_DIR_DEFAULT,
+                     force=False):
+    """
+    PDF → 벡터스토어 (증분).
+    - 내용 해시가 같은 PDF 는 텍스트 추출/임베딩 생략
+    - 바뀐 PDF 는 새로 나뉜 청크 중 기존에 없던 것만 임베딩, 사라진 청크는 삭제
+    - 폴더에서 지워진 PDF 의 벡터는 삭제
+    - 인덱스/매니페스트가 없거나 설정이 바뀌었거나 force=True 면 전체 재구축
+    """
     print(f"📁 PDF 디렉토리 경로: {pdf_dir}")
     print(f"💾 벡터 저장 경로: {vector_dir}")
 
     os.makedirs(vector_dir, exist_ok=True)
 
-    texts = []
-    found_pdf = False
-    for filename in sorted(os.listdir(pdf_dir)):
-        print(f"🔍 발견한 파일: {filename}")
-        if filename.lower().endswith(".pdf"):
-            found_pdf = True
-            path = os.path.join(pdf_dir, filename)
-            print(f"📄 처리 중: {filename}")
-            text = extract_text_from_pdf(path)
-            if text:
-                texts.append(text)
-            else:
-                print(f"⚠️ 텍스트 추출 실패: {filename}")
-
-    if not found_pdf:
+    pdfs = [f for f in sorted(os.listdir(pdf_dir)) if f.lower().endswith(".pdf")]
+    if not pdfs:
         print("❌ PDF 파일이 없습니다. 디렉토리를 확인하세요.")
         return vector_dir
 
-    if not texts:
-        print("⚠️ PDF에서 텍스트를 추출하지 못했습니다.")
-        return vector_dir
+    manifest = load_manifest(vector_dir)
+    rebuild = force or not _index_exists(vector_dir) or manifest.get("settings") != _build_settings()
+    old_docs = {} if rebuild else manifest.get("documents", {})
+    if rebuild:
+        print("🧱 전체 재구축 (인덱스/매니페스트 없음 또는 설정 변경)")
+
+    documents: Dict[str, Dict] = {}
+    add_texts: List[str] = []
+    add_ids: List[str] = []
+    delete_ids: List[str] = []
+
+    for filename in pdfs:
+        path = os.path.join(pdf_dir, filename)
+        sha = file_sha256(path)
+        prev = old_docs.get(filename)
+        if prev and prev.get("sha256") == sha:
+            print(f"⏭️ 변경 없음: {filename}")
+            documents[filename] = prev
+            continue
 
-    full_text = "\n\n".join(texts)
-    chunks = split_text(full_text)
+        print(f"📄 처리 중: {filename}")
+        chunks, ids = _document_chunks(path, filename)
+        old_ids = set(prev.get("chunk_ids", [])) if prev else set()
+        new_ids = set(ids)
+        for chunk, cid in zip(chunks, ids):
+            if cid not in old_ids:
+                add_texts.append(chunk)
+                add_ids.append(cid)
+        delete_ids.extend(sorted(old_ids - new_ids))
+        documents[filename] = {"sha256": sha, "chunk_ids": ids}
 
-    print(f"🧩 청크 수: {len(chunks)}")
+    for filename, prev in old_docs.items():
+        if filename not in documents:
+            print(f"🗑️ 삭제된 문서: {filename}")
+            delete_ids.extend(prev.get("chunk_ids", []))
+
+    new_manifest = {"settings": _build_settings(), "documents": documents}
+    if rebuild:
+        if not add_texts:
+            print("⚠️ PDF에서 텍스트를 추출하지 못했습니다.")
+            return vector_dir
+        print(f"🧩 청크 수: {len(add_texts)}")
+        save_to_vectorstore(add_texts, save_path=vector_dir, embedding_model=EMBEDDING_MODEL, ids=add_ids,
+                            manifest=new_manifest)
+    elif add_texts or delete_ids:
+        print(f"🧩 추가 청크 {len(add_texts)}개 / 삭제 청크 {len(delete_ids)}개")
+        update_vectorstore(vector_dir, add_texts, add_ids, delete_ids, embedding_model=EMBEDDING_MODEL,
+                           manifest=new_manifest)
+    elif documents == old_docs:
+        print("✅ 벡터스토어 최신 상태 (임베딩 호출 없음)")
+        return vector_dir
+    else:
+        _save_manifest(vector_dir, new_manifest)   # 파일 해시만 바뀌고 청크는 그대로
 
-    save_to_vectorstore(chunks, save_path=vector_dir)
-    print(f"\n✅ 총 {len(chunks)}개 chunk로 저장 완료.")
+    total = sum(len(d.get("chunk_ids", [])) for d in documents.values())
+    print(f"\n✅ 총 {total}개 chunk 인덱스 반영 완료.")
     return vector_dir
 
 if __name__ == "__main__":
-    process_all_pdfs()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="PDF → FAISS 벡터스토어 (증분 갱신)")
+    parser.add_argument("--force", action="store_true", help="매니페스트 무시하고 전체 재구축")
+    process_all_pdfs(force=parser.parse_args().force)
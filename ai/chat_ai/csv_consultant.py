@@ -2,9 +2,10 @@
 from .data_loader import load_csv_data, load_json_reasons
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
-from .gpt_consultant import llm
+from .gpt_consultant import llm, run_chain, stream_chain
 from .utils import normalize_location
 import pandas as pd
+from typing import Dict, Iterator, Optional, Tuple
 
 # 데이터 로드 (/back 경로에서 읽도록 data_loader가 처리)
 dong_df, industry_df = load_csv_data()
@@ -81,7 +82,8 @@ def get_recommendation_text(target_name: str, reasons: dict, mode: str) -> str:
             )
         return ""
 
-def answer_from_csv(question: str, target_name: str, mode: str = "dong") -> str:
+def _csv_inputs(question: str, target_name: str, mode: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """CSV 체인 입력 준비 → (inputs, None). 대상 행이 없으면 (None, 안내 문구)"""
     target_name = normalize_location(target_name)
     question = str(question).lower()
 
@@ -91,18 +93,31 @@ def answer_from_csv(question: str, target_name: str, mode: str = "dong") -> str:
 
     row_sel = df[df[column_name] == target_name]
     if row_sel.empty:
-        return f"{target_name}에 대한 데이터가 없어."
+        return None, f"{target_name}에 대한 데이터가 없어."
 
     row = row_sel.iloc[0]
     stats = extract_relevant_stats(question, row)
     reason_text = get_recommendation_text(target_name, reasons, mode)
 
-    out = csv_chain.invoke({
+    return {
         "target_name": target_name,
         "question": question,
         "stats": (stats + ("\n" + reason_text if reason_text else "")),
-    })
-    return out["text"] if isinstance(out, dict) else str(out)
+    }, None
+
+def answer_from_csv(question: str, target_name: str, mode: str = "dong") -> str:
+    inputs, message = _csv_inputs(question, target_name, mode)
+    if inputs is None:
+        return message
+    return run_chain(csv_chain, inputs)
+
+def stream_from_csv(question: str, target_name: str, mode: str = "dong") -> Iterator[str]:
+    """answer_from_csv 의 스트리밍 버전"""
+    inputs, message = _csv_inputs(question, target_name, mode)
+    if inputs is None:
+        yield message
+        return
+    yield from stream_chain(csv_chain, inputs)
 
 def answer_top_recommendation(question: str, top_n: int = 5) -> str:
     q_lower = str(question).lower()
@@ -126,17 +141,28 @@ def answer_top_recommendation(question: str, top_n: int = 5) -> str:
     lines = [f"{row['행정동명']} ({column}: {row[column]:,.1f} {unit})" for _, row in result.iterrows()]
     return f"{column} 기준 추천 TOP {top_n} 지역:\n" + "\n".join(lines)
 
+simple_prompt_template = PromptTemplate(
+    template=(
+        "서울 창업 컨설턴트야.\n"
+        "사용자 질문: {question}\n"
+        "지역: {location}\n\n"
+        "수치 분석 없이 간단한 아이디어나 추천만 필요한 상황이야.\n"
+        "메뉴, 브랜딩, 이름 추천 등 짧고 실용적인 조언을 해줘."
+    ),
+    input_variables=["question", "location"]
+)
+simple_chain = LLMChain(llm=llm, prompt=simple_prompt_template)
+
 def answer_simple_recommendation(question: str, location: str) -> str:
-    prompt = PromptTemplate(
-        template=(
-            "서울 창업 컨설턴트야.\n"
-            "사용자 질문: {question}\n"
-            "지역: {location}\n\n"
-            "수치 분석 없이 간단한 아이디어나 추천만 필요한 상황이야.\n"
-            "메뉴, 브랜딩, 이름 추천 등 짧고 실용적인 조언을 해줘."
-        ),
-        input_variables=["question", "location"]
-    )
-    chain = LLMChain(llm=llm, prompt=prompt)
-    out = chain.invoke({"question": question, "location": location})
-    return out["text"].strip() if isinstance(out, dict) else str(out).strip()
+    return run_chain(simple_chain, {"question": question, "location": location}).strip()
+
+def stream_simple_recommendation(question: str, location: str) -> Iterator[str]:
+    """answer_simple_recommendation 의 스트리밍 버전 (앞쪽 공백만 제거)"""
+    started = False
+    for token in stream_chain(simple_chain, {"question": question, "location": location}):
+        if not started:
+            token = token.lstrip()
+            if not token:
+                continue
+            started = True
+        yield token
@@ -1,17 +1,49 @@
 # ai/chat_ai/gpt_consultant.py
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Tuple
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 
 # ✅ 상대 임포트
 from .config import OPENAI_API_KEY, MODEL, VECTOR_DB_DIR
+from .vector_store import get_vectorstore
+from ..llm_cache import LLM_CACHE
 
 # ---- OpenAI 초기화 ----
 # 임베딩/LLM은 모듈 로드 시 1회 초기화
 embedding = OpenAIEmbeddings(openai_api_key=OPENAI_API_KEY)  # 기본: text-embedding-3-small
-llm = ChatOpenAI(model_name=MODEL, openai_api_key=OPENAI_API_KEY, temperature=0.3)
+LLM_TEMPERATURE = 0.3
+llm = ChatOpenAI(model_name=MODEL, openai_api_key=OPENAI_API_KEY, temperature=LLM_TEMPERATURE)
+
+
+def run_chain(chain: LLMChain, inputs: Dict) -> str:
+    """
+    LLMChain 실행 → 응답 텍스트. 완성된 프롬프트 기준으로 공용 LLM 캐시를 거치므로
+    같은 질문/맥락이면 원격 호출을 생략한다.
+    """
+    prompt = chain.prompt.format(**inputs)
+
+    def _call() -> str:
+        out = chain.invoke(inputs)
+        return out["text"] if isinstance(out, dict) else str(out)
+
+    text, _ = LLM_CACHE.get_or_call(MODEL, prompt, _call, params={"temperature": LLM_TEMPERATURE})
+    return text
+
+
+def stream_chain(chain: LLMChain, inputs: Dict) -> Iterator[str]:
+    """
+    run_chain 의 스트리밍 버전 → 응답 토큰 조각. 캐시 키가 같으므로 run_chain 과 캐시를 공유하고
+    (적중 시 전체 1회), 끝까지 받은 응답만 저장한다.
+    """
+    prompt = chain.prompt.format(**inputs)
+
+    def _stream() -> Iterator[str]:
+        for chunk in chain.llm.stream(prompt):
+            if chunk.content:
+                yield chunk.content
+
+    yield from LLM_CACHE.stream_or_call(MODEL, prompt, _stream, params={"temperature": LLM_TEMPERATURE})
 
 # ---- 시스템 프롬프트 ----
 system_context = """
@@ -120,31 +152,25 @@ prompt_template = PromptTemplate(
     ),
     input_variables=["context", "question", "location", "category", "report_type", "specific", "history"]
 )
+# 전역 체인 재사용
+rag_chain = LLMChain(llm=llm, prompt=prompt_template)
 
-def get_response_with_rag(
+def _rag_inputs(
     query: str,
-    vectorstore_path: Optional[str] = None,
-    context: str = "",
-    location: str = "",
-    category: str = "",
-    report_type: str = "",
-    history: Optional[List[Dict]] = None,
-) -> str:
-    """
-    RAG 기반 답변 생성.
-    - vectorstore_path 미지정 시 config.VECTOR_DB_DIR 사용
-    - history: [{role:'user'|'assistant'|'bot', content:str}, ...]
-    """
-    # 1) 벡터스토어 로드
+    vectorstore_path: Optional[str],
+    context: str,
+    location: str,
+    category: str,
+    report_type: str,
+    history: Optional[List[Dict]],
+) -> Tuple[Optional[Dict], Optional[str]]:
+    """RAG 체인 입력 준비 → (inputs, None). 벡터스토어가 없으면 (None, 안내 문구)"""
+    # 1) 벡터스토어 (프로세스 전역 1회 로드, 인덱스 파일이 바뀌면 교체)
     path = vectorstore_path or VECTOR_DB_DIR
     try:
-        db = FAISS.load_local(
-            folder_path=path,
-            embeddings=embedding,
-            allow_dangerous_deserialization=True
-        )
+        db = get_vectorstore(path, embedding)
     except Exception as e:
-        return f"지식베이스를 아직 준비하지 못했어요. (벡터스토어 경로: {path})\n관리자: 인덱스를 먼저 생성해 주세요. 상세: {e}"
+        return None, f"지식베이스를 아직 준비하지 못했어요. (벡터스토어 경로: {path})\n관리자: 인덱스를 먼저 생성해 주세요. 상세: {e}"
 
     retriever = db.as_retriever()
 
@@ -160,9 +186,7 @@ def get_response_with_rag(
     # 3) report_type별 세부 지시문
     specific_instructions = get_specific_instructions(report_type)
 
-    # 4) 프롬프트 + LLM 실행
-    chain = LLMChain(llm=llm, prompt=prompt_template)
-    out = chain.invoke({
+    return {
         "context": context,
         "question": query,
         "location": location,
@@ -170,5 +194,41 @@ def get_response_with_rag(
         "report_type": report_type,
         "specific": specific_instructions,
         "history": format_history(history or []),
-    })
-    return out["text"] if isinstance(out, dict) else str(out)
+    }, None
+
+def get_response_with_rag(
+    query: str,
+    vectorstore_path: Optional[str] = None,
+    context: str = "",
+    location: str = "",
+    category: str = "",
+    report_type: str = "",
+    history: Optional[List[Dict]] = None,
+) -> str:
+    """
+    RAG 기반 답변 생성.
+    - vectorstore_path 미지정 시 config.VECTOR_DB_DIR 사용
+    - history: [{role:'user'|'assistant'|'bot', content:str}, ...]
+    """
+    inputs, message = _rag_inputs(query, vectorstore_path, context, location, category, report_type, history)
+    if inputs is None:
+        return message
+
+    # 4) 프롬프트 + LLM 실행
+    return run_chain(rag_chain, inputs)
+
+def stream_response_with_rag(
+    query: str,
+    vectorstore_path: Optional[str] = None,
+    context: str = "",
+    location: str = "",
+    category: str = "",
+    report_type: str = "",
+    history: Optional[List[Dict]] = None,
+) -> Iterator[str]:
+    """get_response_with_rag 의 스트리밍 버전 (검색까지 마친 뒤 답변 토큰을 순서대로 yield)"""
+    inputs, message = _rag_inputs(query, vectorstore_path, context, location, category, report_type, history)
+    if inputs is None:
+        yield message
+        return
+    yield from stream_chain(rag_chain, inputs)
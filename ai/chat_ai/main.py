@@ -1,23 +1,28 @@
 # ai/chat_ai/main.py
-from typing import List, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import hashlib
 import threading
 
 from .report_loader import load_report_text_and_metadata
 from .build_vector_db import process_all_pdfs
-from .gpt_consultant import get_response_with_rag
+from .gpt_consultant import get_response_with_rag, stream_response_with_rag
 from .csv_consultant import (
     answer_from_csv,
     answer_simple_recommendation,
     answer_top_recommendation,
+    stream_from_csv,
+    stream_simple_recommendation,
 )
 from .utils import classify_question_and_subject
 from .config import VECTOR_DB_DIR
+from .answer_cache import ANSWER_CACHE
 
 _init_lock = threading.Lock()
 _initialized = False
 
 def _ensure_initialized() -> None:
-    """PDF → 벡터스토어가 없으면 1회 구축."""
+    """프로세스당 1회 PDF → 벡터스토어 동기화 (매니페스트 기준 증분, 변경 없으면 임베딩 호출 없음)."""
     global _initialized
     if _initialized:
         return
@@ -58,21 +63,50 @@ def _load_context(context: Dict) -> Dict:
         "report_type": report_type or "창업 준비",
     }
 
+def _prepare(messages: List[Dict], context: Optional[Dict]) -> Tuple[List[Dict], str, Dict]:
+    """(정규화된 history, 마지막 사용자 질문, 정리된 컨텍스트)"""
+    _ensure_initialized()
+
+    ctx_in = context or {}
+    history = _normalize_history(messages)
+    last_user = next((m["content"] for m in reversed(history) if m["role"] == "user"), "").strip()
+    return history, last_user, _load_context(ctx_in)
+
+# 답변이 레포트 본문/이전 대화와 무관한 라우트 (그 밖의 RAG 경로는 맥락까지 같아야 캐시 재사용)
+CONTEXT_FREE_ROUTES = ("순위추천", "수치", "비교", "수치전략", "간단추천")
+
+def _cache_scope(ctx: Dict) -> Tuple:
+    return ctx["location"], ctx["category"], ctx["report_type"]
+
+def _cache_context(history: List[Dict], ctx: Dict) -> str:
+    """레포트 본문 + 마지막 질문 이전 대화의 지문 (RAG 프롬프트에 들어가는 맥락)"""
+    prior = history[:-1] if history and history[-1]["role"] == "user" else history
+    raw = json.dumps([ctx["report_text"], prior], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def _uses_context(q_type: str) -> bool:
+    return q_type not in CONTEXT_FREE_ROUTES
+
 def generate_chat_response(messages: List[Dict], context: Optional[Dict] = None) -> str:
     """
     messages: [{role:'user'|'bot', content:str}, ...]
     context : {role, gu_name, region, category_large, category_small, purpose, report_text}
     """
-    _ensure_initialized()
+    history, last_user, ctx = _prepare(messages, context)
 
-    ctx_in = context or {}
-    history = _normalize_history(messages)
-    last_user = next((m["content"] for m in reversed(history) if m["role"] == "user"), "").strip()
-    ctx = _load_context(ctx_in)
+    # 같은 맥락(지역/업종/레포트 종류, RAG 는 레포트 본문·이전 대화까지)의 같은·비슷한 질문이면
+    # 분류/답변 LLM 호출 없이 반환
+    probe = ANSWER_CACHE.lookup(last_user, _cache_scope(ctx), _cache_context(history, ctx))
+    if probe.answer is not None:
+        return probe.answer
 
     # 질문 분류 → 처리 라우팅
     q_type, subject_type = classify_question_and_subject(last_user)
+    answer = _answer_for_route(q_type, subject_type, last_user, ctx, history)
+    ANSWER_CACHE.store(probe, q_type, answer, uses_context=_uses_context(q_type))
+    return answer
 
+def _answer_for_route(q_type: str, subject_type: str, last_user: str, ctx: Dict, history: List[Dict]) -> str:
     if q_type == "순위추천":
         return answer_top_recommendation(last_user)
 
@@ -94,3 +128,56 @@ def generate_chat_response(messages: List[Dict], context: Optional[Dict] = None)
         report_type=ctx["report_type"],
         history=history,
     )
+
+def stream_chat_response(messages: List[Dict], context: Optional[Dict] = None) -> Iterator[Tuple[str, Any]]:
+    """
+    generate_chat_response 의 스트리밍 버전. (event, payload) 를 순서대로 yield:
+    - ("route", {question_type, subject_type, source}) : 라우팅 결정 (source: cache | classifier)
+    - ("token", str)                                   : 답변 조각 (캐시 적중/LLM 미사용 경로는 전체 1회)
+    - ("done",  answer)                                : 최종 답변 (끝까지 만든 답변만 답변 캐시에 저장)
+    """
+    history, last_user, ctx = _prepare(messages, context)
+
+    probe = ANSWER_CACHE.lookup(last_user, _cache_scope(ctx), _cache_context(history, ctx))
+    if probe.answer is not None:
+        yield "route", {"question_type": probe.route, "subject_type": None, "source": "cache"}
+        yield "token", probe.answer
+        yield "done", probe.answer
+        return
+
+    q_type, subject_type = classify_question_and_subject(last_user)
+    yield "route", {"question_type": q_type, "subject_type": subject_type, "source": "classifier"}
+
+    parts = []
+    for token in _stream_for_route(q_type, subject_type, last_user, ctx, history):
+        parts.append(token)
+        yield "token", token
+    answer = "".join(parts)
+    ANSWER_CACHE.store(probe, q_type, answer, uses_context=_uses_context(q_type))
+    yield "done", answer
+
+def _stream_for_route(q_type: str, subject_type: str, last_user: str, ctx: Dict, history: List[Dict]) -> Iterator[str]:
+    """_answer_for_route 와 같은 라우팅, LLM 경로는 토큰 단위로 흘려보냄"""
+    if q_type == "순위추천":
+        yield answer_top_recommendation(last_user)
+        return
+
+    if q_type in ("수치", "비교", "수치전략"):
+        mode = "dong" if (subject_type == "지역") else "industry"
+        target_name = ctx["location"] if mode == "dong" else ctx["category"]
+        yield from stream_from_csv(last_user, target_name, mode)
+        return
+
+    if q_type == "간단추천":
+        yield from stream_simple_recommendation(last_user, ctx["location"])
+        return
+
+    yield from stream_response_with_rag(
+        query=last_user,
+        vectorstore_path=VECTOR_DB_DIR,
+        context=ctx["report_text"],
+        location=ctx["location"],
+        category=ctx["category"],
+        report_type=ctx["report_type"],
+        history=history,
+    )
@@ -0,0 +1,300 @@
+# ai/chat_ai/question_router.py
+"""
+챗봇 질문 로컬 분류기 (LLM 분류 앞단의 빠른 경로).
+
+- 키워드 규칙 점수 + 로그 질문으로 학습한 문자 n-gram 나이브 베이즈를 곱해 분포를 만들고
+  최댓값을 신뢰도로 쓴다. 신뢰도가 QUESTION_ROUTER_THRESHOLD 이상이면 LLM 호출 없이 라우팅.
+- 수치/비교/수치전략 은 대상(지역/업종)에 따라 CSV 조회 대상이 달라지므로
+  대상 신뢰도까지 함께 넘어야 로컬 결과를 쓴다.
+- LLM 으로 분류된 질문은 (질문, 라벨) 을 JSONL 로그에 남기고, 이 로그로 모델을 다시 학습한다.
+  (로컬 분류 결과는 학습에 쓰지 않음 → 자기 강화 방지)
+- 학습 표본이 QUESTION_ROUTER_MIN_SAMPLES 미만이면 모델 없이 규칙만 사용.
+
+학습 (프로젝트 루트에서, 로그가 쌓인 뒤 주기적으로):
+    python -m ai.chat_ai.question_router train
+    python -m ai.chat_ai.question_router predict "임대료 얼마야?"
+"""
+import os
+import re
+import sys
+import json
+import math
+import time
+import argparse
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# config.settings 임포트를 위해 back/ 경로 등록 (CLI 실행용)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'back')))
+
+from config.settings import CACHE_DIR
+
+QUESTION_ROUTER_ENABLED = os.getenv("QUESTION_ROUTER_ENABLED", "1") == "1"
+QUESTION_ROUTER_THRESHOLD = float(os.getenv("QUESTION_ROUTER_THRESHOLD", "0.8"))
+QUESTION_ROUTER_MIN_SAMPLES = int(os.getenv("QUESTION_ROUTER_MIN_SAMPLES", "200"))
+QUESTION_LOG_ENABLED = os.getenv("QUESTION_LOG_ENABLED", "1") == "1"
+QUESTION_LOG_PATH = os.getenv("QUESTION_LOG_PATH", os.path.join(CACHE_DIR, "chat_questions.jsonl"))
+QUESTION_MODEL_PATH = os.getenv("QUESTION_MODEL_PATH", os.path.join(CACHE_DIR, "question_router.json"))
+
+QUESTION_TYPES = ("수치", "비교", "수치전략", "전략아이디어", "간단추천", "순위추천", "rag")
+SUBJECT_TYPES = ("지역", "업종")
+# 대상에 따라 답변 경로가 달라지는 유형
+SUBJECT_SENSITIVE = ("수치", "비교", "수치전략")
+
+# ====== 키워드 규칙 ======
+# (정규식, 라벨, 가중치). 라벨별 가중치 합이 규칙 점수, 분포는 softmax(점수)
+RULE_WEIGHT = 3.5
+
+QUESTION_RULES: List[Tuple[re.Pattern, str, float]] = [
+    (re.compile(r"top\s*\d+|탑\s*\d+|상위\s*\d+|순위|랭킹|\d+\s*곳|\d+\s*군데"), "순위추천", RULE_WEIGHT),
+    (re.compile(r"(가장|제일)\s*\S*\s*(많은|높은|낮은|싼|비싼)\s*(지역|동네|곳|동)"), "순위추천", RULE_WEIGHT),
+    (re.compile(r"비교|보다|차이|어디가\s*더|어느\s*(쪽|곳|동네)이?\s*더|더\s*(많은|높은|낮은|싼|비싼)\s*(데|곳)"), "비교", RULE_WEIGHT),
+    (re.compile(r"얼마|몇\s*(명|개|곳|년|퍼센트|%)|수치|평균|비율|매출액|임대료는|유동인구는|생존율은"), "수치", RULE_WEIGHT),
+    (re.compile(r"(해도|차려도|열어도)\s*(될까|돼|되나|괜찮)|위험|가능성|승산|리스크|버틸\s*수"), "수치전략", RULE_WEIGHT),
+    (re.compile(r"sns|인스타|유튜브|블로그|마케팅|홍보|브랜딩|차별화|전략|이벤트|프로모션|고객\s*유치"), "전략아이디어", RULE_WEIGHT),
+    (re.compile(r"메뉴|이름|상호|네이밍|가게\s*명|키워드|슬로건|컨셉|콘셉트|인테리어\s*분위기"), "간단추천", RULE_WEIGHT),
+    (re.compile(r"지원금|지원\s*사업|대출|정책|절차|허가|인허가|신고|사업자\s*등록|세금|부가세|서류|보증금\s*반환|계약서|권리금"), "rag", RULE_WEIGHT),
+]
+
+SUBJECT_RULES: List[Tuple[re.Pattern, str, float]] = [
+    (re.compile(r"업종|카페|커피|음식점|식당|치킨|편의점|미용|네일|학원|베이커리|빵집|주점|술집|분식|한식|중식|일식|양식|pc방|세탁|약국|꽃집"), "업종", RULE_WEIGHT),
+    (re.compile(r"지역|동네|상권|위치|입지|[가-힣]+동\b|[가-힣]+구\b|근처|주변|이\s*곳|여기"), "지역", RULE_WEIGHT),
+    # 지역 단위로만 집계되는 지표
+    (re.compile(r"임대료|유동인구|생존율|폐업률|거주인구|직장인구"), "지역", RULE_WEIGHT),
+]
+# 규칙이 하나도 맞지 않을 때의 기본 점수 (LLM 분류 실패 시 폴백과 같은 '지역' 쪽)
+SUBJECT_PRIOR = {"지역": 1.0}
+
+_RE_WS = re.compile(r"\s+")
+
+
+def normalize(question: str) -> str:
+    return _RE_WS.sub(" ", str(question or "")).strip().lower()
+
+
+def rule_scores(text: str, rules: Iterable[Tuple[re.Pattern, str, float]],
+                prior: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    scores: Dict[str, float] = defaultdict(float, prior or {})
+    for pattern, label, weight in rules:
+        if pattern.search(text):
+            scores[label] += weight
+    return scores
+
+
+def _softmax(scores: Dict[str, float], labels: Iterable[str]) -> Dict[str, float]:
+    labels = list(labels)
+    top = max(scores.get(l, 0.0) for l in labels)
+    exp = {l: math.exp(scores.get(l, 0.0) - top) for l in labels}
+    total = sum(exp.values())
+    return {l: v / total for l, v in exp.items()}
+
+
+# ====== 나이브 베이즈 (문자 n-gram, 다항 분포) ======
+NGRAM_RANGE = (2, 3)
+
+
+def char_ngrams(text: str) -> List[str]:
+    s = f" {normalize(text)} "
+    lo, hi = NGRAM_RANGE
+    return [s[i:i + n] for n in range(lo, hi + 1) for i in range(len(s) - n + 1)]
+
+
+class NaiveBayes:
+    """라벨별 n-gram 빈도 + 라플라스 평활. JSON 으로 저장/로드"""
+
+    def __init__(self, labels: Iterable[str], alpha: float = 1.0):
+        self.labels = list(labels)
+        self.alpha = alpha
+        self.doc_counts: Dict[str, int] = {l: 0 for l in self.labels}
+        self.gram_counts: Dict[str, Dict[str, int]] = {l: {} for l in self.labels}
+        self.gram_totals: Dict[str, int] = {l: 0 for l in self.labels}
+        self.vocab: set = set()
+
+    def fit(self, texts: Iterable[str], labels: Iterable[str]) -> "NaiveBayes":
+        for text, label in zip(texts, labels):
+            if label not in self.doc_counts:
+                continue
+            self.doc_counts[label] += 1
+            counts = self.gram_counts[label]
+            for g in char_ngrams(text):
+                counts[g] = counts.get(g, 0) + 1
+                self.gram_totals[label] += 1
+                self.vocab.add(g)
+        return self
+
+    @property
+    def samples(self) -> int:
+        return sum(self.doc_counts.values())
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """사후 분포. 로그우도는 n-gram 수의 제곱근으로 나눠 긴 문장에서의 과신을 완화"""
+        grams = [g for g in char_ngrams(text) if g in self.vocab]
+        n_docs = self.samples
+        if not grams or not n_docs:
+            return {l: 1.0 / len(self.labels) for l in self.labels}
+        v = len(self.vocab)
+        scale = 1.0 / math.sqrt(len(grams))
+        scores = {}
+        for l in self.labels:
+            denom = math.log(self.gram_totals[l] + self.alpha * v)
+            counts = self.gram_counts[l]
+            loglik = sum(math.log(counts.get(g, 0) + self.alpha) - denom for g in grams)
+            prior = math.log((self.doc_counts[l] + self.alpha) / (n_docs + self.alpha * len(self.labels)))
+            scores[l] = prior + loglik * scale
+        return _softmax(scores, self.labels)
+
+    def to_dict(self) -> Dict:
+        return {"labels": self.labels, "alpha": self.alpha, "doc_counts": self.doc_counts,
+                "gram_counts": self.gram_counts, "gram_totals": self.gram_totals}
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> "NaiveBayes":
+        nb = cls(d["labels"], d.get("alpha", 1.0))
+        nb.doc_counts, nb.gram_counts, nb.gram_totals = d["doc_counts"], d["gram_counts"], d["gram_totals"]
+        nb.vocab = {g for counts in nb.gram_counts.values() for g in counts}
+        return nb
+
+
+# ====== 분류기 ======
+class QuestionRouter:
+    def __init__(self, model_path: str = QUESTION_MODEL_PATH, threshold: float = QUESTION_ROUTER_THRESHOLD,
+                 min_samples: int = QUESTION_ROUTER_MIN_SAMPLES):
+        self.model_path = model_path
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self._models: Optional[Dict[str, NaiveBayes]] = None
+        self._sig = None
+        self._lock = threading.Lock()
+
+    def _load_models(self) -> Optional[Dict[str, NaiveBayes]]:
+        """모델 파일이 바뀌었을 때만 다시 읽음 (train 후 재시작 없이 반영)"""
+        try:
+            st = os.stat(self.model_path)
+            sig = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+        if sig == self._sig:
+            return self._models
+        with self._lock:
+            if sig != self._sig:
+                try:
+                    with open(self.model_path, "r", encoding="utf-8") as f:
+                        raw = json.load(f)
+                    models = {k: NaiveBayes.from_dict(v) for k, v in raw["models"].items()}
+                    if models["question_type"].samples < self.min_samples:
+                        models = None
+                except Exception as e:
+                    print(f"⚠️ [question_router] 모델 로드 실패 → 규칙만 사용: {e}")
+                    models = None
+                self._models, self._sig = models, sig
+        return self._models
+
+    def predict(self, question: str) -> Tuple[str, str, float]:
+        """return: (question_type, subject_type, confidence)"""
+        text = normalize(question)
+        q_dist = _softmax(rule_scores(text, QUESTION_RULES), QUESTION_TYPES)
+        s_dist = _softmax(rule_scores(text, SUBJECT_RULES, SUBJECT_PRIOR), SUBJECT_TYPES)
+
+        models = self._load_models()
+        if models:
+            q_dist = _combine(q_dist, models["question_type"].predict_proba(text))
+            s_dist = _combine(s_dist, models["subject_type"].predict_proba(text))
+
+        q_type = max(q_dist, key=q_dist.get)
+        subject_type = max(s_dist, key=s_dist.get)
+        confidence = q_dist[q_type]
+        if q_type in SUBJECT_SENSITIVE:
+            confidence = min(confidence, s_dist[subject_type])
+        return q_type, subject_type, confidence
+
+    def route(self, question: str) -> Optional[Tuple[str, str, float]]:
+        """신뢰도가 임계값 이상이면 (question_type, subject_type, confidence), 아니면 None"""
+        if not QUESTION_ROUTER_ENABLED:
+            return None
+        result = self.predict(question)
+        return result if result[2] >= self.threshold else None
+
+
+def _combine(a: Dict[str, float], b: Dict[str, float]) -> Dict[str, float]:
+    prod = {l: a[l] * b.get(l, 0.0) for l in a}
+    total = sum(prod.values())
+    return {l: v / total for l, v in prod.items()} if total else a
+
+
+QUESTION_ROUTER = QuestionRouter()
+
+
+# ====== 학습 로그 ======
+_log_lock = threading.Lock()
+
+
+def log_labeled_question(question: str, question_type: str, subject_type: str) -> None:
+    """LLM 분류 결과를 학습 로그에 추가 (실패해도 응답에는 영향 없음)"""
+    if not QUESTION_LOG_ENABLED or not question:
+        return
+    line = json.dumps({"ts": time.time(), "question": question, "question_type": question_type,
+                       "subject_type": subject_type}, ensure_ascii=False)
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(QUESTION_LOG_PATH), exist_ok=True)
+            with open(QUESTION_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    except Exception as e:
+        print(f"⚠️ [question_router] 질문 로그 기록 실패: {e}")
+
+
+def load_labeled_questions(path: str = QUESTION_LOG_PATH) -> List[Dict]:
+    """로그 → 유효 라벨만. 같은 질문이 여러 번이면 마지막 라벨 사용"""
+    if not os.path.exists(path):
+        return []
+    rows: Dict[str, Dict] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if row.get("question_type") in QUESTION_TYPES and row.get("subject_type") in SUBJECT_TYPES:
+                rows[normalize(row.get("question"))] = row
+    return [r for q, r in rows.items() if q]
+
+
+def train(log_path: str = QUESTION_LOG_PATH, model_path: str = QUESTION_MODEL_PATH) -> int:
+    """로그로 두 모델(question_type / subject_type) 학습 후 저장. return: 학습 표본 수"""
+    rows = load_labeled_questions(log_path)
+    texts = [r["question"] for r in rows]
+    models = {
+        "question_type": NaiveBayes(QUESTION_TYPES).fit(texts, [r["question_type"] for r in rows]),
+        "subject_type": NaiveBayes(SUBJECT_TYPES).fit(texts, [r["subject_type"] for r in rows]),
+    }
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    tmp = f"{model_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"trained_at": time.strftime("%Y-%m-%d %H:%M:%S"), "samples": len(rows),
+                   "models": {k: m.to_dict() for k, m in models.items()}}, f, ensure_ascii=False)
+    os.replace(tmp, model_path)
+    return len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="챗봇 질문 로컬 분류기")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("train", help="질문 로그로 모델 학습")
+    p_predict = sub.add_parser("predict", help="질문 분류 결과/신뢰도 확인")
+    p_predict.add_argument("question")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "train":
+        n = train()
+        print(f"✅ 학습 완료: {n}개 질문 → {QUESTION_MODEL_PATH}")
+        if n < QUESTION_ROUTER_MIN_SAMPLES:
+            print(f"ℹ️ 표본이 {QUESTION_ROUTER_MIN_SAMPLES}개 미만이라 서비스에서는 규칙만 사용합니다.")
+    else:
+        q_type, subject_type, confidence = QUESTION_ROUTER.predict(args.question)
+        route = "local" if confidence >= QUESTION_ROUTER.threshold else "llm"
+        print(f"{q_type} / {subject_type} (confidence={confidence:.3f}, route={route})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,16 @@
 # ai/chat_ai/rag_embedder.py
 import os
-from typing import Iterable, List
+import json
+import time
+import shutil
+from typing import Dict, Iterable, List, Optional, Sequence
 from tqdm import tqdm
 
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
 
 from .config import OPENAI_API_KEY, VECTOR_DB_DIR
+from .vector_store import CURRENT_POINTER, GENERATION_PREFIX, MANIFEST_NAME, current_generation, index_path
 
 def _as_str_chunks(chunks: Iterable) -> List[str]:
     out = []
@@ -23,47 +27,114 @@ def _as_str_chunks(chunks: Iterable) -> List[str]:
     # 빈 문자열 제거
     return [s for s in (t.strip() for t in out) if s]
 
+def _embeddings(embedding_model: str) -> OpenAIEmbeddings:
+    # 임베딩 초기화 (환경변수/설정에 있는 키 사용)
+    return OpenAIEmbeddings(
+        openai_api_key=OPENAI_API_KEY,
+        model=embedding_model,
+    )
+
+def _embed_batches(texts: List[str], ids: Optional[Sequence[str]], embedding, batch_size: int):
+    vectordb = None
+    total = len(texts)
+    for i in tqdm(range(0, total, batch_size), desc="🔄 벡터스토어 생성 중"):
+        batch = texts[i : i + batch_size]
+        batch_ids = list(ids[i : i + batch_size]) if ids is not None else None
+        # 배치 단위로 벡터스토어 생성 후 병합
+        batch_db = FAISS.from_texts(batch, embedding, ids=batch_ids)
+        if vectordb is None:
+            vectordb = batch_db
+        else:
+            vectordb.merge_from(batch_db)
+    return vectordb
+
+def _save_local(vectordb, index_dir: str, manifest: Optional[Dict] = None) -> None:
+    """
+    새 세대 폴더(g<시각>)에 index.faiss/index.pkl (+ manifest.json) 을 모두 쓴 뒤 CURRENT 를 원자적으로 교체.
+    (서비스 중인 프로세스는 CURRENT 변화를 보고 새 세대로 갈아탐: vector_store.py)
+    매니페스트도 같은 세대에 들어가므로 인덱스와 어긋난 매니페스트가 공개되는 순간이 없다.
+    직전 세대는 읽는 중인 요청을 위해 남기고 그 이전 세대만 정리한다.
+    """
+    previous = current_generation(index_dir)
+    generation = f"{GENERATION_PREFIX}{time.time_ns()}"
+    gen_dir = os.path.join(index_dir, generation)
+    vectordb.save_local(gen_dir)
+    if manifest is not None:
+        with open(os.path.join(gen_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    pointer = os.path.join(index_dir, CURRENT_POINTER)
+    tmp = f"{pointer}.tmp-{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(generation)
+    os.replace(tmp, pointer)
+
+    for name in os.listdir(index_dir):
+        path = os.path.join(index_dir, name)
+        if name in (generation, previous) or not os.path.isdir(path):
+            continue
+        # 이전 세대 + 세대 도입 전 방식의 임시 폴더(.tmp-<pid>)
+        if name.startswith(GENERATION_PREFIX) or name.startswith(".tmp-"):
+            shutil.rmtree(path, ignore_errors=True)
+
 def save_to_vectorstore(
     chunks: Iterable,
     save_path: str = None,
     batch_size: int = 100,
     embedding_model: str = "text-embedding-3-small",
+    ids: Optional[Sequence[str]] = None,
+    manifest: Optional[Dict] = None,
 ) -> str:
     """
-    청크 텍스트를 임베딩하여 FAISS 벡터스토어로 저장.
+    청크 텍스트를 임베딩하여 FAISS 벡터스토어로 저장 (전체 새로 생성).
     - chunks: 문자열/Document/딕셔너리 혼합 가능
     - save_path: 지정 없으면 config.VECTOR_DB_DIR/faiss_index 에 저장
+    - ids: 청크별 문서 ID (지정 시 이후 update_vectorstore 로 개별 삭제 가능, chunks 와 같은 길이)
+    - manifest: 지정 시 인덱스와 같은 세대 폴더에 manifest.json 으로 함께 저장
     - 반환: 저장된 인덱스의 폴더 경로
     """
     texts = _as_str_chunks(chunks)
     if not texts:
         raise ValueError("[rag_embedder] 저장할 청크가 없습니다.")
+    if ids is not None and len(ids) != len(texts):
+        raise ValueError("[rag_embedder] ids 와 청크 개수가 다릅니다 (빈 청크 포함 여부 확인).")
 
     # 저장 경로 결정 및 보장
     base_dir = VECTOR_DB_DIR
     index_dir = save_path or os.path.join(base_dir, "faiss_index")
     os.makedirs(index_dir, exist_ok=True)
 
-    # 임베딩 초기화 (환경변수/설정에 있는 키 사용)
-    embedding = OpenAIEmbeddings(
-        openai_api_key=OPENAI_API_KEY,
-        model=embedding_model,
-    )
-
-    vectordb = None
-    total = len(texts)
-    for i in tqdm(range(0, total, batch_size), desc="🔄 벡터스토어 생성 중"):
-        batch = texts[i : i + batch_size]
-        # 배치 단위로 벡터스토어 생성 후 병합
-        batch_db = FAISS.from_texts(batch, embedding)
-        if vectordb is None:
-            vectordb = batch_db
-        else:
-            vectordb.merge_from(batch_db)
-
+    vectordb = _embed_batches(texts, ids, _embeddings(embedding_model), batch_size)
     if vectordb is None:
         raise RuntimeError("[rag_embedder] 벡터스토어 생성에 실패했습니다.")
 
     # 로컬 저장
-    vectordb.save_local(index_dir)
+    _save_local(vectordb, index_dir, manifest)
+    return index_dir
+
+def update_vectorstore(
+    index_dir: str,
+    add_texts: Sequence[str] = (),
+    add_ids: Sequence[str] = (),
+    delete_ids: Iterable[str] = (),
+    batch_size: int = 100,
+    embedding_model: str = "text-embedding-3-small",
+    manifest: Optional[Dict] = None,
+) -> str:
+    """
+    기존 FAISS 인덱스에서 delete_ids 벡터를 지우고 add_texts 만 새로 임베딩해 병합 후 저장.
+    (임베딩 API 는 추가되는 청크에 대해서만 호출, manifest 는 새 세대에 함께 저장)
+    """
+    embedding = _embeddings(embedding_model)
+    vectordb = FAISS.load_local(
+        folder_path=index_path(index_dir),
+        embeddings=embedding,
+        allow_dangerous_deserialization=True,
+    )
+    delete_ids = list(delete_ids)
+    if delete_ids:
+        vectordb.delete(delete_ids)
+    if add_texts:
+        vectordb.merge_from(_embed_batches(list(add_texts), list(add_ids), embedding, batch_size))
+    _save_local(vectordb, index_dir, manifest)
     return index_dir
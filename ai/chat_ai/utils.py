@@ -5,7 +5,9 @@ from typing import Tuple
 
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
-from .gpt_consultant import llm  # ✅ 상대 임포트
+from .gpt_consultant import llm, run_chain  # ✅ 상대 임포트
+from .question_router import QUESTION_ROUTER, log_labeled_question
+from ..metrics import CHAT_ROUTES
 
 # === 질문 유형 / 대상 분류 프롬프트 ===
 combined_prompt = PromptTemplate(
@@ -46,18 +48,26 @@ def _extract_json_block(text: str) -> str:
 def classify_question_and_subject(question: str) -> Tuple[str, str]:
     """
     질문을 (question_type, subject_type)으로 분류.
+    로컬 분류기 신뢰도가 임계값 이상이면 LLM 호출 없이 반환, 아니면 LLM 분류 후 학습 로그에 기록.
     실패 시 ('rag','지역') 폴백.
     """
+    local = QUESTION_ROUTER.route(question)
+    if local is not None:
+        CHAT_ROUTES.inc("local", local[0])
+        return local[0], local[1]
+
     try:
-        out = _combined_chain.invoke({"question": str(question)})
-        raw = out["text"] if isinstance(out, dict) else str(out)
+        raw = run_chain(_combined_chain, {"question": str(question)})
         js = _extract_json_block(raw)
         parsed = json.loads(js)
         qtype = parsed.get("question_type", "rag")
         stype = parsed.get("subject_type", "지역")
-        return qtype, stype
     except Exception:
+        CHAT_ROUTES.inc("fallback", "rag")
         return "rag", "지역"
+    CHAT_ROUTES.inc("llm", qtype)
+    log_labeled_question(str(question), qtype, stype)
+    return qtype, stype
 
 # === 지역명 정규화 ===
 # 예: "서울특별시 종로구 청운효자동" -> "청운효자동"
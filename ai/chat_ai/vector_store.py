@@ -0,0 +1,105 @@
+# ai/chat_ai/vector_store.py
+"""
+프로세스 전역 FAISS 벡터스토어 핸들.
+
+- 경로별로 1회만 load_local 하고 모든 요청 스레드가 같은 인덱스를 공유 (검색은 읽기 전용)
+- 인덱스는 <path>/g<시각>/{index.faiss, index.pkl} 세대 폴더에 쓰고 <path>/CURRENT 가 현재 세대를 가리킴
+  (rag_embedder._save_local: 두 파일을 새 세대에 모두 쓴 뒤 CURRENT 만 원자적으로 교체)
+- 요청마다 CURRENT 만 확인해서 세대가 바뀌었으면 새로 읽은 뒤 참조만 교체
+  (이미 이전 인덱스로 검색 중인 요청은 그대로 끝까지 사용, 짝이 안 맞는 faiss/pkl 조합은 읽지 않음)
+- CURRENT 가 없으면 세대 도입 전처럼 <path> 바로 아래 두 파일의 (mtime, size) 로 판단
+- 재적재에 실패하면 기존 인덱스를 계속 쓰고 다음 요청에서 다시 시도
+"""
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from langchain_community.vectorstores import FAISS
+
+INDEX_FILES = ("index.faiss", "index.pkl")
+# 인덱스와 같은 세대 폴더에 두는 빌드 매니페스트 (build_vector_db: PDF 해시 + 청크 ID)
+MANIFEST_NAME = "manifest.json"
+CURRENT_POINTER = "CURRENT"
+GENERATION_PREFIX = "g"
+
+
+def current_generation(path: str) -> Optional[str]:
+    try:
+        with open(os.path.join(path, CURRENT_POINTER), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def resolve_index(path: str) -> Tuple[str, Optional[Tuple]]:
+    """
+    (현재 인덱스 폴더, signature). 세대가 있으면 signature 는 세대명,
+    세대 도입 전 배치면 두 파일의 (mtime, size). 파일이 하나라도 없으면 signature 는 None
+    """
+    generation = current_generation(path)
+    folder = os.path.join(path, generation) if generation else path
+    sig = []
+    for name in INDEX_FILES:
+        try:
+            st = os.stat(os.path.join(folder, name))
+        except FileNotFoundError:
+            return folder, None
+        sig.append((st.st_mtime_ns, st.st_size))
+    return folder, ((generation,) if generation else tuple(sig))
+
+
+def index_path(path: str) -> str:
+    """현재 세대의 인덱스 폴더 (세대가 없으면 path 그대로)"""
+    return resolve_index(path)[0]
+
+
+def index_signature(path: str) -> Optional[Tuple]:
+    """현재 인덱스의 signature (바뀌면 재적재/답변 캐시 무효화). 인덱스가 없으면 None"""
+    return resolve_index(path)[1]
+
+
+class VectorStoreHandle:
+    def __init__(self, path: str, embeddings):
+        self.path = path
+        self.embeddings = embeddings
+        self._db = None
+        self._sig = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """현재 인덱스 (파일이 바뀌었으면 재적재). 인덱스가 없고 적재한 적도 없으면 예외"""
+        folder, sig = resolve_index(self.path)
+        if self._db is not None and (sig is None or sig == self._sig):
+            return self._db
+
+        with self._lock:
+            if self._db is not None and (sig is None or sig == self._sig):
+                return self._db
+            try:
+                db = FAISS.load_local(
+                    folder_path=folder,
+                    embeddings=self.embeddings,
+                    allow_dangerous_deserialization=True,
+                )
+            except Exception as e:
+                if self._db is None:
+                    raise
+                print(f"[vector_store] 인덱스 재적재 실패, 기존 인덱스 유지: {e}")
+                return self._db
+            print(f"📚 벡터스토어 {'교체' if self._db is not None else '로드'}: {folder}")
+            self._db, self._sig = db, sig
+            return db
+
+
+_handles: Dict[str, VectorStoreHandle] = {}
+_handles_lock = threading.Lock()
+
+
+def get_vectorstore(path: str, embeddings):
+    """경로별 공용 핸들에서 현재 인덱스를 받아온다"""
+    key = os.path.abspath(path)
+    handle = _handles.get(key)
+    if handle is None:
+        with _handles_lock:
+            handle = _handles.setdefault(key, VectorStoreHandle(key, embeddings))
+    return handle.get()
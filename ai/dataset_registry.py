@@ -0,0 +1,132 @@
+# ai/dataset_registry.py
+"""
+프로세스 전역 데이터셋 레지스트리.
+
+- 테이블 스냅샷(<CACHE_DIR>/<table>/ Parquet 파티션, ai/snapshots.py 관리)을 프로세스당 1회만 읽고,
+  dtype 정규화(region_code/zone_id → str)도 로드 시 1회만 수행한다.
+- columns / gu 를 지정하면 그 컬럼과 구 파티션만 읽어 따로 보관한다.
+  (넓은 매출 테이블은 필요한 컬럼만, 구 단위 요청은 해당 구 파티션만 메모리에 올림)
+- get() 은 호출자 소유의 복사본을 돌려준다(자유롭게 수정 가능, threaded=True 요청 간 안전).
+  잘라내기만 하는 내부 조회(table_index, analytics)는 copy=False 로 공유 원본을 그대로 읽는다.
+- derived() 값은 공유 원본이다. 호출자는 필터/병합으로 새 프레임을 만들어 쓰고
+  제자리 수정(.loc 대입, inplace=True)은 하지 않는다. 컬럼 통째 대입은 얕은 복사본에만 반영된다.
+- 스냅샷이 바뀌면(refresh 는 임시 디렉터리 → 교체, _SUCCESS 표식의 inode/mtime 변경) 새로 읽은 뒤
+  참조만 교체한다. 이미 원본을 들고 있는 요청은 이전 프레임을 끝까지 그대로 사용한다.
+"""
+import os
+import threading
+from typing import Callable, Dict, Hashable, Iterable, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from ai import snapshots
+
+# 로드 시 1회 문자열로 맞추는 키 컬럼
+STR_COLUMNS = ("region_code", "zone_id")
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    for col in STR_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(str)
+    return df
+
+
+def _signature(path: str):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _view(value):
+    return value.copy(deep=False) if isinstance(value, pd.DataFrame) else value
+
+
+# derived() 의 원본 지정: 테이블명 또는 (테이블명, columns[, gu])
+Source = Union[str, Tuple]
+
+
+def source_key(source: Source) -> Tuple[str, Optional[Tuple[str, ...]], Optional[str]]:
+    if isinstance(source, str):
+        return (source, None, None)
+    table, columns, gu = (tuple(source) + (None, None))[:3]
+    return (table, tuple(columns) if columns is not None else None,
+            snapshots.gu_of(gu) if gu is not None else None)
+
+
+class DatasetRegistry:
+    def __init__(self):
+        self._entries: Dict[Tuple, Tuple] = {}     # (table, columns, gu) → (signature, frame)
+        self._derived: Dict[Hashable, Tuple] = {}  # key → (signatures, value)
+        self._locks: Dict[Hashable, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def snapshot_path(self, table: str) -> str:
+        return snapshots.snapshot_marker(table)
+
+    def _lock_for(self, key) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _entry(self, key: Tuple) -> Tuple:
+        table, columns, gu = key
+        path = self.snapshot_path(table)
+        sig = _signature(path)
+        entry = self._entries.get(key)
+        if entry is not None and sig is not None and entry[0] == sig:
+            return entry
+
+        with self._lock_for(key):
+            if sig is None:
+                snapshots.ensure_snapshot(table)
+                sig = _signature(path)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == sig:
+                return entry
+            scope = "".join([f" cols={len(columns)}" if columns else "", f" gu={gu}" if gu else ""])
+            print(f"📂 스냅샷 로드: {table}{scope}")
+            entry = (sig, _normalize(snapshots.read_snapshot(table, columns=columns, gu=gu)))
+            self._entries[key] = entry
+            return entry
+
+    def signature(self, table: str):
+        """현재 스냅샷의 (inode, mtime, size) — 하위 캐시 무효화 판단용"""
+        return self._entry((table, None, None))[0]
+
+    def get(self, table: str, columns: Optional[Iterable[str]] = None, gu: Optional[str] = None,
+            copy: bool = True) -> pd.DataFrame:
+        """
+        테이블 프레임.
+        columns: 이 컬럼만 읽어 보관 (없는 컬럼은 무시), gu: 구 코드 파티션만 읽어 보관
+        copy: True 면 호출자 소유의 복사본, False 면 공유 원본 (읽기 전용으로만 사용)
+        """
+        frame = self._entry(source_key((table, columns, gu)))[1]
+        return frame.copy() if copy else frame
+
+    def derived(self, key: Hashable, tables: Sequence[Source], build: Callable):
+        """
+        여러 스냅샷에서 파생된 값(연도별 테이블 결합 등)을 캐시.
+        tables 항목은 테이블명 또는 (테이블명, columns[, gu]). 원본 스냅샷 중 하나라도 바뀌면 다시 계산한다.
+        """
+        sources = [source_key(t) for t in tables]
+        sigs = tuple(self._entry(src)[0] for src in sources)
+        hit = self._derived.get(key)
+        if hit is not None and hit[0] == sigs:
+            return _view(hit[1])
+
+        with self._lock_for(("derived", key)):
+            hit = self._derived.get(key)
+            if hit is not None and hit[0] == sigs:
+                return _view(hit[1])
+            value = build(*[self._entry(src)[1].copy(deep=False) for src in sources])
+            self._derived[key] = (sigs, value)
+            return _view(value)
+
+
+REGISTRY = DatasetRegistry()
+
+
+def get_table(table: str, columns: Optional[Iterable[str]] = None, gu: Optional[str] = None) -> pd.DataFrame:
+    return REGISTRY.get(table, columns=columns, gu=gu)
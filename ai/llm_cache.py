@@ -0,0 +1,203 @@
+# ai/llm_cache.py
+"""
+모든 LLM 호출(Gemini/OpenAI/LangChain)이 공유하는 영속 응답 캐시.
+
+- 키: sha256(model, prompt, params) → 같은 모델/프롬프트/파라미터면 원격 호출 생략
+- 저장소: sqlite3 (WAL, 프로세스/스레드 간 공유, 쓰기는 행 단위 → 캐시 크기와 무관)
+- TTL(LLM_CACHE_TTL_SEC) 경과 항목은 조회 시 무시/삭제
+- 항목 수가 LLM_CACHE_MAX_ENTRIES 를 넘으면 마지막 사용 시각 기준 LRU 삭제
+- 프로세스 내 hit/miss/error 카운터 (stats()) + 모델별 원격 호출 지연/에러 (/metrics)
+
+사용 예:
+    text, hit = LLM_CACHE.get_or_call("gpt-4o", messages, lambda: call_openai(messages))
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from config.settings import CACHE_DIR
+from ai.metrics import LLM_LATENCY, LLM_ERRORS, LLM_CACHE_REQUESTS
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_cache.sqlite3"))
+LLM_CACHE_TTL_SEC = int(os.getenv("LLM_CACHE_TTL_SEC", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+
+# 쓰기 N회마다 1번 LRU 정리 (매 쓰기마다 COUNT(*) 하지 않도록)
+_EVICT_EVERY = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key         TEXT PRIMARY KEY,
+    model       TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access);
+"""
+
+
+def make_key(model: str, prompt: Any, params: Optional[Dict] = None) -> str:
+    """prompt 는 문자열/메시지 리스트/체인 입력 dict 모두 허용 (JSON 직렬화 가능해야 함)"""
+    raw = json.dumps([model, prompt, params or {}], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl_sec: int = LLM_CACHE_TTL_SEC,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES, enabled: bool = LLM_CACHE_ENABLED):
+        self.path = path
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = self.misses = self.errors = 0
+
+    # ── 연결 (스레드별 1개) ───────────────────────────────────────────────
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    # ── 조회/저장 ─────────────────────────────────────────────────────────
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        try:
+            conn = self._conn()
+            row = conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None:
+                return None
+            if self.ttl_sec and now - row[1] > self.ttl_sec:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            return row[0]
+        except sqlite3.Error as e:
+            print(f"⚠️ LLM 캐시 조회 실패: {e}")
+            return None
+
+    def set(self, key: str, model: str, value: str) -> None:
+        if not self.enabled or not value:
+            return
+        try:
+            now = time.time()
+            self._conn().execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, value, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model, value, now, now),
+            )
+            with self._lock:
+                self._writes += 1
+                evict = self._writes % _EVICT_EVERY == 0
+            if evict:
+                self.evict()
+        except sqlite3.Error as e:
+            print(f"⚠️ LLM 캐시 저장 실패: {e}")
+
+    def evict(self) -> int:
+        """만료 항목 + 최대 개수 초과분(LRU) 삭제. return: 삭제 행 수"""
+        conn = self._conn()
+        removed = 0
+        if self.ttl_sec:
+            removed += conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_sec,)).rowcount
+        overflow = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            removed += conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_access LIMIT ?)",
+                (overflow,),
+            ).rowcount
+        return removed
+
+    def get_or_call(self, model: str, prompt: Any, call: Callable[[], str],
+                    params: Optional[Dict] = None) -> Tuple[str, bool]:
+        """
+        캐시에 있으면 (값, True), 없으면 call() 결과를 저장하고 (값, False).
+        call() 예외는 그대로 전달 (호출부의 폴백 로직 유지), 빈 응답은 저장하지 않음.
+        """
+        key = make_key(model, prompt, params)
+        cached = self.get(key)
+        if cached is not None:
+            self._count("hits")
+            LLM_CACHE_REQUESTS.inc(model, "hit")
+            return cached, True
+        self._count("misses")
+        LLM_CACHE_REQUESTS.inc(model, "miss")
+        t0 = time.perf_counter()
+        try:
+            value = call()
+        except Exception:
+            self._count("errors")
+            LLM_ERRORS.inc(model)
+            raise
+        finally:
+            LLM_LATENCY.observe(time.perf_counter() - t0, model)
+        self.set(key, model, value)
+        return value, False
+
+    def stream_or_call(self, model: str, prompt: Any, stream_call: Callable[[], Iterator[str]],
+                       params: Optional[Dict] = None) -> Iterator[str]:
+        """
+        스트리밍 버전. 캐시에 있으면 전체 값을 한 번에 yield,
+        없으면 stream_call() 의 조각을 그대로 흘려보내고 끝까지 받은 경우에만 저장.
+        """
+        key = make_key(model, prompt, params)
+        cached = self.get(key)
+        if cached is not None:
+            self._count("hits")
+            LLM_CACHE_REQUESTS.inc(model, "hit")
+            yield cached
+            return
+        self._count("misses")
+        LLM_CACHE_REQUESTS.inc(model, "miss")
+        parts = []
+        t0 = time.perf_counter()
+        try:
+            for chunk in stream_call():
+                parts.append(chunk)
+                yield chunk
+        except Exception:
+            self._count("errors")
+            LLM_ERRORS.inc(model)
+            raise
+        finally:
+            # 스트림 전체 수신 시간 (중간에 끊긴 경우 포함)
+            LLM_LATENCY.observe(time.perf_counter() - t0, model)
+        self.set(key, model, "".join(parts))
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        entries = None
+        try:
+            entries = self._conn().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        except sqlite3.Error:
+            pass
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_sec": self.ttl_sec,
+        }
+
+
+LLM_CACHE = LLMCache()
@@ -0,0 +1,162 @@
+# ai/metrics.py
+"""
+프로세스 내 메트릭 수집 + Prometheus 텍스트 포맷 출력 (/metrics).
+
+- Counter / Histogram : 라벨별 누적 (스레드 안전)
+- instrument_sqlalchemy() : 모든 Engine 의 커서 실행을 SQL 템플릿 단위로 지연/행 수/에러 집계
+- LLM 호출 지연/에러는 ai/llm_cache.py 가 원격 호출 시 기록
+- HTTP 라우트 지연은 back/app.py 의 before/after_request 훅이 기록
+
+외부 의존성 없이 text exposition format(0.0.4)만 구현한다.
+"""
+import re
+import time
+import threading
+from typing import Dict, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# SQL 템플릿 라벨 최대 길이 (라벨 카디널리티/크기 제한)
+_STATEMENT_MAX_LEN = 160
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(v: float) -> str:
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name, self.help, self.label_names = name, help_text, tuple(labels)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, v in items:
+            yield f"{self.name}{_labels(self.label_names, key)} {_fmt(v)}"
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name, self.help, self.label_names = name, help_text, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, list] = {}   # key → [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values) -> None:
+        with self._lock:
+            s = self._series.get(label_values)
+            if s is None:
+                s = self._series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    s[i] += 1
+            s[-2] += value
+            s[-1] += 1
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for key, s in items:
+            bounds = [_fmt(b) for b in self.buckets] + ["+Inf"]
+            counts = s[:len(self.buckets)] + [s[-1]]
+            for le, n in zip(bounds, counts):
+                yield "%s_bucket%s %d" % (self.name, _labels(self.label_names, key, 'le="%s"' % le), n)
+            yield f"{self.name}_sum{_labels(self.label_names, key)} {_fmt(s[-2])}"
+            yield f"{self.name}_count{_labels(self.label_names, key)} {s[-1]}"
+
+
+# ====== 메트릭 정의 ======
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency by route",
+                         ("endpoint", "method", "status"))
+SQL_LATENCY = Histogram("sql_query_duration_seconds", "SQL execution latency by statement template",
+                        ("statement",))
+SQL_ROWS = Counter("sql_rows_total", "Rows returned/affected by statement template", ("statement",))
+SQL_ERRORS = Counter("sql_errors_total", "SQL execution errors by statement template", ("statement",))
+LLM_LATENCY = Histogram("llm_call_duration_seconds", "Remote LLM call latency (cache misses)", ("model",))
+LLM_ERRORS = Counter("llm_call_errors_total", "Remote LLM call errors", ("model",))
+LLM_CACHE_REQUESTS = Counter("llm_cache_requests_total", "LLM cache lookups", ("model", "result"))
+CHAT_ROUTES = Counter("chat_question_routes_total", "Chat question classifications by source", ("source", "question_type"))
+
+ALL_METRICS = [HTTP_LATENCY, SQL_LATENCY, SQL_ROWS, SQL_ERRORS, LLM_LATENCY, LLM_ERRORS, LLM_CACHE_REQUESTS, CHAT_ROUTES]
+
+
+def render() -> str:
+    lines = []
+    for metric in ALL_METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ====== SQLAlchemy ======
+_RE_WS = re.compile(r"\s+")
+_RE_IN_LIST = re.compile(r"\(\s*(?:%s|\?|:\w+)(?:\s*,\s*(?:%s|\?|:\w+))*\s*\)")
+_RE_NUMBER = re.compile(r"\b\d+\b")
+
+
+def statement_template(statement: str) -> str:
+    """공백 정리 + IN (...) 자리표시자 개수/숫자 리터럴 제거 → 라벨용 템플릿"""
+    s = _RE_WS.sub(" ", str(statement)).strip()
+    s = _RE_IN_LIST.sub("(?)", s)
+    s = _RE_NUMBER.sub(lambda m: m.group(0) if len(m.group(0)) == 4 else "N", s)   # 연도(4자리)는 유지
+    return s[:_STATEMENT_MAX_LEN]
+
+
+_sql_instrumented = False
+_sql_lock = threading.Lock()
+
+
+def instrument_sqlalchemy() -> None:
+    """모든 Engine 에 커서 실행 이벤트 등록 (여러 번 호출해도 1회만)"""
+    global _sql_instrumented
+    with _sql_lock:
+        if _sql_instrumented:
+            return
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        @event.listens_for(Engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("_metrics_t0", []).append(time.perf_counter())
+
+        @event.listens_for(Engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get("_metrics_t0")
+            if not starts:
+                return
+            elapsed = time.perf_counter() - starts.pop()
+            template = statement_template(statement)
+            SQL_LATENCY.observe(elapsed, template)
+            rows = getattr(cursor, "rowcount", -1)
+            if rows is not None and rows >= 0:
+                SQL_ROWS.inc(template, amount=rows)
+
+        @event.listens_for(Engine, "handle_error")
+        def _error(context):
+            starts = context.connection.info.get("_metrics_t0") if context.connection is not None else None
+            if starts:
+                starts.pop()
+            SQL_ERRORS.inc(statement_template(context.statement or ""))
+
+        _sql_instrumented = True
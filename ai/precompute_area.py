@@ -0,0 +1,98 @@
+# ai/precompute_area.py
+"""
+지역 추천 점수(final_result) 오프라인 배치.
+
+모든 (구 × 업종 소분류) 조합에 대해 recommend_area 의 점수 계산을 1회 수행하고
+버전별 아티팩트로 저장한다. /api/recommend/area 는 이 결과를 키 조회로 읽고
+LLM 사유 생성만 수행한다.
+
+실행 (프로젝트 루트에서):
+    python -m ai.precompute_area
+    python -m ai.precompute_area --gu 종로구 마포구 --category 커피-음료
+"""
+import os
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+# config.settings 임포트를 위해 back/ 경로 등록
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'back')))
+
+from ai import recommend_area
+from ai.recommend_area import AREA_SCORE_STORE
+from ai.snapshots import get_data_version
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+
+
+def load_gu_codes():
+    """data/region_info.csv 에서 구(5자리 코드) 목록 로드 → {gu_name: gu_code}"""
+    df = pd.read_csv(os.path.join(DATA_DIR, 'region_info.csv'), encoding='utf-8-sig', dtype={'region_code': str})
+    gu_df = df[df['region_code'].str.len() == 5]
+    return dict(zip(gu_df['region_name'], gu_df['region_code']))
+
+
+def load_categories():
+    df = pd.read_csv(os.path.join(DATA_DIR, 'service_type.csv'), encoding='utf-8-sig')
+    return df['service_name'].astype(str).str.strip().tolist()
+
+
+def build_area_score_table(gu_codes, categories, tables):
+    """모든 (구, 업종) 조합의 final_result 를 하나의 테이블로 결합"""
+    frames = []
+    failed = 0
+    for category_small in categories:
+        # 매출 요약은 구와 무관 → 업종별 1회만 계산
+        summary_df = recommend_area.build_summary_sales(category_small, tables)
+        for gu_name, gu_code in gu_codes.items():
+            try:
+                result = recommend_area.compute_area_scores(category_small, gu_code, tables, summary_df=summary_df)
+            except Exception as e:
+                failed += 1
+                print(f"⚠️ 계산 실패: {gu_name} / {category_small} ({e})")
+                continue
+            if result.empty:
+                continue
+            frames.append(result.assign(gu_name=gu_name, category_small=category_small))
+        print(f"✅ {category_small}: {len(gu_codes)}개 구 처리")
+
+    if not frames:
+        raise RuntimeError("[precompute_area] 계산된 점수가 없습니다.")
+    out = pd.concat(frames, ignore_index=True)
+    out['행정동코드'] = out['행정동코드'].astype(str)
+    return out, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="구 × 업종 지역 추천 점수 사전계산")
+    parser.add_argument('--gu', nargs='*', help="대상 구 이름 (미지정 시 전체)")
+    parser.add_argument('--category', nargs='*', help="대상 업종 소분류 (미지정 시 전체)")
+    parser.add_argument('--version', help="아티팩트 버전명 (기본: 생성 시각)")
+    args = parser.parse_args(argv)
+
+    gu_codes = load_gu_codes()
+    if args.gu:
+        gu_codes = {k: v for k, v in gu_codes.items() if k in set(args.gu)}
+    categories = args.category or load_categories()
+
+    t0 = time.time()
+    tables = recommend_area.load_area_tables()
+    print(f"📂 원본 테이블 로드: {time.time() - t0:.1f}s")
+
+    t1 = time.time()
+    score_df, failed = build_area_score_table(gu_codes, categories, tables)
+    version = AREA_SCORE_STORE.save(score_df, version=args.version, meta={
+        'data_version': get_data_version(),
+        'gu_count': len(gu_codes),
+        'category_count': len(categories),
+        'failed': failed,
+        'elapsed_sec': round(time.time() - t1, 1),
+    })
+    print(f"💾 저장 완료: area@{version} ({len(score_df)} rows, 실패 {failed}건)")
+    return version
+
+
+if __name__ == '__main__':
+    main()
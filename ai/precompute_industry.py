@@ -0,0 +1,116 @@
+# ai/precompute_industry.py
+"""
+업종 추천 점수(final_result) 오프라인 배치.
+
+data/region_info.csv 의 모든 행정동(8자리 코드)에 대해 recommend_industry 의 점수 계산을
+여러 프로세스로 나눠 수행하고 버전별 아티팩트로 저장한다.
+/api/recommend/industry 는 이 결과를 (구, 행정동명)으로 조회하고 상위 TOPK_FOR_REASON 개의
+LLM 사유 생성만 수행한다. (신사동처럼 이름이 같은 동이 여러 구에 있으므로 구까지 키로 사용)
+
+실행 (프로젝트 루트에서):
+    python -m ai.precompute_industry
+    python -m ai.precompute_industry --region 연남동 서교동 --workers 2
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+# config.settings 임포트를 위해 back/ 경로 등록
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'back')))
+
+from ai import recommend_industry
+from ai.recommend_industry import INDUSTRY_SCORE_STORE
+from ai.snapshots import get_data_version
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+PRECOMPUTE_WORKERS = int(os.getenv("PRECOMPUTE_WORKERS", str(os.cpu_count() or 2)))
+CHUNK_SIZE = 20
+
+
+def load_dong_codes():
+    """
+    data/region_info.csv 에서 행정동(8자리 코드) 목록 로드 → {(gu_name, region_name): region_code}
+    구 이름은 동 코드 앞 5자리와 같은 구(5자리 코드) 행에서 찾는다.
+    """
+    df = pd.read_csv(os.path.join(DATA_DIR, 'region_info.csv'), encoding='utf-8-sig', dtype={'region_code': str})
+    gu_df = df[df['region_code'].str.len() == 5]
+    gu_names = dict(zip(gu_df['region_code'], gu_df['region_name']))
+    dong_df = df[df['region_code'].str.len() == 8]
+    return {(gu_names.get(code[:5], ''), name): code
+            for name, code in zip(dong_df['region_name'], dong_df['region_code'])}
+
+
+def score_chunk(dongs):
+    """
+    워커 프로세스에서 실행: [((gu_name, region_name), region_code), ...] → (결합 프레임, 실패 수).
+    스냅샷/인덱스는 워커 프로세스마다 1회 로드되어 청크 간 재사용된다.
+    """
+    frames = []
+    failed = 0
+    for (gu_name, region), dong_code in dongs:
+        try:
+            result = recommend_industry.compute_industry_scores(region, dong_code)
+        except Exception as e:
+            failed += 1
+            print(f"⚠️ 계산 실패: {gu_name} {region} ({e})")
+            continue
+        if not result.empty:
+            frames.append(result.assign(gu_name=gu_name, region=region))
+    out = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return out, failed
+
+
+def build_industry_score_table(dong_codes, workers=PRECOMPUTE_WORKERS):
+    """모든 행정동의 final_result 를 하나의 테이블로 결합 (청크 단위 프로세스 병렬)"""
+    items = list(dong_codes.items())
+    chunks = [items[i:i + CHUNK_SIZE] for i in range(0, len(items), CHUNK_SIZE)]
+
+    frames = []
+    failed = 0
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(score_chunk, chunk) for chunk in chunks]
+        for done, fut in enumerate(as_completed(futures), 1):
+            df, n_failed = fut.result()
+            failed += n_failed
+            if not df.empty:
+                frames.append(df)
+            print(f"✅ {done}/{len(chunks)} 청크 처리")
+
+    if not frames:
+        raise RuntimeError("[precompute_industry] 계산된 점수가 없습니다.")
+    out = pd.concat(frames, ignore_index=True)
+    # 청크 완료 순서와 무관하게 동일한 아티팩트가 되도록 정렬
+    out = out.sort_values(['gu_name', 'region', '업종_추천점수'], ascending=[True, True, False], kind='mergesort')
+    return out.reset_index(drop=True), failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="행정동 × 업종 추천 점수 사전계산")
+    parser.add_argument('--region', nargs='*', help="대상 행정동 이름 (미지정 시 전체)")
+    parser.add_argument('--workers', type=int, default=PRECOMPUTE_WORKERS, help="워커 프로세스 수")
+    parser.add_argument('--version', help="아티팩트 버전명 (기본: 생성 시각)")
+    args = parser.parse_args(argv)
+
+    dong_codes = load_dong_codes()
+    if args.region:
+        dong_codes = {k: v for k, v in dong_codes.items() if k[1] in set(args.region)}
+
+    t0 = time.time()
+    score_df, failed = build_industry_score_table(dong_codes, workers=args.workers)
+    version = INDUSTRY_SCORE_STORE.save(score_df, version=args.version, meta={
+        'data_version': get_data_version(),
+        'dong_count': len(dong_codes),
+        'workers': args.workers,
+        'failed': failed,
+        'elapsed_sec': round(time.time() - t0, 1),
+    })
+    print(f"💾 저장 완료: industry@{version} ({len(score_df)} rows, 실패 {failed}건)")
+    return version
+
+
+if __name__ == '__main__':
+    main()
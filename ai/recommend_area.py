@@ -1,36 +1,50 @@
 import os
 import time
-import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import reduce
 import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine
-from sklearn.preprocessing import MinMaxScaler
 import google.generativeai as genai
 # from openai import OpenAI   # 필요 시 사용
-import pymysql
 
 from config.settings import get_engine  # ✅ DB URL/Engine은 환경변수에서 로드
-
-
-def run_recommendation(category_small, gu_name):
-    """
-    - 민감정보(호스트/계정/비번/API키) 제거: config.settings / .env 사용
-    - SQL 인젝션 방지: 모든 쿼리 파라미터 바인딩
-    - 캐시는 ./cache 폴더에 저장
-    """
-    # ── DB 엔진 (환경변수 로드) ──────────────────────────────────────────────
-    engine = get_engine()
-
-    # ── (선택) 연결 확인 ────────────────────────────────────────────────────
-    try:
-        with engine.connect() as conn:
-            conn.execute("SELECT 1")
-        print("✅ DB 연결 확인")
-    except Exception as e:
-        print("❌ DB 연결 실패:", e)
-        raise
-
-    # ── 구(region_code) 조회: 파라미터 바인딩 ───────────────────────────────
+from ai.score_store import ScoreStore
+from ai.dataset_registry import REGISTRY, get_table
+from ai.snapshots import get_data_version
+from ai.table_index import get_index
+from ai.llm_cache import LLM_CACHE
+from ai.artifacts import EXPORT_ARTIFACTS, export_artifacts
+from ai.scoring import ScoreMatrix, rerank
+from ai import analytics
+
+# ====== 환경설정 ======
+USE_PRECOMPUTED = os.getenv("USE_PRECOMPUTED", "1") == "1"
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "5"))      # 동시 LLM 호출 상한 (프로세스 전역)
+LLM_TIMEOUT_SEC = float(os.getenv("LLM_TIMEOUT_SEC", "15"))   # 호출 1건당 마감 시간
+LLM_DEADLINE_SEC = float(os.getenv("LLM_DEADLINE_SEC", str(LLM_TIMEOUT_SEC * 2)))   # 요청 1건의 전체 마감 (제출 시점부터)
+LLM_PER_REQUEST = int(os.getenv("LLM_PER_REQUEST", "3"))      # 요청 1건이 동시에 올리는 LLM 호출 상한
+AREA_LLM_MODEL = "models/gemini-1.5-flash"
+YEARS = [2022, 2023, 2024]
+
+SCORE_COLUMNS   = ['유동인구','임대시세','평균영업기간(년)','점포수','1년 생존율(%)','3년 생존율(%)','5년 생존율(%)','평균 개업수','평균 폐업수']
+SCORE_COLUMNS_2 = ['2022_평균매출','2023_평균매출','2024_평균매출']
+ALL_SCORE_COLUMNS = SCORE_COLUMNS + SCORE_COLUMNS_2
+
+WEIGHTS = {
+    '유동인구': 0.2422, '임대시세': -0.1453, '평균영업기간(년)': 0.0484, '점포수': 0.3897,
+    '1년 생존율(%)': 0.0182, '3년 생존율(%)': 0.0303, '5년 생존율(%)': 0.0484,
+    '평균 개업수': 0.0606, '평균 폐업수': -0.0347,
+    '2022_평균매출': 0.0870, '2023_평균매출': 0.1275, '2024_평균매출': 0.1275
+}
+
+# (gu_name, category_small) → 사전계산된 final_result (ai/precompute_area.py 배치로 생성)
+AREA_SCORE_STORE = ScoreStore("area", key_cols=("gu_name", "category_small"))
+
+
+# ====== 캐시/조회 유틸 ======
+def get_gu_code(engine, gu_name):
+    """구(region_code) 조회: 파라미터 바인딩"""
     sql_gu_code = """
         SELECT DISTINCT region_code
         FROM floating_population_stats
@@ -40,213 +54,200 @@ def run_recommendation(category_small, gu_name):
     gu_code_df = pd.read_sql_query(sql_gu_code, engine, params=(gu_name,))
     if gu_code_df.empty:
         raise ValueError(f"region_name '{gu_name}'에 해당하는 region_code를 찾지 못했습니다.")
-    gu_code = str(gu_code_df.iloc[0]['region_code'])
-
-    print(f"선택한 구 '{gu_name}'의 지역 코드: {gu_code}")
-    print(f"선택한 업종: {category_small}")
-
-    # ── 캐시 디렉터리 ───────────────────────────────────────────────────────
-    os.makedirs("cache", exist_ok=True)
-
-    # ── 캐시/조회 유틸 ─────────────────────────────────────────────────────
-    def load_or_cache_query(name, table_name):
-        path = f"cache/{name}.feather"
-        if os.path.exists(path):
-            print(f"📂 캐시 불러옴(원본 전체): {name}")
-            return pd.read_feather(path)
-
-        print(f"💾 원본 전체 데이터 저장: {name}")
-        df = pd.read_sql(f"SELECT * FROM {table_name}", engine)
-        df.to_feather(path)
-        return df
-
-    def query_table(
-        table_name,
-        extra_condition="",
-        category_col='category_small',
-        indicator_col='indicator',
-        indicator_val=None,
-        columns='*'
-    ):
-        # ⚠️ 문자열 이어붙이기 대신 파라미터 바인딩 사용
-        base = f"SELECT {columns} FROM {table_name} WHERE region_code LIKE %s"
-        params = [f"{gu_code}%"]
-
-        if category_small and category_col:
-            base += f" AND {category_col} = %s"
-            params.append(category_small)
-
-        if indicator_val and indicator_col:
-            base += f" AND {indicator_col} = %s"
-            params.append(indicator_val)
-
-        if extra_condition:
-            base += f" AND {extra_condition}"
-
-        base += " ORDER BY region_code, year, quarter"
-        return pd.read_sql_query(base, engine, params=tuple(params))
-
-    def load_table(table_name):
-        try:
-            return pd.read_sql(f"SELECT * FROM {table_name}", engine)
-        except Exception as e:
-            print(f"❌ [ERROR] 테이블 {table_name} 로딩 실패:", e)
-            engine.dispose()
-            raise
-
-    def add_region_service_names(df, zone_df, service_df, rent_df):
-        df['zone_id'] = df['zone_id'].astype(str)
-        zone_df['zone_id'] = zone_df['zone_id'].astype(str)
-
-        df = df.merge(zone_df[['zone_id', 'region_name']], on='zone_id', how='left')
-        rent_test_df = rent_df[['region_name', 'region_code']].drop_duplicates(subset=['region_name', 'region_code'])
-        df = df.merge(rent_test_df[['region_name', 'region_code']], on='region_name', how='left')
-        df = df[df['region_code'].notna()]
-        df = df.merge(service_df[['service_code', 'service_name']], on='service_code', how='left')
-
-        # 원래 코드에 category_small+'\r' 비교가 있었는데, 데이터 정합성 이슈 가능.
-        # 개행/캐리지리턴 제거 후 비교로 보수적으로 변경.
-        df['service_name'] = df['service_name'].astype(str).str.replace(r'[\r\n]+', '', regex=True)
-        return df[df['service_name'] == category_small]
-
-    # ── 풀테이블 1회 캐싱 ───────────────────────────────────────────────────
-    t0 = time.time()
-    pop_full_df     = load_or_cache_query("pop_df",      "floating_population_stats")
-    rent_full_df    = load_or_cache_query("rent_df",     "rental_price_stats")
-    age_full_df     = load_or_cache_query("age_df",      "subcategory_avg_operating_period_stats")
-    store_full_df   = load_or_cache_query("store_df",    "subcategory_store_count_stats")
-    survive_full_df = load_or_cache_query("survive_df",  "subcategory_startup_survival")
-    openclose_full_df = load_or_cache_query("openclose_df", "subcategory_openclose_stats")
-
-    zone_df    = load_table('zone_table')
-    zone_df['zone_id']= zone_df['zone_id'].astype(str)
-    service_df = load_table('service_type')
-
-    # ── 최근 4개 분기 필터 ─────────────────────────────────────────────────
+    return str(gu_code_df.iloc[0]['region_code'])
+
+
+# 지표 테이블 (tables 키 → 원본 테이블명)
+INDICATOR_TABLES = {
+    'pop':       "floating_population_stats",
+    'rent':      "rental_price_stats",
+    'age':       "subcategory_avg_operating_period_stats",
+    'store':     "subcategory_store_count_stats",
+    'survive':   "subcategory_startup_survival",
+    'openclose': "subcategory_openclose_stats",
+}
+SALES_TABLES = ("zone_store_count", "sales_by_gender_age", "sales_summary")
+# 매출 테이블에서 실제로 쓰는 컬럼만 읽음 (year 는 결합 시 테이블명 연도로 채움)
+SALES_COLUMNS = {
+    "zone_store_count":    ("zone_id", "service_code", "quarter", "count"),
+    "sales_by_gender_age": ("zone_id", "service_code", "quarter", "gender", "age_group", "sales_amount"),
+    "sales_summary":       ("region_name", "zone_id", "service_name", "service_code", "quarter", "monthly_sales"),
+}
+
+
+def _concat_years(*dfs):
+    return pd.concat([df.assign(year=year) for df, year in zip(dfs, YEARS)])
+
+
+def _recent_periods(pop_df):
+    """최근 4개 분기 → period_key(year*10+quarter) 집합"""
     recent_periods = (
-        pop_full_df[['year', 'quarter']]
+        pop_df[['year', 'quarter']]
         .drop_duplicates()
         .sort_values(['year', 'quarter'], ascending=False)
         .head(4)
-        .sort_values(['year', 'quarter'])
     )
-    recent_period_tuples = set(map(tuple, recent_periods.to_numpy()))
-
-    def filter_recent_quarters(df):
-        return df[df[['year', 'quarter']].apply(tuple, axis=1).isin(recent_period_tuples)]
-
-    def get_pop_df(full_df, gu_code):
-        full_df['region_code'] = full_df['region_code'].astype(str)
-        return full_df[full_df['region_code'].str.startswith(str(gu_code))]
-
-    def get_rent_df(full_df, gu_code):
-        full_df['region_code'] = full_df['region_code'].astype(str)
-        return full_df[full_df['region_code'].str.startswith(str(gu_code))]
-
-    def get_age_df(full_df, gu_code, category_small):
-        full_df['region_code'] = full_df['region_code'].astype(str)
-        return full_df[
-            full_df['region_code'].str.startswith(str(gu_code)) &
-            (full_df['category_small'] == category_small) &
-            (full_df['indicator'] == 'avg_operating_years_30')
-        ]
-
-    def get_store_df(full_df, gu_code, category_small):
-        full_df['region_code'] = full_df['region_code'].astype(str)
-        return full_df[
-            full_df['region_code'].str.startswith(str(gu_code)) &
-            (full_df['category_small'] == category_small) &
-            (full_df['indicator'] == 'store_total')
-        ]
-
-    def get_survive_df(full_df, gu_code, category_small):
-        full_df['region_code'] = full_df['region_code'].astype(str)
-        return full_df[
-            full_df['region_code'].str.startswith(str(gu_code)) &
-            (full_df['category_small'] == category_small)
-        ]
-
-    def get_openclose_df(full_df, gu_code, category_small):
-        full_df['region_code'] = full_df['region_code'].astype(str)
-        return full_df[
-            full_df['region_code'].str.startswith(str(gu_code)) &
-            (full_df['category_small'] == category_small)
-        ]
-
-    pop_filtered     = filter_recent_quarters(get_pop_df(pop_full_df, gu_code))
-    rent_filtered    = filter_recent_quarters(get_rent_df(rent_full_df, gu_code))
-    age_filtered     = filter_recent_quarters(get_age_df(age_full_df, gu_code, category_small))
-    store_filtered   = filter_recent_quarters(get_store_df(store_full_df, gu_code, category_small))
-    survive_filtered = filter_recent_quarters(get_survive_df(survive_full_df, gu_code, category_small))
-    openclose_filtered = filter_recent_quarters(get_openclose_df(openclose_full_df, gu_code, category_small))
-
-    # ── 매출 테이블(연도별) 캐시 ────────────────────────────────────────────
-    years = [2022, 2023, 2024]
-    def load_or_cache_table(table_name, year):
-        filename = f"cache/{table_name}_{year}.feather"
-        if os.path.exists(filename):
-            return pd.read_feather(filename)
-        df = pd.read_sql(f"{'SELECT * FROM ' + table_name + '_' + str(year)}", engine)
-        df.to_feather(filename)
-        return df
-
-    zone_store_count_all   = pd.concat([load_or_cache_table("zone_store_count", year).assign(year=year) for year in years])
-    sales_by_gender_age_all= pd.concat([load_or_cache_table("sales_by_gender_age", year).assign(year=year) for year in years])
-    summary_sales_all      = pd.concat([load_or_cache_table("sales_summary", year).assign(year=year) for year in years])
-
-    # ── 공통 전처리 ────────────────────────────────────────────────────────
-    for df in (sales_by_gender_age_all, summary_sales_all, zone_store_count_all):
-        df['zone_id'] = df['zone_id'].astype(str)
+    return frozenset(int(y) * 10 + int(q) for y, q in recent_periods.to_numpy())
 
-    gender_known_all   = sales_by_gender_age_all[sales_by_gender_age_all['gender'].isin(['여성', '남성'])]
-    gender_unknown_all = sales_by_gender_age_all[~sales_by_gender_age_all['gender'].isin(['여성', '남성'])]
 
-    gender_known_all   = add_region_service_names(gender_known_all, zone_df, service_df, rent_full_df)
-    gender_unknown_all = add_region_service_names(gender_unknown_all, zone_df, service_df, rent_full_df)
+def load_area_tables(gu_code=None):
+    """
+    지역 추천에 필요한 원본 테이블 (요청/배치 공용).
+    - 지표 테이블 6종 + zone/service + 연도별 매출 테이블 3종
+    - 프로세스 전역 레지스트리에서 받아오므로 요청마다 디스크를 읽지 않음 (매출 결합/인덱스는 공유 원본 → 읽기 전용)
+    - gu_code: 지정하면 지표 테이블은 그 구 파티션만 읽음 (요청 경로). 배치는 None(서울 전체)
+    """
+    tables = {key: get_table(table, gu=gu_code) for key, table in INDICATOR_TABLES.items()}
+    # 지표 테이블은 (region, category, period) 정렬 인덱스로 조회 (duckdb 백엔드면 SQL 집계라 불필요)
+    if not analytics.enabled():
+        tables['index'] = {key: get_index(table, gu=gu_code) for key, table in INDICATOR_TABLES.items()}
+    tables['zone'] = get_table('zone_table')
+    tables['service'] = get_table('service_type')
+
+    # ── 매출 테이블(연도별) 결합 / 최근 4개 분기: 스냅샷이 바뀔 때만 재계산 ──
+    for name in SALES_TABLES:
+        sources = [(f"{name}_{year}", SALES_COLUMNS[name]) for year in YEARS]
+        tables[name] = REGISTRY.derived(f"{name}_all", sources, _concat_years)
+    tables['recent_periods'] = REGISTRY.derived(
+        "recent_periods", [(INDICATOR_TABLES['pop'], ("year", "quarter"))], _recent_periods)
+    return tables
+
+
+# ====== 지표 필터 (정렬 인덱스 이진 탐색) ======
+def get_pop_df(index, gu_code, periods):
+    return index.select(region=gu_code, periods=periods)
+
+def get_rent_df(index, gu_code, periods):
+    return index.select(region=gu_code, periods=periods)
+
+def get_age_df(index, gu_code, category_small, periods):
+    return index.select(region=gu_code, category=category_small, periods=periods, indicator='avg_operating_years_30')
+
+def get_store_df(index, gu_code, category_small, periods):
+    return index.select(region=gu_code, category=category_small, periods=periods, indicator='store_total')
+
+def get_survive_df(index, gu_code, category_small, periods):
+    return index.select(region=gu_code, category=category_small, periods=periods)
+
+def get_openclose_df(index, gu_code, category_small, periods):
+    return index.select(region=gu_code, category=category_small, periods=periods)
+
+
+# ====== 통계/점수 계산 (기존 로직 유지) ======
+def get_avg_fast(df, group_col='region_code', val_col=None, rename_col=None):
+    df = df[[group_col, 'region_name', val_col]].copy()
+    df[val_col] = pd.to_numeric(df[val_col], errors='coerce')
+    df = df[df[val_col].notna()]
+    grouped = df.groupby(group_col, sort=False).agg({val_col: 'mean', 'region_name': 'first'}).reset_index()
+    if rename_col:
+        grouped = grouped.rename(columns={val_col: rename_col})
+    return grouped
+
+def get_group_avg(df, group_col, rename_map: dict, round_digits=2):
+    agg_dict = {col: 'mean' for col in rename_map.keys()}
+    agg_dict['region_name'] = 'first'
+    grouped = df.groupby(group_col, sort=False).agg(agg_dict).reset_index()
+    grouped = grouped.rename(columns=rename_map)
+    return grouped.round(round_digits)
+
+# ====== 통계 (ANALYTICS_BACKEND=duckdb: 스냅샷 위 SQL 집계, 위 pandas 버전과 같은 결과) ======
+def _indicator_filter(table, gu_code, periods, category_small=None, indicator=None):
+    """구 접두 + 최근 분기 (+ 업종/지표) 조건 → (FROM/WHERE 절, params)"""
+    periods = sorted(periods)
+    where = ["region_code LIKE %s",
+             f"CAST(year AS BIGINT) * 10 + CAST(quarter AS BIGINT) IN ({','.join(['%s'] * len(periods))})"]
+    params = [f"{gu_code}%"] + periods
+    if category_small is not None:
+        where.append("category_small = %s")
+        params.append(category_small)
+    if indicator is not None:
+        where.append("indicator = %s")
+        params.append(indicator)
+    return f"FROM {table} WHERE " + " AND ".join(where), params
+
+def get_avg_sql(table, gu_code, periods, val_col, rename_col, category_small=None, indicator=None):
+    source, params = _indicator_filter(table, gu_code, periods, category_small, indicator)
+    sql = f"""
+        SELECT region_code, AVG(v) AS "{rename_col}", any_value(region_name) AS region_name
+        FROM (SELECT region_code, region_name, TRY_CAST({val_col} AS DOUBLE) AS v {source})
+        WHERE v IS NOT NULL
+        GROUP BY region_code
+        ORDER BY region_code
+    """
+    return analytics.get_analytics().query(sql, params)
+
+def get_group_avg_sql(table, gu_code, periods, rename_map: dict, category_small=None, round_digits=2):
+    source, params = _indicator_filter(table, gu_code, periods, category_small)
+    cols = ", ".join(f'AVG(TRY_CAST({c} AS DOUBLE)) AS "{r}"' for c, r in rename_map.items())
+    sql = f"""
+        SELECT region_code, {cols}, any_value(region_name) AS region_name
+        {source}
+        GROUP BY region_code
+        ORDER BY region_code
+    """
+    return analytics.get_analytics().query(sql, params).round(round_digits)
 
-    def merge_sales_with_store(df, group_cols, sales_col='sales_amount'):
-        df = df.merge(
-            zone_store_count_all[['zone_id', 'service_code', 'year', 'quarter', 'count']],
-            on=['zone_id', 'service_code', 'year', 'quarter'],
-            how='inner'
-        )
-        df['avg_sales_per_store'] = df[sales_col] / df['count']
-        return df
 
-    # 성별별
-    gender_all = merge_sales_with_store(gender_known_all, ['zone_id', 'service_code', 'year', 'quarter'])
-    gender_all = gender_all[gender_all['region_code'].astype(str).str.startswith(gu_code)]
-    gender_all = gender_all[["region_name", "zone_id", "service_name", "service_code", "year", "quarter", "gender", "avg_sales_per_store", "count"]]
-    gender_sales = {year: gender_all[gender_all['year'] == year].reset_index(drop=True) for year in years}
+def get_avg_sales_fast(sales_df, group_col):
+    sales_df = sales_df[['region_name', 'service_name', 'service_code', group_col, 'avg_sales_per_store']].copy()
+    sales_df['avg_sales_per_store'] = pd.to_numeric(sales_df['avg_sales_per_store'], errors='coerce')
+    sales_df = sales_df.dropna(subset=['avg_sales_per_store'])
+    out = (
+        sales_df.groupby(['region_name', group_col], sort=False)
+        .agg({'avg_sales_per_store':'mean','service_name':'first','service_code':'first'})
+        .reset_index()
+    )
+    out['avg_sales_per_store'] = (out['avg_sales_per_store'] / 3).round(2)
+    return out
+
+def get_avg_sales_sum_fast(sales_df):
+    sales_df = sales_df[['region_name', 'service_name', 'service_code', 'avg_sales_per_store']].copy()
+    sales_df['avg_sales_per_store'] = pd.to_numeric(sales_df['avg_sales_per_store'], errors='coerce')
+    sales_df = sales_df.dropna(subset=['avg_sales_per_store'])
+    out = (
+        sales_df.groupby('region_name', sort=False)
+        .agg({'avg_sales_per_store':'mean','service_name':'first','service_code':'first'})
+        .reset_index()
+    )
+    out['avg_sales_per_store'] = (out['avg_sales_per_store'] / 3).round(2)
+    return out
 
-    # 연령대별
-    age_all = merge_sales_with_store(gender_unknown_all, ['zone_id', 'service_code', 'year', 'quarter'])
-    age_all = age_all[age_all['region_code'].astype(str).str.startswith(gu_code)]
-    age_all = age_all[["region_name", "zone_id", "service_name", "service_code", "year", "quarter", "age_group", "avg_sales_per_store", "count"]]
-    age_sales = {year: age_all[age_all['year'] == year].reset_index(drop=True) for year in years}
 
-    # 전체 요약
-    summary_sales_all = summary_sales_all[summary_sales_all['service_name'] == category_small]
-    summary_sales_all = merge_sales_with_store(summary_sales_all, ['zone_id', 'service_code', 'year', 'quarter'], sales_col='monthly_sales')
-    summary_sales_all = summary_sales_all[["region_name", "zone_id", "service_name", "service_code", "year", "quarter", "avg_sales_per_store", "count"]]
-    summary_sales = {year: summary_sales_all[summary_sales_all['year'] == year].reset_index(drop=True) for year in years}
-
-    # ── 통계/점수 계산(기존 로직 유지) ───────────────────────────────────────
-    def get_avg_fast(df, group_col='region_code', val_col=None, rename_col=None):
-        df = df[[group_col, 'region_name', val_col]].copy()
-        df[val_col] = pd.to_numeric(df[val_col], errors='coerce')
-        df = df[df[val_col].notna()]
-        grouped = df.groupby(group_col, sort=False).agg({val_col: 'mean', 'region_name': 'first'}).reset_index()
-        if rename_col:
-            grouped = grouped.rename(columns={val_col: rename_col})
-        return grouped
-
-    def get_group_avg(df, group_col, rename_map: dict, round_digits=2):
-        agg_dict = {col: 'mean' for col in rename_map.keys()}
-        agg_dict['region_name'] = 'first'
-        grouped = df.groupby(group_col, sort=False).agg(agg_dict).reset_index()
-        grouped = grouped.rename(columns=rename_map)
-        return grouped.round(round_digits)
+def add_region_service_names(df, zone_df, service_df, rent_df, category_small):
+    df = df.merge(zone_df[['zone_id', 'region_name']], on='zone_id', how='left')
+    rent_test_df = rent_df[['region_name', 'region_code']].drop_duplicates(subset=['region_name', 'region_code'])
+    df = df.merge(rent_test_df[['region_name', 'region_code']], on='region_name', how='left')
+    df = df[df['region_code'].notna()]
+    df = df.merge(service_df[['service_code', 'service_name']], on='service_code', how='left')
+
+    # 원래 코드에 category_small+'\r' 비교가 있었는데, 데이터 정합성 이슈 가능.
+    # 개행/캐리지리턴 제거 후 비교로 보수적으로 변경.
+    df['service_name'] = df['service_name'].astype(str).str.replace(r'[\r\n]+', '', regex=True)
+    return df[df['service_name'] == category_small]
+
+
+def merge_sales_with_store(df, zone_store_count_all, sales_col='sales_amount'):
+    df = df.merge(
+        zone_store_count_all[['zone_id', 'service_code', 'year', 'quarter', 'count']],
+        on=['zone_id', 'service_code', 'year', 'quarter'],
+        how='inner'
+    )
+    df['avg_sales_per_store'] = df[sales_col] / df['count']
+    return df
+
+
+def build_indicator_frame(category_small, gu_code, tables):
+    """구(gu_code) 내 행정동별 지표 평균 (유동인구/임대/영업기간/점포수/생존율/개폐업)"""
+    if analytics.enabled():
+        return _build_indicator_frame_sql(category_small, gu_code, tables['recent_periods'])
+
+    recent, index = tables['recent_periods'], tables['index']
+    pop_filtered       = get_pop_df(index['pop'], gu_code, recent)
+    rent_filtered      = get_rent_df(index['rent'], gu_code, recent)
+    age_filtered       = get_age_df(index['age'], gu_code, category_small, recent)
+    store_filtered     = get_store_df(index['store'], gu_code, category_small, recent)
+    survive_filtered   = get_survive_df(index['survive'], gu_code, category_small, recent)
+    openclose_filtered = get_openclose_df(index['openclose'], gu_code, category_small, recent)
 
     pop_avg   = get_avg_fast(pop_filtered,   val_col='floating_population', rename_col='유동인구')
     rent_avg  = get_avg_fast(rent_filtered,  val_col='rent_total',          rename_col='임대시세')
@@ -256,102 +257,126 @@ def run_recommendation(category_small, gu_name):
     survive_avg   = get_group_avg(survive_filtered, 'region_code', {'survival_1yr': '1년 생존율(%)','survival_3yr': '3년 생존율(%)','survival_5yr': '5년 생존율(%)'})
     openclose_avg = get_group_avg(openclose_filtered, 'region_code', {'num_open': '평균 개업수','num_close': '평균 폐업수'})
 
-    from functools import reduce
-    dfs = [pop_avg, rent_avg, age_avg, store_avg, survive_avg, openclose_avg]
+    return _merge_indicators([pop_avg, rent_avg, age_avg, store_avg, survive_avg, openclose_avg])
+
+
+def _build_indicator_frame_sql(category_small, gu_code, recent):
+    """build_indicator_frame 의 DuckDB 버전: 지표별 필터+집계를 엔진 안에서 한 번에 처리"""
+    t = INDICATOR_TABLES
+    pop_avg   = get_avg_sql(t['pop'],   gu_code, recent, 'floating_population', '유동인구')
+    rent_avg  = get_avg_sql(t['rent'],  gu_code, recent, 'rent_total',          '임대시세')
+    age_avg   = get_avg_sql(t['age'],   gu_code, recent, 'value', '평균영업기간(년)', category_small, 'avg_operating_years_30')
+    store_avg = get_avg_sql(t['store'], gu_code, recent, 'value', '점포수',          category_small, 'store_total')
+
+    survive_avg   = get_group_avg_sql(t['survive'], gu_code, recent, {'survival_1yr': '1년 생존율(%)','survival_3yr': '3년 생존율(%)','survival_5yr': '5년 생존율(%)'}, category_small)
+    openclose_avg = get_group_avg_sql(t['openclose'], gu_code, recent, {'num_open': '평균 개업수','num_close': '평균 폐업수'}, category_small)
+    return _merge_indicators([pop_avg, rent_avg, age_avg, store_avg, survive_avg, openclose_avg])
+
+
+def _merge_indicators(dfs):
     merged_df = reduce(lambda L, R: pd.merge(L, R, on=['region_code', 'region_name'], how='inner', sort=False), dfs)
-    merged_df = merged_df.rename(columns={'region_code': '행정동코드', 'region_name': '행정동명'}).sort_values(by='유동인구', ascending=False, ignore_index=True)
-
-    # 매출 평균들
-    def get_avg_sales_fast(sales_df, group_col):
-        sales_df = sales_df[['region_name', 'service_name', 'service_code', group_col, 'avg_sales_per_store']].copy()
-        sales_df['avg_sales_per_store'] = pd.to_numeric(sales_df['avg_sales_per_store'], errors='coerce')
-        sales_df = sales_df.dropna(subset=['avg_sales_per_store'])
-        out = (
-            sales_df.groupby(['region_name', group_col], sort=False)
-            .agg({'avg_sales_per_store':'mean','service_name':'first','service_code':'first'})
-            .reset_index()
-        )
-        out['avg_sales_per_store'] = (out['avg_sales_per_store'] / 3).round(2)
-        return out
-
-    def get_avg_sales_sum_fast(sales_df):
-        sales_df = sales_df[['region_name', 'service_name', 'service_code', 'avg_sales_per_store']].copy()
-        sales_df['avg_sales_per_store'] = pd.to_numeric(sales_df['avg_sales_per_store'], errors='coerce')
-        sales_df = sales_df.dropna(subset=['avg_sales_per_store'])
-        out = (
-            sales_df.groupby('region_name', sort=False)
-            .agg({'avg_sales_per_store':'mean','service_name':'first','service_code':'first'})
-            .reset_index()
-        )
-        out['avg_sales_per_store'] = (out['avg_sales_per_store'] / 3).round(2)
-        return out
-
-    gender_list, age_list, summary_list = [], [], []
-    for year in years:
-        g = get_avg_sales_fast(gender_sales[year], group_col='gender'); g['year'] = year; gender_list.append(g)
-        a = get_avg_sales_fast(age_sales[year],   group_col='age_group'); a['year'] = year; age_list.append(a)
-        s = get_avg_sales_sum_fast(summary_sales[year]); s['year'] = year; summary_list.append(s)
-
-    gender_df  = pd.concat(gender_list, ignore_index=True).rename(columns={'region_name':'행정동명','service_name':'업종명','service_code':'업종코드','gender':'성별','avg_sales_per_store':'성별별 평균 월 매출'})
-    age_df     = pd.concat(age_list,    ignore_index=True).rename(columns={'region_name':'행정동명','service_name':'업종명','service_code':'업종코드','age_group':'연령대','avg_sales_per_store':'연령대별 평균 월 매출'})
-    summary_df = pd.concat(summary_list, ignore_index=True).rename(columns={'region_name':'행정동명','service_name':'업종명','service_code':'업종코드','avg_sales_per_store':'평균 월 매출'})
-
-    gender_df.to_json('gender_avg_sales_dong.json',  orient='records', force_ascii=False, indent=4)
-    age_df.to_json('age_avg_sales_dong.json',       orient='records', force_ascii=False, indent=4)
-    summary_df.to_json('summary_avg_sales_dong.json',orient='records', force_ascii=False, indent=4)
+    return merged_df.rename(columns={'region_code': '행정동코드', 'region_name': '행정동명'}).sort_values(by='유동인구', ascending=False, ignore_index=True)
 
-    pivot_summary = (
-        summary_df
-        .pivot_table(index=['행정동명','업종명'], columns='year', values='평균 월 매출', aggfunc='mean')
-        .rename(columns={2022:'2022_평균매출', 2023:'2023_평균매출', 2024:'2024_평균매출'})
-        .reset_index()
-    )
 
-    merged_df = merged_df.merge(pivot_summary[['행정동명','2022_평균매출','2023_평균매출','2024_평균매출']], on='행정동명', how='left')
-    merged_df.to_json('merged_dong.json', orient='records', force_ascii=False, indent=4)
+def build_summary_sales(category_small, tables):
+    """업종 기준 연도별 점포당 평균 월매출 (서울 전체 행정동, 구와 무관 → 배치에서 재사용)"""
+    summary_sales_all = tables['sales_summary']
+    summary_sales_all = summary_sales_all[summary_sales_all['service_name'] == category_small]
+    summary_sales_all = merge_sales_with_store(summary_sales_all, tables['zone_store_count'], sales_col='monthly_sales')
+    summary_sales_all = summary_sales_all[["region_name", "zone_id", "service_name", "service_code", "year", "quarter", "avg_sales_per_store", "count"]]
+
+    summary_list = []
+    for year in YEARS:
+        s = get_avg_sales_sum_fast(summary_sales_all[summary_sales_all['year'] == year].reset_index(drop=True))
+        s['year'] = year
+        summary_list.append(s)
+    return pd.concat(summary_list, ignore_index=True).rename(columns={'region_name':'행정동명','service_name':'업종명','service_code':'업종코드','avg_sales_per_store':'평균 월 매출'})
+
+
+def build_demographic_sales(category_small, gu_code, tables):
+    """성별/연령대별 평균 월매출 (점수에는 쓰이지 않고 산출물 저장용)"""
+    sales_by_gender_age_all = tables['sales_by_gender_age']
+    gender_known_all   = sales_by_gender_age_all[sales_by_gender_age_all['gender'].isin(['여성', '남성'])]
+    gender_unknown_all = sales_by_gender_age_all[~sales_by_gender_age_all['gender'].isin(['여성', '남성'])]
+
+    gender_known_all   = add_region_service_names(gender_known_all, tables['zone'], tables['service'], tables['rent'], category_small)
+    gender_unknown_all = add_region_service_names(gender_unknown_all, tables['zone'], tables['service'], tables['rent'], category_small)
+
+    # 성별별
+    gender_all = merge_sales_with_store(gender_known_all, tables['zone_store_count'])
+    gender_all = gender_all[gender_all['region_code'].astype(str).str.startswith(gu_code)]
+    gender_all = gender_all[["region_name", "zone_id", "service_name", "service_code", "year", "quarter", "gender", "avg_sales_per_store", "count"]]
+
+    # 연령대별
+    age_all = merge_sales_with_store(gender_unknown_all, tables['zone_store_count'])
+    age_all = age_all[age_all['region_code'].astype(str).str.startswith(gu_code)]
+    age_all = age_all[["region_name", "zone_id", "service_name", "service_code", "year", "quarter", "age_group", "avg_sales_per_store", "count"]]
 
-    score_columns   = ['유동인구','임대시세','평균영업기간(년)','점포수','1년 생존율(%)','3년 생존율(%)','5년 생존율(%)','평균 개업수','평균 폐업수']
-    score_columns_2 = ['2022_평균매출','2023_평균매출','2024_평균매출']
-    all_score_columns = score_columns + score_columns_2
+    gender_list, age_list = [], []
+    for year in YEARS:
+        g = get_avg_sales_fast(gender_all[gender_all['year'] == year].reset_index(drop=True), group_col='gender'); g['year'] = year; gender_list.append(g)
+        a = get_avg_sales_fast(age_all[age_all['year'] == year].reset_index(drop=True),   group_col='age_group'); a['year'] = year; age_list.append(a)
 
-    weights = {
-        '유동인구': 0.2422, '임대시세': -0.1453, '평균영업기간(년)': 0.0484, '점포수': 0.3897,
-        '1년 생존율(%)': 0.0182, '3년 생존율(%)': 0.0303, '5년 생존율(%)': 0.0484,
-        '평균 개업수': 0.0606, '평균 폐업수': -0.0347,
-        '2022_평균매출': 0.0870, '2023_평균매출': 0.1275, '2024_평균매출': 0.1275
-    }
+    gender_df = pd.concat(gender_list, ignore_index=True).rename(columns={'region_name':'행정동명','service_name':'업종명','service_code':'업종코드','gender':'성별','avg_sales_per_store':'성별별 평균 월 매출'})
+    age_df    = pd.concat(age_list,    ignore_index=True).rename(columns={'region_name':'행정동명','service_name':'업종명','service_code':'업종코드','age_group':'연령대','avg_sales_per_store':'연령대별 평균 월 매출'})
+    return gender_df, age_df
 
-    norm_input = merged_df[all_score_columns].replace([np.inf,-np.inf], np.nan).fillna(0)
-    scaler = MinMaxScaler()
-    normalized_values = scaler.fit_transform(norm_input)
-    normalized_df = pd.DataFrame(normalized_values, columns=[f'norm_{c}' for c in all_score_columns])
 
-    merged_with_norm = pd.concat([merged_df.reset_index(drop=True), normalized_df], axis=1)
-    weight_array = np.array([weights[c] for c in all_score_columns])
-    norm_cols = [f'norm_{c}' for c in all_score_columns]
-    merged_with_norm['행정동_추천점수'] = merged_with_norm[norm_cols].values.dot(weight_array)
+def score_area(merged_df):
+    """
+    MinMax 정규화 → 가중합으로 행정동_추천점수 계산 후 정렬.
+    정규화 값(norm_*)은 요청 가중치 재정렬용으로 결과에 남김 (구 전체 행 포함 기준)
+    """
+    merged_df = merged_df.reset_index(drop=True)
+    matrix = ScoreMatrix.fit(merged_df, ALL_SCORE_COLUMNS)
+    merged_with_norm = pd.concat([merged_df, matrix.normalized_frame()], axis=1)
+    merged_with_norm['행정동_추천점수'] = matrix.score(WEIGHTS)
 
-    final_result = (
+    return (
         merged_with_norm
-        .drop(columns=norm_cols + ['업종명'])
+        .drop(columns=['업종명'])
         .loc[merged_with_norm['행정동코드'].astype(str).str.len() != 5]
         .replace([np.inf,-np.inf], np.nan)
-        .dropna(subset=score_columns_2)
+        .dropna(subset=SCORE_COLUMNS_2)
         .sort_values(by='행정동_추천점수', ascending=False)
         .reset_index(drop=True)
     )
 
-    final_result.to_csv('filtered_result_dong.csv', index=False, encoding='utf-8-sig')
-    final_result.to_json('filtered_result_dong.json', orient='records', force_ascii=False, indent=4)
 
-    # ── LLM 설정 (환경변수) ────────────────────────────────────────────────
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    if not GEMINI_API_KEY:
-        raise RuntimeError("GEMINI_API_KEY 환경변수가 필요합니다.")
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel(model_name="models/gemini-1.5-flash")
+def compute_area_scores(category_small, gu_code, tables, summary_df=None, artifacts=None):
+    """
+    (구, 업종) → 행정동별 점수 테이블(final_result).
+    - summary_df: build_summary_sales 결과 재사용(배치에서 업종별 1회 계산)
+    - artifacts: dict 를 넘기면 중간 산출물(DataFrame)을 이름별로 담아줌 (EXPORT_ARTIFACTS 용)
+    """
+    merged_df = build_indicator_frame(category_small, gu_code, tables)
+    if summary_df is None:
+        summary_df = build_summary_sales(category_small, tables)
+
+    if artifacts is not None:
+        gender_df, age_df = build_demographic_sales(category_small, gu_code, tables)
+        artifacts.update({
+            'gender_avg_sales_dong': gender_df,
+            'age_avg_sales_dong': age_df,
+            'summary_avg_sales_dong': summary_df,
+        })
 
-    few_shot_examples = """
+    pivot_summary = (
+        summary_df
+        .pivot_table(index=['행정동명','업종명'], columns='year', values='평균 월 매출', aggfunc='mean')
+        .rename(columns={2022:'2022_평균매출', 2023:'2023_평균매출', 2024:'2024_평균매출'})
+        .reset_index()
+    )
+
+    merged_df = merged_df.merge(pivot_summary[['행정동명','업종명','2022_평균매출','2023_평균매출','2024_평균매출']], on='행정동명', how='left')
+    if artifacts is not None:
+        artifacts['merged_dong'] = merged_df
+
+    return score_area(merged_df)
+
+
+# ====== LLM 추천 사유 ======
+few_shot_examples = """
     [예시 1]
     서교동은 압도적인 유동인구와 매우 높은 월매출을 바탕으로 커피-음료 수요가 풍부한 핵심 상권입니다.
     주변 상주 인구 및 직장인이 많아 테이크아웃과 휴식 수요가 꾸준하며, 높은 잠재 수익을 기대할 수 있습니다.
@@ -363,9 +388,9 @@ def run_recommendation(category_small, gu_name):
     이는 활발한 소비력과 업종 특성을 고려할 때, 미용실 창업에 매우 유리한 환경을 제공합니다.
     """
 
-    def generate_region_summary(row, gu_name, category_small):
-        weights_info = "가중치는 유동인구(0.24), 점포수(0.39), 2024 평균 매출(0.13) 등이 큽니다."
-        prompt = f"""
+def generate_region_summary(model, row, gu_name, category_small, timeout=LLM_TIMEOUT_SEC):
+    weights_info = "가중치는 유동인구(0.24), 점포수(0.39), 2024 평균 매출(0.13) 등이 큽니다."
+    prompt = f"""
         당신은 상권 분석 전문가입니다.
         아래는 '{gu_name}' 지역 '{category_small}' 업종의 특정 행정동 핵심 상권 지표입니다:
 
@@ -391,22 +416,145 @@ def run_recommendation(category_small, gu_name):
 
         {weights_info}
         """
-        response = model.generate_content(prompt)
-        return response.text.strip()
+    text, _ = LLM_CACHE.get_or_call(
+        AREA_LLM_MODEL, prompt,
+        lambda: model.generate_content(prompt, request_options={"timeout": timeout}).text.strip(),
+    )
+    return text
+
+
+def rule_based_area_reason(row, category_small):
+    """LLM 실패/지연 시 사용할 지표 기반 추천 사유"""
+    def _num(x):
+        try:
+            v = float(x)
+            return v if np.isfinite(v) else 0
+        except Exception:
+            return 0
+
+    parts = [f"{row.get('행정동명', '해당 행정동')}은(는) {category_small} 업종 기준 추천 점수가 높은 지역입니다."]
+    if _num(row.get('유동인구')) > 0:
+        parts.append(f"유동인구가 약 {int(_num(row.get('유동인구'))):,}명으로 수요 기반이 갖춰져 있습니다.")
+    if _num(row.get('점포수')) > 0:
+        parts.append(f"동종 점포 {int(_num(row.get('점포수')))}개가 영업 중인 검증된 상권입니다.")
+    s22, s24 = _num(row.get('2022_평균매출')), _num(row.get('2024_평균매출'))
+    if s24 > 0:
+        trend = "상승 추세" if s22 and s24 > s22 else "꾸준한 수준"
+        parts.append(f"2024년 점포당 평균 월매출이 {trend}를 보입니다.")
+    return " ".join(parts[:3])
+
+
+_llm_executor = None
+_llm_executor_lock = threading.Lock()
+
+def _get_llm_executor():
+    """프로세스 전역 LLM 풀 (동시 첫 요청에도 1개만 생성 → LLM_CONCURRENCY 상한 유지)"""
+    global _llm_executor
+    if _llm_executor is None:
+        with _llm_executor_lock:
+            if _llm_executor is None:
+                _llm_executor = ThreadPoolExecutor(max_workers=LLM_CONCURRENCY, thread_name_prefix="area-llm")
+    return _llm_executor
+
+
+def _summary_before(deadline, model, row, gu_name, category_small):
+    """워커에서 실행. 차례가 왔을 때 이미 마감이 지났으면 호출하지 않고, 남은 시간만큼만 기다린다"""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return None
+    return generate_region_summary(model, row, gu_name, category_small, timeout=min(LLM_TIMEOUT_SEC, remaining))
+
+
+def generate_area_recommendations(final_result, gu_name, category_small, top_n=5):
+    """
+    상위 top_n 행정동 추천 사유를 동시에 생성.
+    - 요청 1건당 제출 시점부터 LLM_DEADLINE_SEC 마감 (공유 풀이 다른 요청으로 붐벼도 같은 기준)
+    - 요청 1건이 동시에 올리는 호출은 LLM_PER_REQUEST 개까지 (하나 끝나면 다음 행 제출)
+    - 마감 이후에는 새로 제출하지 않고, 대기 중인 호출은 취소, 실행 중인 호출은 남은 시간만큼만 기다림
+    - 실패/마감 초과 행은 규칙 기반 사유로 대체
+    """
+    rows = [row for _, row in final_result.head(top_n).iterrows()]
+
+    # ── LLM 설정 (환경변수) ────────────────────────────────────────────────
+    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+    model = None
+    if GEMINI_API_KEY:
+        genai.configure(api_key=GEMINI_API_KEY)
+        model = genai.GenerativeModel(model_name=AREA_LLM_MODEL)
+    else:
+        print("⚠️ GEMINI_API_KEY 미설정 → 규칙 기반 추천 사유 사용")
+
+    reasons = [None] * len(rows)
+    if model is not None and rows:
+        executor = _get_llm_executor()
+        deadline = time.monotonic() + LLM_DEADLINE_SEC
+        pending = list(enumerate(rows))
+        in_flight = {}
+        while pending or in_flight:
+            while pending and len(in_flight) < max(LLM_PER_REQUEST, 1) and time.monotonic() < deadline:
+                i, row = pending.pop(0)
+                in_flight[executor.submit(_summary_before, deadline, model, row, gu_name, category_small)] = i
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not in_flight:
+                break
+            done, _ = wait(in_flight, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = in_flight.pop(future)
+                try:
+                    reasons[i] = future.result()
+                except Exception as e:
+                    print(f"⚠️ LLM 추천 사유 생성 실패 → 규칙 기반 대체: {e}")
+        for future in in_flight:
+            future.cancel()
+        if in_flight or pending:
+            print(f"⏱️ LLM 마감 초과 {len(in_flight) + len(pending)}건 → 규칙 기반 대체")
 
-    top_n = 5
     recommendation_list = []
-    for _, row in final_result.head(top_n).iterrows():
+    for row, reason in zip(rows, reasons):
         full_district_name = f"{gu_name} {row['행정동명']}"
-        reason = generate_region_summary(row, gu_name, category_small)
-        recommendation_list.append({'district': full_district_name, 'reason': reason})
+        recommendation_list.append({'district': full_district_name, 'reason': reason or rule_based_area_reason(row, category_small)})
+    return {category_small: recommendation_list}
 
-    recommendation_dict = {category_small: recommendation_list}
-    with open('recommendation_dong.json', 'w', encoding='utf-8') as f:
-        json.dump(recommendation_dict, f, ensure_ascii=False, indent=4)
 
-    print("✅ JSON 저장 완료")
-    print(json.dumps(recommendation_dict, ensure_ascii=False, indent=4))
+# ====== 핵심 추천 파이프라인 ======
+def run_recommendation(category_small, gu_name, weights=None):
+    """
+    - 민감정보(호스트/계정/비번/API키) 제거: config.settings / .env 사용
+    - SQL 인젝션 방지: 모든 쿼리 파라미터 바인딩
+    - 스냅샷/사전계산 점수는 CACHE_DIR(기본 back/cache) 아래에 저장
+    - 사전계산 점수(ai/precompute_area.py)가 있으면 조회만 하고 LLM 단계만 수행
+    - weights: 요청 가중치({지표: 값}, WEIGHTS 에 덮어씀) → 정규화 행렬로 재정렬만 수행
+    - 중간 산출물 파일은 EXPORT_ARTIFACTS=1 일 때만 요청별 디렉토리에 비동기 저장
+    """
+    print(f"선택한 구: {gu_name} / 선택한 업종: {category_small}")
+
+    artifacts = {} if EXPORT_ARTIFACTS else None
+    final_result = None
+    if USE_PRECOMPUTED:
+        final_result = AREA_SCORE_STORE.lookup(gu_name, category_small, data_version=get_data_version())
+    if final_result is not None:
+        print(f"⚡ 사전계산 점수 사용: {AREA_SCORE_STORE.kind}@{AREA_SCORE_STORE.version}")
+    else:
+        # ── DB 엔진 (환경변수 로드) ──────────────────────────────────────────
+        engine = get_engine()
+
+        gu_code = get_gu_code(engine, gu_name)
+        print(f"선택한 구 '{gu_name}'의 지역 코드: {gu_code}")
+
+        t0 = time.time()
+        tables = load_area_tables(gu_code)
+        final_result = compute_area_scores(category_small, gu_code, tables, artifacts=artifacts)
+        print(f"⏱️ 점수 계산: {time.time() - t0:.2f}s")
+
+    if weights:
+        final_result = rerank(final_result, ALL_SCORE_COLUMNS, {**WEIGHTS, **weights}, '행정동_추천점수')
+
+    recommendation_dict = generate_area_recommendations(final_result, gu_name, category_small)
+    print(f"✅ 지역 추천 완료: {len(recommendation_dict.get(category_small, []))}건")
+
+    if artifacts is not None:
+        artifacts.update({'filtered_result_dong': final_result, 'recommendation_dong': recommendation_dict})
+        export_artifacts('area', (gu_name, category_small), artifacts)
 
     # 함수 반환(필요 시)
     return recommendation_dict
@@ -1,15 +1,18 @@
 # ai/recommend_industry.py
 import os
 import time
-import json
 import difflib
-import numpy as np
 import pandas as pd
-from sqlalchemy import text
-from sklearn.preprocessing import MinMaxScaler
 
 # DB/엔진은 환경변수에서 안전하게 로드
 from config.settings import get_engine
+from ai.dataset_registry import REGISTRY, get_table
+from ai.table_index import get_index, select_zones
+from ai.llm_cache import LLM_CACHE
+from ai.artifacts import EXPORT_ARTIFACTS, export_artifacts
+from ai.scoring import ScoreMatrix, rerank
+from ai.score_store import ScoreStore
+from ai.snapshots import get_data_version
 
 # 선택: LLM
 try:
@@ -21,8 +24,18 @@ except Exception:
 
 # ====== 환경설정 ======
 USE_LLM = os.getenv("USE_LLM", "1") == "1"
+USE_PRECOMPUTED = os.getenv("USE_PRECOMPUTED", "1") == "1"
 TOPK_FOR_REASON = int(os.getenv("TOPK_FOR_REASON", "5"))
-REASON_CACHE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "reason_cache.json"))
+
+SCORE_COLUMNS = [
+    '평균영업기간(년)','점포수','1년 생존율(%)','3년 생존율(%)','5년 생존율(%)','평균 개업수','평균 폐업수',
+    '2022_평균매출','2023_평균매출','2024_평균매출'
+]
+WEIGHTS = {
+    '평균영업기간(년)': 0.05, '점포수': 0.15, '1년 생존율(%)': 0.05, '3년 생존율(%)': 0.07,
+    '5년 생존율(%)': 0.10, '평균 개업수': 0.04, '평균 폐업수': -0.04,
+    '2022_평균매출': 0.15, '2023_평균매출': 0.17, '2024_평균매출': 0.22
+}
 
 # ====== LLM (Gemini) 로딩 (있으면 사용, 없으면 폴백) ======
 _genai_available = False
@@ -34,6 +47,10 @@ if USE_LLM and genai and GEMINI_API_KEY:
     except Exception:
         _genai_available = False
 
+# (gu_name, 행정동) → 사전계산된 final_result (ai/precompute_industry.py 배치로 생성)
+# 행정동명은 구 사이에서 겹칠 수 있음 (예: 강남구/관악구 신사동)
+INDUSTRY_SCORE_STORE = ScoreStore("industry", key_cols=("gu_name", "region"))
+
 def _genai_model(model_name: str):
     if not _genai_available:
         return None
@@ -43,26 +60,6 @@ def _genai_model(model_name: str):
     except Exception:
         return None
 
-# ====== 간단 파일 캐시 ======
-def _load_reason_cache():
-    if os.path.exists(REASON_CACHE_PATH):
-        try:
-            with open(REASON_CACHE_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
-
-def _save_reason_cache(cache):
-    os.makedirs(os.path.dirname(REASON_CACHE_PATH), exist_ok=True)
-    with open(REASON_CACHE_PATH, "w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
-
-_REASON_CACHE = _load_reason_cache()
-
-def _cache_key(gu_name, region, cat_small, date_key):
-    return f"{gu_name}::{region}::{cat_small}::{date_key}"
-
 # ====== 규칙 기반 이유 (LLM 폴백용) ======
 def rule_based_reason(row):
     def _num(x, d=0):
@@ -94,17 +91,10 @@ def rule_based_reason(row):
         return "지역 수요와 경쟁 상황을 고려할 때 잠재력이 있는 업종으로 판단됩니다."
     return " ".join(parts)
 
-# ====== LLM 이유 생성 (429/오류 → 폴백/캐시) ======
+# ====== LLM 이유 생성 (429/오류 → 폴백, 응답은 공용 LLM 캐시) ======
 def generate_reason_with_llm(gu_name, region, row, prefer_model="models/gemini-1.5-flash"):
-    date_key = time.strftime("%Y-%m-%d")
-    key = _cache_key(gu_name, region, row.get('업종명', ''), date_key)
-    if key in _REASON_CACHE:
-        return _REASON_CACHE[key], "cache"
-
     if not _genai_available:
-        r = rule_based_reason(row)
-        _REASON_CACHE[key] = r; _save_reason_cache(_REASON_CACHE)
-        return r, "fallback-disabled"
+        return rule_based_reason(row), "fallback-disabled"
 
     prompt = f"""
 당신은 상권 분석 컨설턴트입니다. 아래 지표를 바탕으로 업종 추천 사유를 2~3문장으로 간결하게 써주세요.
@@ -118,83 +108,69 @@ def generate_reason_with_llm(gu_name, region, row, prefer_model="models/gemini-1
 가이드: 수치가 클수록 긍정적, 0 또는 결측은 언급하지 않아도 됨. 과장 표현 금지, 간단명료, 한국어.
 """
 
+    def _call(m):
+        model = _genai_model(m)
+        if not model:
+            raise RuntimeError("LLM not configured")
+        resp = model.generate_content(prompt)
+        text = (resp.text or "").strip()
+        if not text:
+            raise RuntimeError("Empty LLM response")
+        return text
+
     models_try = [prefer_model, "models/gemini-1.5-flash-8b"]
     for m in models_try:
         try:
-            model = _genai_model(m)
-            if not model:
-                raise RuntimeError("LLM not configured")
-            resp = model.generate_content(prompt)
-            text = (resp.text or "").strip()
-            if not text:
-                raise RuntimeError("Empty LLM response")
-            _REASON_CACHE[key] = text; _save_reason_cache(_REASON_CACHE)
-            return text, m
+            text, hit = LLM_CACHE.get_or_call(m, prompt, lambda: _call(m))
+            return text, ("cache" if hit else m)
         except (ResourceExhausted, GoogleAPIError, Exception) as e:
             msg = str(e)
             if "429" in msg or isinstance(e, ResourceExhausted):
                 time.sleep(1.5)
                 try:
-                    model = _genai_model(m)
-                    if model:
-                        resp = model.generate_content(prompt)
-                        text = (resp.text or "").strip()
-                        if text:
-                            _REASON_CACHE[key] = text; _save_reason_cache(_REASON_CACHE)
-                            return text, f"{m}-retry"
+                    text, _ = LLM_CACHE.get_or_call(m, prompt, lambda: _call(m))
+                    return text, f"{m}-retry"
                 except Exception:
                     pass
             continue
 
-    r = rule_based_reason(row)
-    _REASON_CACHE[key] = r; _save_reason_cache(_REASON_CACHE)
-    return r, "fallback-429"
+    # 폴백 사유는 캐시하지 않음 (다음 요청에서 LLM 재시도)
+    return rule_based_reason(row), "fallback-429"
 
-# ====== 핵심 추천 파이프라인 ======
-def run_industry_recommendation(region, gu_name):
+# ====== 점수 계산 (요청 경로 / 사전계산 배치 공용) ======
+def get_dong_code(engine, region, gu_name=None):
     """
-    입력: region(행정동명), gu_name(구명)
-    출력: back/cache/runtime/recommendation_industry.json 에 {region: [{category_large, category_small, reason}, ...]} 저장
+    행정동명 → region_code (파라미터 바인딩)
+    같은 이름의 동이 여러 구에 있으면 gu_name 의 구 코드(5자리)로 시작하는 코드를 고른다.
     """
-    engine = get_engine()
-
-    # (선택) 연결 확인
-    try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        print("✅ DB 연결 확인")
-    except Exception as e:
-        print("❌ DB 연결 실패:", e)
-
-    def load_table(table_name: str) -> pd.DataFrame:
-        return pd.read_sql(f"SELECT * FROM {table_name}", engine)
-
-    def load_or_cache(name, table):
-        os.makedirs("cache", exist_ok=True)
-        path = f"cache/{name}.feather"
-        if os.path.exists(path):
-            print(f"📂 캐시 불러옴: {name}")
-            return pd.read_feather(path)
-        df = load_table(table)
-        df.to_feather(path)
-        print(f"💾 캐시 저장: {name}")
-        return df
-
-    def get_recent_quarters_by_category(df, group_cols=['category_small'], num_quarters=4):
-        if df.empty:
-            return df
-        df_sorted = df.sort_values(by=group_cols + ['year', 'quarter'])
-        return df_sorted.groupby(group_cols, group_keys=False).tail(num_quarters)
-
-    # region_code 조회 (파라미터 바인딩)
     dong_code_df = pd.read_sql(
-        "SELECT DISTINCT region_code FROM subcategory_avg_operating_period_stats WHERE region_name = %s LIMIT 1",
+        "SELECT DISTINCT region_code FROM subcategory_avg_operating_period_stats WHERE region_name = %s",
         engine, params=(region,),
     )
     if dong_code_df.empty:
         raise ValueError(f"region_code을 찾을 수 없습니다: {region}")
-    dong_code = dong_code_df.iloc[0]['region_code']
-    print(f"선택한 동 '{region}'의 지역 코드: {dong_code}")
+    codes = sorted(dong_code_df['region_code'].astype(str))
+    if len(codes) > 1 and gu_name:
+        gu_code_df = pd.read_sql(
+            "SELECT DISTINCT region_code FROM floating_population_stats WHERE region_name = %s LIMIT 1",
+            engine, params=(gu_name,),
+        )
+        if not gu_code_df.empty:
+            gu_code = str(gu_code_df.iloc[0]['region_code'])
+            codes = [c for c in codes if c.startswith(gu_code)] or codes
+    return codes[0]
+
+
+def compute_industry_scores(region, dong_code, artifacts=None):
+    """
+    (행정동) → 업종별 점수 테이블(final_result). 스냅샷만 읽으므로 DB 연결 불필요.
+    - artifacts: dict 를 넘기면 중간 산출물(merged_industry)을 담아줌 (EXPORT_ARTIFACTS 용)
+    """
+    def get_recent_quarters_by_category(df, group_cols=['category_small'], num_quarters=4):
+        if df.empty:
+            return df
+        df_sorted = df.sort_values(by=group_cols + ['year', 'quarter'])
+        return df_sorted.groupby(group_cols, group_keys=False).tail(num_quarters)
 
     # 지표 로드
     indicators = {
@@ -203,16 +179,19 @@ def run_industry_recommendation(region, gu_name):
         'survive': ('subcategory_startup_survival', None),
         'openclose': ('subcategory_openclose_stats', None)
     }
-    raw_data = {k: load_or_cache(f"{k}_all_df", t) for k, (t, _) in indicators.items()}
+    # 프로세스 전역 (region, category, period) 정렬 인덱스 (요청마다 feather 재로딩/전체 스캔 없음)
+    raw_data = {k: get_index(t) for k, (t, _) in indicators.items()}
 
-    def filter_by_region(df, region_name):
-        return df[df['region_name'] == region_name].reset_index(drop=True)
+    def filter_by_region(index, region_code, indicator=None):
+        # 동 코드(8자리) 구간만 이진 탐색으로 잘라냄
+        df = index.select(region=region_code)
+        if indicator and 'indicator' in df.columns:
+            df = df[df['indicator'] == indicator]
+        return df.reset_index(drop=True)
 
     filtered_data = {}
     for key, (_, indicator) in indicators.items():
-        df_region = filter_by_region(raw_data[key], region)
-        if indicator and 'indicator' in df_region.columns:
-            df_region = df_region[df_region['indicator'] == indicator]
+        df_region = filter_by_region(raw_data[key], dong_code, indicator)
         if key in ['age', 'store']:
             cols = ["category_small", "region_name", "region_code", "year", "quarter", "indicator", "value"]
             filtered_data[key] = get_recent_quarters_by_category(df_region)[cols] if not df_region.empty else df_region
@@ -278,7 +257,6 @@ def run_industry_recommendation(region, gu_name):
         if df.empty:
             return df
         df['zone_id'] = df['zone_id'].astype(str)
-        zone_df['zone_id'] = zone_df['zone_id'].astype(str)
         df = df.merge(zone_df, on='zone_id', how='left', suffixes=('', '_zone'))
         df = df.merge(service_df, on='service_code', how='left', suffixes=('', '_service'))
         if 'region_name_zone' in df.columns:
@@ -292,15 +270,18 @@ def run_industry_recommendation(region, gu_name):
             df['service_name'] = df['service_name'].astype(str).str.replace(r'[\r\n]+', '', regex=True)
         return df
 
-    zone_df = load_table('zone_table')
-    service_df = load_table('service_type')
+    # 동의 zone_id 를 먼저 확정 → 연도별 매출/점포수는 해당 zone 행만 잘라서 병합
+    zone_df = get_table('zone_table')
+    zone_df = zone_df[zone_df['region_name'] == region]
+    zone_ids = zone_df['zone_id'].unique().tolist()
+    service_df = get_table('service_type')
 
-    def load_year(table_prefix, year):
-        return pd.read_sql(f"SELECT * FROM {table_prefix}_{year}", engine)
+    def load_year(table_prefix, year, columns=None):
+        return select_zones(f"{table_prefix}_{year}", zone_ids, columns)
 
     def preprocess_sales(year, region, table_name, filter_cols, group_cols=None):
-        df = load_year(table_name, year)
-        st_ct_df = load_year("zone_store_count", year)
+        df = load_year(table_name, year, filter_cols)
+        st_ct_df = load_year("zone_store_count", year, ['zone_id','service_code','year','quarter','count'])
         df = add_region_service_names(df, zone_df, service_df, region)
         if df.empty:
             return df
@@ -363,48 +344,60 @@ def run_industry_recommendation(region, gu_name):
             merged_df[c] = 0.0
         merged_df[c] = pd.to_numeric(merged_df[c], errors='coerce').fillna(0.0)
 
-    # ===== 스코어링 =====
-    score_columns = [
-        '평균영업기간(년)','점포수','1년 생존율(%)','3년 생존율(%)','5년 생존율(%)','평균 개업수','평균 폐업수',
-        '2022_평균매출','2023_평균매출','2024_평균매출'
-    ]
-    weights = {
-        '평균영업기간(년)': 0.05, '점포수': 0.15, '1년 생존율(%)': 0.05, '3년 생존율(%)': 0.07,
-        '5년 생존율(%)': 0.10, '평균 개업수': 0.04, '평균 폐업수': -0.04,
-        '2022_평균매출': 0.15, '2023_평균매출': 0.17, '2024_평균매출': 0.22
-    }
+    # ===== 스코어링 (정규화 값 norm_* 은 요청 가중치 재정렬용으로 남김) =====
+    matrix = ScoreMatrix.fit(merged_df, SCORE_COLUMNS)
+    merged_with_norm = pd.concat([merged_df, matrix.normalized_frame()], axis=1)
+    merged_with_norm['업종_추천점수'] = matrix.score(WEIGHTS)
 
-    clean_df = merged_df[score_columns].replace([np.inf,-np.inf], np.nan).fillna(0)
-    scaler = MinMaxScaler()
-    normalized = scaler.fit_transform(clean_df)
-    normalized_df = pd.DataFrame(normalized, columns=[f"norm_{c}" for c in score_columns])
-    merged_with_norm = pd.concat([merged_df, normalized_df], axis=1)
+    final_result = merged_with_norm.sort_values(by='업종_추천점수', ascending=False).reset_index(drop=True)
 
-    merged_with_norm['업종_추천점수'] = 0.0
-    for col, w in weights.items():
-        merged_with_norm['업종_추천점수'] += merged_with_norm[f"norm_{col}"] * w
+    if artifacts is not None:
+        artifacts['merged_industry'] = merged_df
+    return final_result
 
-    final_result = merged_with_norm.drop(columns=[f"norm_{c}" for c in score_columns]).sort_values(
-        by='업종_추천점수', ascending=False
-    ).reset_index(drop=True)
 
-    print("📊 종합 지역 상권 요약 리포트")
-    print(merged_df)
-    print("🏆 최종 업종 추천 결과 (지역+업종 기준)")
-    print(final_result[['행정동명','업종명','업종_추천점수']].head(10))
+def category_large_map():
+    """업종 소분류 → 대분류 (스냅샷이 바뀔 때만 다시 만듦, 소분류가 여러 번 나오면 첫 행 기준)"""
+    def build(df):
+        first = df.drop_duplicates('category_small')
+        return dict(zip(first['category_small'], first['category_large']))
+    source = ('subcategory_store_count_stats', ('category_large', 'category_small'))
+    return REGISTRY.derived(('category_large_map',) + source, [source], build)
+
+
+# ====== 핵심 추천 파이프라인 ======
+def run_industry_recommendation(region, gu_name, weights=None):
+    """
+    입력: region(행정동명), gu_name(구명)
+    출력: {region: [{category_large, category_small, reason}, ...]}
+    - 사전계산 점수(ai/precompute_industry.py)가 있으면 조회만 하고 LLM 사유 생성만 수행
+    - weights: 요청 가중치({지표: 값}, WEIGHTS 에 덮어씀) → 정규화 행렬로 재정렬만 수행
+    - 중간 산출물 파일은 EXPORT_ARTIFACTS=1 일 때만 요청별 디렉토리에 비동기 저장
+    """
+    artifacts = {} if EXPORT_ARTIFACTS else None
+    final_result = None
+    if USE_PRECOMPUTED:
+        final_result = INDUSTRY_SCORE_STORE.lookup(gu_name, region, data_version=get_data_version())
+    if final_result is not None:
+        print(f"⚡ 사전계산 점수 사용: {INDUSTRY_SCORE_STORE.kind}@{INDUSTRY_SCORE_STORE.version}")
+    else:
+        engine = get_engine()
+
+        dong_code = get_dong_code(engine, region, gu_name)
+        print(f"선택한 동 '{region}'의 지역 코드: {dong_code}")
+        final_result = compute_industry_scores(region, dong_code, artifacts)
+        print(f"🏆 업종 점수 계산 완료: {len(final_result)}개 업종")
+
+    if weights:
+        final_result = rerank(final_result, SCORE_COLUMNS, {**WEIGHTS, **weights}, '업종_추천점수')
 
     # ===== 상위 TOPK에 대해 이유 생성 =====
-    subcategory_df = pd.read_sql(
-        "SELECT DISTINCT category_large, category_small FROM subcategory_store_count_stats", engine
-    )
+    large_by_small = category_large_map()
 
     recommendations = []
     for _, row in final_result.head(TOPK_FOR_REASON).iterrows():
         label = (row.get('업종명') or '').strip().replace('\r','')
-        large_label = '기타'
-        mr = subcategory_df[subcategory_df['category_small'] == label]
-        if not mr.empty:
-            large_label = mr.iloc[0]['category_large']
+        large_label = large_by_small.get(label, '기타')
 
         reason, src = generate_reason_with_llm(gu_name, region, row)
         recommendations.append({
@@ -413,14 +406,8 @@ def run_industry_recommendation(region, gu_name):
             'reason': reason
         })
 
-    # ===== JSON 저장 (reloader 감시 밖 경로) =====
-    runtime_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cache', 'runtime'))
-    os.makedirs(runtime_dir, exist_ok=True)
-    out_path = os.path.join(runtime_dir, 'recommendation_industry.json')
-
     payload = { region: recommendations }
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=4)
-
-    print(json.dumps(payload, ensure_ascii=False, indent=4))
+    if artifacts is not None:
+        artifacts.update({'filtered_result_industry': final_result, 'recommendation_industry': payload})
+        export_artifacts('industry', (gu_name, region), artifacts)
     return payload
@@ -3,9 +3,11 @@ import os
 import re
 import json
 import pandas as pd
-from sqlalchemy import text
 from openai import OpenAI
 from config.settings import get_engine  # ✅ 공용 DB 엔진(.env 기반)
+from ai.sql_fanout import QueryFanout
+from ai import analytics
+from ai.llm_cache import LLM_CACHE
 
 # =======================
 # 환경 변수 (반드시 설정)
@@ -18,31 +20,140 @@ client = OpenAI(api_key=OPENAI_API_KEY)
 engine = get_engine()
 
 
+def _chat_completion(model, messages, **params):
+    """OpenAI chat completion (공용 LLM 캐시 경유). 같은 입력이면 원격 호출 생략"""
+    text, _ = LLM_CACHE.get_or_call(
+        model, messages,
+        lambda: client.chat.completions.create(model=model, messages=messages, **params).choices[0].message.content or "",
+        params=params,
+    )
+    return text
+
+
 def _safe_first(df, col, default=0):
     if not df.empty and col in df.columns and pd.notnull(df[col].iloc[0]):
         return df[col].iloc[0]
     return default
 
 
-def generate_report(gu_name, region, category_large, category_small, purpose, region_code, service_code, zone_ids):
+# =======================
+# zone 매출 배치 조회
+# =======================
+# name → (테이블 접두, SELECT 컬럼, zone_id/quarter 외 GROUP BY 컬럼, 결과 컬럼 순서)
+ZONE_SALES_QUERIES = {
+    "summary": (
+        "sales_summary",
+        "monthly_sales, monthly_count, weekday_sales, weekend_sales",
+        None,
+        ["monthly_sales", "monthly_count", "weekday_sales", "weekend_sales", "year", "quarter", "zone_id"],
+    ),
+    "gender_age": (
+        "sales_by_gender_age",
+        "gender, age_group, SUM(sales_amount) AS total_sales",
+        "gender, age_group",
+        ["gender", "age_group", "total_sales", "year", "quarter", "zone_id"],
+    ),
+    "day": (
+        "sales_by_day",
+        "day_of_week, SUM(sales_amount) AS total_sales",
+        "day_of_week",
+        ["day_of_week", "total_sales", "year", "quarter", "zone_id"],
+    ),
+    "hour": (
+        "sales_by_hour",
+        "time_range, SUM(sales_amount) AS total_sales",
+        "time_range",
+        ["time_range", "total_sales", "year", "quarter", "zone_id"],
+    ),
+}
+STORE_COUNT_COLUMNS = ["zone_id", "service_name", "count", "year", "quarter"]
+
+
+def _zone_sales_sql(name, year, n_zones, n_quarters):
+    table, select_cols, group_cols, _ = ZONE_SALES_QUERIES[name]
+    zid_placeholders = ",".join(["%s"] * n_zones)
+    q_placeholders = ",".join(["%s"] * n_quarters)
+    group_by = f"GROUP BY zone_id, quarter, {group_cols}" if group_cols else ""
+    if group_cols and analytics.enabled():
+        # DuckDB 병렬 집계는 그룹 순서가 매번 달라짐 → 원본 행 순서(첫 등장) 기준으로 고정
+        group_by += f" ORDER BY MIN({analytics.ROW_ORDER})"
+    return f"""
+        SELECT zone_id, quarter, {select_cols}, {year} AS year
+        FROM {table}_{year}
+        WHERE service_code = %s AND quarter IN ({q_placeholders})
+          AND zone_id IN ({zid_placeholders})
+        {group_by}
     """
-    리포트 텍스트/차트데이터/존 요약을 '반환'하는 함수 (파일 저장 X)
-    return: (report_text:str, chart_data:dict, zone_ids:[str], zone_texts:dict[str,str])
+
+
+def _store_count_sql(year, n_zones, n_quarters):
+    zid_placeholders = ",".join(["%s"] * n_zones)
+    q_placeholders = ",".join(["%s"] * n_quarters)
+    return f"""
+        SELECT zone_id, service_name, count, {year} AS year, quarter
+        FROM zone_store_count_{year}
+        WHERE service_name = %s AND quarter IN ({q_placeholders})
+          AND zone_id IN ({zid_placeholders})
     """
-    years = [2022, 2023, 2024, 2025]
 
-    # ---- DB 연결 점검(로그) ----
-    try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-    except Exception as e:
-        print("❌ DB 연결 실패:", e)
+
+def _order_by_zone(df, zone_order, columns):
+    """
+    기존 (zone → 연도 → 분기) 순차 조회와 같은 행 순서로 정렬.
+    같은 (zone, 연도, 분기) 안에서는 DB 가 돌려준 순서를 유지(stable sort).
+    """
+    df = df.copy()
+    df["zone_id"] = df["zone_id"].astype(str)
+    df = df[df["zone_id"].isin(zone_order)]
+    df["_zone_pos"] = df["zone_id"].map(zone_order)
+    df = df.sort_values(["_zone_pos", "year", "quarter"], kind="mergesort")
+    return df[columns].reset_index(drop=True)
+
+
+def _fetch_zone_sales(fan, zone_ids, category_small, service_code, years, quarters):
+    """
+    zone 별 매출/점포수 데이터를 테이블 × 연도당 1회 쿼리로 조회 (fan 에서 병렬 실행).
+    return: {"store_count", "summary", "gender_age", "day", "hour"} → DataFrame
+    """
+    zids = [str(z) for z in (zone_ids or [])]
+    if not zids:
+        empty = {name: pd.DataFrame() for name in ZONE_SALES_QUERIES}
+        empty["store_count"] = pd.DataFrame(columns=STORE_COUNT_COLUMNS)
+        return empty
+
+    zone_order = {zid: i for i, zid in enumerate(dict.fromkeys(zids))}
+    for year in years:
+        fan.submit(f"store_count_{year}", _store_count_sql(year, len(zids), len(quarters)),
+                   tuple([category_small] + list(quarters) + zids))
+        for name in ZONE_SALES_QUERIES:
+            fan.submit(f"{name}_{year}", _zone_sales_sql(name, year, len(zids), len(quarters)),
+                       tuple([service_code] + list(quarters) + zids))
+
+    def collect(name):
+        return pd.concat([fan.result(f"{name}_{year}") for year in years], ignore_index=True)
+
+    out = {"store_count": _order_by_zone(collect("store_count"), zone_order, STORE_COUNT_COLUMNS)}
+    for name, (_, _, _, columns) in ZONE_SALES_QUERIES.items():
+        out[name] = _order_by_zone(collect(name), zone_order, columns)
+    return out
+
+
+def collect_report_data(gu_name, region, category_large, category_small, purpose, region_code, service_code, zone_ids):
+    """
+    리포트 데이터 단계: DB 집계 → chart_data / zone_texts / 프롬프트 입력값.
+    LLM 호출 없이 끝나므로 스트리밍 응답에서는 이 결과를 먼저 내보낸다.
+    """
+    years = [2022, 2023, 2024, 2025]
 
     # ---- 기본 집계 (파라미터 바인딩) ----
+    # 서로 독립적인 쿼리 → 공용 스레드 풀에서 동시에 실행하고 결과는 필요한 시점에 수집
+    fan = QueryFanout(engine, tag="report")
+
     # MySQL에서는 IN (%s, %s, ...) 형태로 플레이스홀더 구성 필요
     years_placeholders = ",".join(["%s"] * len(years))
 
-    open_close_df = pd.read_sql_query(
+    fan.submit(
+        "open_close",
         f"""
         SELECT year, num_open, num_close
         FROM openclose_stats
@@ -50,11 +161,11 @@ def generate_report(gu_name, region, category_large, category_small, purpose, re
           AND year IN ({years_placeholders})
         ORDER BY year
         """,
-        engine,
-        params=tuple([region, region_code] + years),
+        tuple([region, region_code] + years),
     )
 
-    survival_df = pd.read_sql_query(
+    fan.submit(
+        "survival",
         """
         SELECT 
             ROUND(AVG(survival_rate_1yr), 1) AS avg_survival_rate_1yr,
@@ -65,11 +176,11 @@ def generate_report(gu_name, region, category_large, category_small, purpose, re
           AND year BETWEEN %s AND %s
           AND quarter IN (1,2,3,4)
         """,
-        engine,
-        params=(region, region_code, 2022, 2025),
+        (region, region_code, 2022, 2025),
     )
 
-    rent_df = pd.read_sql_query(
+    fan.submit(
+        "rent",
         """
         SELECT 
             ROUND(AVG(rent_first_floor)) AS avg_rent_first_floor,
@@ -79,11 +190,11 @@ def generate_report(gu_name, region, category_large, category_small, purpose, re
           AND year BETWEEN %s AND %s
           AND quarter IN (1,2,3,4)
         """,
-        engine,
-        params=(region, region_code, 2022, 2025),
+        (region, region_code, 2022, 2025),
     )
 
-    store_df = pd.read_sql_query(
+    fan.submit(
+        "store",
         f"""
         SELECT year, store_total, store_franchise, store_nonfranchise
         FROM store_count_stats
@@ -91,11 +202,11 @@ def generate_report(gu_name, region, category_large, category_small, purpose, re
           AND year IN ({years_placeholders})
         ORDER BY year
         """,
-        engine,
-        params=tuple([region, region_code] + years),
+        tuple([region, region_code] + years),
     )
 
-    avg_years_df = pd.read_sql_query(
+    fan.submit(
+        "avg_years_10",
         """
         SELECT ROUND(AVG(value), 1) AS avg_10yr
         FROM subcategory_avg_operating_period_stats
@@ -104,11 +215,11 @@ def generate_report(gu_name, region, category_large, category_small, purpose, re
           AND indicator = 'avg_operating_years_10'
           AND year BETWEEN %s AND %s AND quarter IN (1,2,3,4)
         """,
-        engine,
-        params=(region, region_code, category_large, category_small, 2022, 2025),
+        (region, region_code, category_large, category_small, 2022, 2025),
     )
 
-    avg_years_df2 = pd.read_sql_query(
+    fan.submit(
+        "avg_years_30",
         """
         SELECT ROUND(AVG(value), 1) AS avg_30yr
         FROM subcategory_avg_operating_period_stats
@@ -117,11 +228,11 @@ def generate_report(gu_name, region, category_large, category_small, purpose, re
           AND indicator = 'avg_operating_years_30'
           AND year BETWEEN %s AND %s AND quarter IN (1,2,3,4)
         """,
-        engine,
-        params=(region, region_code, category_large, category_small, 2022, 2025),
+        (region, region_code, category_large, category_small, 2022, 2025),
     )
 
-    floating_df = pd.read_sql_query(
+    fan.submit(
+        "floating",
         """
         SELECT year, quarter, floating_population, residential_population, working_population
         FROM floating_population_stats
@@ -129,27 +240,20 @@ def generate_report(gu_name, region, category_large, category_small, purpose, re
           AND year BETWEEN %s AND %s AND quarter IN (1,2,3,4)
         ORDER BY year, quarter
         """,
-        engine,
-        params=(region, region_code, 2022, 2025),
+        (region, region_code, 2022, 2025),
     )
 
-    if not floating_df.empty:
-        floating_pop = round(floating_df["floating_population"].mean())
-        residential_pop = round(floating_df["residential_population"].mean())
-        working_pop = round(floating_df["working_population"].mean())
-    else:
-        floating_pop = residential_pop = working_pop = 0
-
     # ---- zone 조회 & 매출 관련 집계 ----
-    zone_df = pd.read_sql_query(
+    fan.submit(
+        "zone",
         """
         SELECT zone_id, zone_name
         FROM zone_table
         WHERE region_name = %s
         """,
-        engine,
-        params=(region,),
+        (region,),
     )
+    zone_df = fan.result("zone")
 
     if not zone_df.empty:
         zone_ids = zone_df['zone_id'].tolist()
@@ -160,93 +264,30 @@ def generate_report(gu_name, region, category_large, category_small, purpose, re
     sales_years = [2022, 2023, 2024]
     quarters = [1, 2, 3, 4]
 
-    store_count_df_list, summary_df_list, gender_age_df_list, sales_day_df_list, sales_hour_df_list = [], [], [], [], []
-
-    # zone_store_count_{year}
-    for year in sales_years:
-        for quarter in quarters:
-            if zone_ids:
-                zid_placeholders = ",".join(["%s"] * len(zone_ids))
-                sc = pd.read_sql_query(
-                    f"""
-                    SELECT zone_id, service_name, count, {year} AS year, {quarter} AS quarter
-                    FROM zone_store_count_{year}
-                    WHERE service_name = %s AND quarter = %s
-                      AND zone_id IN ({zid_placeholders})
-                    """,
-                    engine,
-                    params=tuple([category_small, quarter] + [str(z) for z in zone_ids]),
-                )
-            else:
-                sc = pd.DataFrame(columns=["zone_id", "service_name", "count", "year", "quarter"])
-            if not sc.empty:
-                sc["zone_id"] = sc["zone_id"].astype(str)
-            store_count_df_list.append(sc)
-
-    # sales_summary_{year}, sales_by_..._{year}
-    for zid in (zone_ids or []):
-        for year in sales_years:
-            for quarter in quarters:
-                summary = pd.read_sql_query(
-                    f"""
-                    SELECT monthly_sales, monthly_count, weekday_sales, weekend_sales,
-                           {year} AS year, {quarter} AS quarter
-                    FROM sales_summary_{year}
-                    WHERE quarter = %s AND zone_id = %s AND service_code = %s
-                    """,
-                    engine,
-                    params=(quarter, str(zid), service_code),
-                )
-                summary["zone_id"] = str(zid)
-                summary_df_list.append(summary)
-
-                gender_age = pd.read_sql_query(
-                    f"""
-                    SELECT gender, age_group, SUM(sales_amount) AS total_sales,
-                           {year} AS year, {quarter} AS quarter
-                    FROM sales_by_gender_age_{year}
-                    WHERE quarter = %s AND zone_id = %s AND service_code = %s
-                    GROUP BY gender, age_group
-                    """,
-                    engine,
-                    params=(quarter, str(zid), service_code),
-                )
-                gender_age["zone_id"] = str(zid)
-                gender_age_df_list.append(gender_age)
-
-                day = pd.read_sql_query(
-                    f"""
-                    SELECT day_of_week, SUM(sales_amount) AS total_sales,
-                           {year} AS year, {quarter} AS quarter
-                    FROM sales_by_day_{year}
-                    WHERE quarter = %s AND zone_id = %s AND service_code = %s
-                    GROUP BY day_of_week
-                    """,
-                    engine,
-                    params=(quarter, str(zid), service_code),
-                )
-                day["zone_id"] = str(zid)
-                sales_day_df_list.append(day)
-
-                hour = pd.read_sql_query(
-                    f"""
-                    SELECT time_range, SUM(sales_amount) AS total_sales,
-                           {year} AS year, {quarter} AS quarter
-                    FROM sales_by_hour_{year}
-                    WHERE quarter = %s AND zone_id = %s AND service_code = %s
-                    GROUP BY time_range
-                    """,
-                    engine,
-                    params=(quarter, str(zid), service_code),
-                )
-                hour["zone_id"] = str(zid)
-                sales_hour_df_list.append(hour)
-
-    store_count_df = pd.concat(store_count_df_list, ignore_index=True) if store_count_df_list else pd.DataFrame()
-    summary_df = pd.concat(summary_df_list, ignore_index=True) if summary_df_list else pd.DataFrame()
-    gender_age_df = pd.concat(gender_age_df_list, ignore_index=True) if gender_age_df_list else pd.DataFrame()
-    sales_day_df = pd.concat(sales_day_df_list, ignore_index=True) if sales_day_df_list else pd.DataFrame()
-    sales_hour_df = pd.concat(sales_hour_df_list, ignore_index=True) if sales_hour_df_list else pd.DataFrame()
+    # 테이블 × 연도당 1회 조회 (zone_id IN (...)) 후 메모리에서 zone/분기별로 분리
+    zone_sales = _fetch_zone_sales(fan, zone_ids, category_small, service_code, sales_years, quarters)
+    store_count_df = zone_sales["store_count"]
+    summary_df = zone_sales["summary"]
+    gender_age_df = zone_sales["gender_age"]
+    sales_day_df = zone_sales["day"]
+    sales_hour_df = zone_sales["hour"]
+
+    open_close_df = fan.result("open_close")
+    survival_df = fan.result("survival")
+    rent_df = fan.result("rent")
+    store_df = fan.result("store")
+    avg_years_df = fan.result("avg_years_10")
+    avg_years_df2 = fan.result("avg_years_30")
+    floating_df = fan.result("floating")
+    fan.log_timings()
+
+    if not floating_df.empty:
+        floating_pop = round(floating_df["floating_population"].mean())
+        residential_pop = round(floating_df["residential_population"].mean())
+        working_pop = round(floating_df["working_population"].mean())
+    else:
+        floating_pop = residential_pop = working_pop = 0
+
 
     if not summary_df.empty and not store_count_df.empty:
         summary_merged = pd.merge(summary_df, store_count_df, on=["zone_id", "year", "quarter"], how="left")
@@ -377,6 +418,63 @@ def generate_report(gu_name, region, category_large, category_small, purpose, re
         "sales": sales_data,
         "zone_names": zone_names
     }
+
+    # zone_texts 생성
+    zone_texts = {}
+    for zid, zname in (chart_data.get("zone_names") or {}).items():
+        zdata = chart_data["sales"].get(str(zid))
+        if not zdata:
+            continue
+        avg_price = zdata["avg_price_per_order"]["values"][0] if zdata["avg_price_per_order"]["values"] else 0
+        first_day = zdata['sales_by_day']['labels'][0] if zdata['sales_by_day']['labels'] else '정보 없음'
+        zone_texts[str(zid)] = f"{zname} — 객단가 {avg_price:,.0f}원, 요일피크 {first_day}"
+
+    return {
+        "gu_name": gu_name, "region": region, "category_small": category_small, "purpose": purpose,
+        "years": years, "zone_ids": [str(z) for z in zone_ids],
+        "chart_data": chart_data, "zone_texts": zone_texts, "zone_summary_text": zone_summary_text,
+        "floating_pop": floating_pop, "residential_pop": residential_pop, "working_pop": working_pop,
+        "store_df": store_df, "survival_df": survival_df, "open_close_df": open_close_df, "rent_df": rent_df,
+        "avg_years_df": avg_years_df, "avg_years_df2": avg_years_df2,
+        "monthly_sales_total": monthly_sales_total, "avg_sales_per_order": avg_sales_per_order,
+        "weekday_sales": weekday_sales, "weekend_sales": weekend_sales,
+        "gender_top": gender_top, "age_top": age_top, "top_day": top_day, "top_hour": top_hour,
+    }
+
+
+REPORT_MODEL = "gpt-4o"
+REPORT_TEMPERATURE = 0.3
+
+
+def build_report_messages(data):
+    """
+    LLM 단계 1: 지역 설명(짧은 GPT 호출, 캐시) → 본 리포트용 messages 구성.
+    data: collect_report_data() 결과
+    """
+    gu_name = data["gu_name"]
+    region = data["region"]
+    category_small = data["category_small"]
+    purpose = data["purpose"]
+    years = data["years"]
+    zone_summary_text = data["zone_summary_text"]
+    floating_pop = data["floating_pop"]
+    residential_pop = data["residential_pop"]
+    working_pop = data["working_pop"]
+    store_df = data["store_df"]
+    survival_df = data["survival_df"]
+    open_close_df = data["open_close_df"]
+    rent_df = data["rent_df"]
+    avg_years_df = data["avg_years_df"]
+    avg_years_df2 = data["avg_years_df2"]
+    monthly_sales_total = data["monthly_sales_total"]
+    avg_sales_per_order = data["avg_sales_per_order"]
+    weekday_sales = data["weekday_sales"]
+    weekend_sales = data["weekend_sales"]
+    gender_top = data["gender_top"]
+    age_top = data["age_top"]
+    top_day = data["top_day"]
+    top_hour = data["top_hour"]
+
     # ---------- GPT 프롬프트 (네가 원하는 상세 형식 유지) ----------
     region_gpt_prompt = f"""
     서울특별시 {gu_name} {region} 지역의 상권 특성을 분석하려고 해.
@@ -392,10 +490,10 @@ def generate_report(gu_name, region, category_large, category_small, purpose, re
     2) 두 번째 문단은 수치를 바탕으로 상권 성격/소비층 유형을 2~3문장,
     3) 문단 사이 빈 줄 1줄, 번호 붙이지 말 것.
     """
-    region_desc_combined = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[{"role": "user", "content": region_gpt_prompt}]
-    ).choices[0].message.content.strip()
+    region_desc_combined = _chat_completion(
+        REPORT_MODEL,
+        [{"role": "user", "content": region_gpt_prompt}],
+    ).strip()
 
     region_desc_lines = region_desc_combined.split("\n")
     region_desc = region_desc_lines[0] if len(region_desc_lines) > 0 else ""
@@ -460,13 +558,10 @@ def generate_report(gu_name, region, category_large, category_small, purpose, re
     예시처럼 ① 제목 형식, ② 문단 구성, ③ 전략 제안 방식, ④ 자연어 문체를 모두 그대로 따르도록 해줘.
     """
 
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        temperature=0.3,
-        messages=[
-            {
-                "role": "system",
-                "content": f"""
+    return [
+        {
+            "role": "system",
+            "content": f"""
     너는 지역 상권 분석을 전문으로 하는 컨설턴트야. 아래 세 가지 목적별 예시처럼 리포트를 작성해줘. 사용자가 제공한 데이터는 실제 수치이므로, 이에 맞춰 수치 기반 해석과 전략 제안을 포함한 전문가 리포트를 작성하되, 형식과 문체는 예시와 동일하게 구성할 것.
     각 항목은 다음 형식을 반드시 따라야 해:
 
@@ -672,22 +767,17 @@ def generate_report(gu_name, region, category_large, category_small, purpose, re
     - 확장일 경우: 시너지 가능성과 로컬 정합성
     - 시장조사일 경우: 데이터 기반 트렌드 요약과 전략적 판단 가이드
     """
-            },
-            {
-                "role": "user",
-                "content": actual_input
-            }
-        ]
-    )
-
-    # GPT 응답 받기
-    report = response.choices[0].message.content or ""
+        },
+        {
+            "role": "user",
+            "content": actual_input
+        }
+    ]
 
-    # GPT 응답 받기
-    report = response.choices[0].message.content
 
+def postprocess_report(report):
+    """LLM 원문 → report_text (markdown 기호 제거, 종합 평가 맨 위로)"""
     # ✅ markdown 스타일 제거
-    import re
     report = re.sub(r'^#+\s*', '', report, flags=re.MULTILINE)
     report = re.sub(r'^\-\s*', '', report, flags=re.MULTILINE)
     report = re.sub(r'^\*\s*', '', report, flags=re.MULTILINE)
@@ -697,19 +787,42 @@ def generate_report(gu_name, region, category_large, category_small, purpose, re
     sections_sorted = sorted(sections, key=lambda x: 0 if "👉 종합 평가" in x else 1)
     report_reordered = "\n".join([s.strip() for s in sections_sorted if s.strip()])
 
-    # 최종 report_text 정의
-    header_line = f"서울특별시 {gu_name} {region}에서의 {category_small} {purpose}을(를) 위한 리포트입니다.\n\n"
-    report_text = report_reordered
+    return report_reordered
 
-    # zone_texts 생성
-    zone_texts = {}
-    for zid, zname in (chart_data.get("zone_names") or {}).items():
-        zdata = chart_data["sales"].get(str(zid))
-        if not zdata:
-            continue
-        avg_price = zdata["avg_price_per_order"]["values"][0] if zdata["avg_price_per_order"]["values"] else 0
-        first_day = zdata['sales_by_day']['labels'][0] if zdata['sales_by_day']['labels'] else '정보 없음'
-        zone_texts[str(zid)] = f"{zname} — 객단가 {avg_price:,.0f}원, 요일피크 {first_day}"
 
-    # 최종 반환
-    return report_text, chart_data, [str(z) for z in zone_ids], zone_texts
+def generate_report(gu_name, region, category_large, category_small, purpose, region_code, service_code, zone_ids):
+    """
+    리포트 텍스트/차트데이터/존 요약을 '반환'하는 함수 (파일 저장 X)
+    return: (report_text:str, chart_data:dict, zone_ids:[str], zone_texts:dict[str,str])
+    """
+    data = collect_report_data(gu_name, region, category_large, category_small, purpose, region_code, service_code, zone_ids)
+    report = _chat_completion(REPORT_MODEL, build_report_messages(data), temperature=REPORT_TEMPERATURE)
+    return postprocess_report(report), data["chart_data"], data["zone_ids"], data["zone_texts"]
+
+
+def stream_report(gu_name, region, category_large, category_small, purpose, region_code, service_code, zone_ids):
+    """
+    스트리밍용 리포트 생성기. (event, payload) 를 순서대로 yield:
+    - ("data",  {chart_data, zone_ids, zone_texts})  : DB 집계 직후
+    - ("token", str)                                 : 본 리포트 토큰(캐시 적중 시 전체 1회)
+    - ("done",  report_text)                         : 후처리된 최종 텍스트
+    """
+    data = collect_report_data(gu_name, region, category_large, category_small, purpose, region_code, service_code, zone_ids)
+    yield "data", {"chart_data": data["chart_data"], "zone_ids": data["zone_ids"], "zone_texts": data["zone_texts"]}
+
+    messages = build_report_messages(data)
+
+    def _stream():
+        chunks = client.chat.completions.create(
+            model=REPORT_MODEL, messages=messages, temperature=REPORT_TEMPERATURE, stream=True,
+        )
+        for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    parts = []
+    for token in LLM_CACHE.stream_or_call(REPORT_MODEL, messages, _stream, params={"temperature": REPORT_TEMPERATURE}):
+        parts.append(token)
+        yield "token", token
+    yield "done", postprocess_report("".join(parts))
+
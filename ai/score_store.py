@@ -0,0 +1,133 @@
+# ai/score_store.py
+"""
+오프라인 배치로 미리 계산한 점수 테이블(버전별 아티팩트) 저장/조회.
+
+디렉터리 구조 (<PRECOMPUTED_DIR>/<kind>/):
+- <version>.feather : 키 컬럼 + 점수 테이블 전체
+- <version>.json    : 메타 정보 (생성 시각, 행/키 개수 등)
+- CURRENT           : 현재 서비스 중인 버전명 (원자적 교체)
+"""
+import os
+import json
+import time
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from config.settings import CACHE_DIR
+
+# 스냅샷/LLM 캐시와 같은 CACHE_DIR(기본 back/cache) 아래에 둔다
+PRECOMPUTED_DIR = os.getenv("PRECOMPUTED_DIR", os.path.join(CACHE_DIR, "precomputed"))
+
+
+def _atomic_write_text(path: str, text: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class ScoreStore:
+    """
+    (키 컬럼 → 점수 DataFrame) 룩업 저장소.
+    - save(): 배치 결과를 새 버전으로 기록하고 CURRENT 를 갱신
+    - lookup(): 프로세스당 1회 로드한 인덱스에서 O(1) 조회 (CURRENT 변경 시 자동 재로딩)
+    """
+
+    def __init__(self, kind: str, key_cols: Sequence[str], base_dir: Optional[str] = None):
+        self.kind = kind
+        self.key_cols = tuple(key_cols)
+        self.dir = os.path.join(base_dir or PRECOMPUTED_DIR, kind)
+        self._lock = threading.Lock()
+        self._loaded_version: Optional[str] = None
+        self._meta: dict = {}
+        self._groups: Dict[Tuple, pd.DataFrame] = {}
+
+    # ── 쓰기 ──────────────────────────────────────────────────────────────
+    def save(self, df: pd.DataFrame, version: Optional[str] = None, meta: Optional[dict] = None) -> str:
+        missing = [c for c in self.key_cols if c not in df.columns]
+        if missing:
+            raise ValueError(f"[score_store] 키 컬럼 누락: {missing}")
+
+        os.makedirs(self.dir, exist_ok=True)
+        version = version or time.strftime("%Y%m%d%H%M%S")
+        data_path = os.path.join(self.dir, f"{version}.feather")
+
+        tmp = f"{data_path}.tmp"
+        df.reset_index(drop=True).to_feather(tmp)
+        os.replace(tmp, data_path)
+
+        info = {
+            "kind": self.kind,
+            "version": version,
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "key_cols": list(self.key_cols),
+            "rows": int(len(df)),
+            "keys": int(df[list(self.key_cols)].drop_duplicates().shape[0]),
+        }
+        info.update(meta or {})
+        _atomic_write_text(os.path.join(self.dir, f"{version}.json"),
+                           json.dumps(info, ensure_ascii=False, indent=2))
+        _atomic_write_text(os.path.join(self.dir, "CURRENT"), version)
+        return version
+
+    # ── 읽기 ──────────────────────────────────────────────────────────────
+    def current_version(self) -> Optional[str]:
+        path = os.path.join(self.dir, "CURRENT")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+
+    def _ensure_loaded(self) -> None:
+        version = self.current_version()
+        if version is None or version == self._loaded_version:
+            return
+        with self._lock:
+            if version == self._loaded_version:
+                return
+            df = pd.read_feather(os.path.join(self.dir, f"{version}.feather"))
+            meta_path = os.path.join(self.dir, f"{version}.json")
+            meta = {}
+            if os.path.exists(meta_path):
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            groups = {}
+            missing = [c for c in self.key_cols if c not in df.columns]
+            if missing:
+                # 키 구성이 바뀌기 전의 아티팩트 → 비어 있는 것으로 취급 (배치 재실행 전까지 직접 계산)
+                print(f"⚠️ 사전계산 점수 키 컬럼 누락({self.kind}@{version}): {missing} → 무시")
+                df = df.iloc[0:0].assign(**{c: None for c in missing})
+            for key, sub in df.groupby(list(self.key_cols), sort=False):
+                key = key if isinstance(key, tuple) else (key,)
+                groups[key] = sub.drop(columns=list(self.key_cols)).reset_index(drop=True)
+            # 참조 교체는 원자적: 조회 중인 요청은 이전 dict 를 그대로 사용
+            self._groups = groups
+            self._meta = meta
+            self._loaded_version = version
+            print(f"📦 사전계산 점수 로드: {self.kind}@{version} ({len(groups)} keys)")
+
+    def lookup(self, *key, data_version: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        data_version 을 주면 아티팩트가 같은 스냅샷 버전으로 만들어졌을 때만 반환
+        (스냅샷 갱신 후 배치를 다시 돌리기 전까지는 오래된 점수를 쓰지 않음).
+        """
+        try:
+            self._ensure_loaded()
+        except Exception as e:
+            print(f"⚠️ 사전계산 점수 로드 실패({self.kind}): {e}")
+            return None
+        built_for = self._meta.get("data_version")
+        if data_version is not None and built_for is not None and built_for != data_version:
+            return None
+        hit = self._groups.get(tuple(key))
+        return hit.copy() if hit is not None else None
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._loaded_version
+
+    @property
+    def meta(self) -> dict:
+        return dict(self._meta)
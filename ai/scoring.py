@@ -0,0 +1,93 @@
+# ai/scoring.py
+"""
+지역/업종 추천 공용 점수 엔진.
+
+후보 집합(행정동 또는 업종)의 지표를 MinMax 정규화한 행렬을 메모리에 들고 있다가
+- score(weights)        : 가중치 1세트 → 행렬-벡터 곱 1회
+- score_many(weights[]) : 가중치 여러 세트 → 행렬-행렬 곱 1회 (후보 × 세트)
+로 점수를 낸다. 데이터 파이프라인을 다시 돌리지 않고 사용자 지정 가중치로 재정렬할 수 있다.
+
+정규화 값은 결과 프레임에 norm_<지표> 열로 남겨 두므로(사전계산 아티팩트 포함)
+이후 재정렬도 원래 후보 집합 기준의 정규화를 그대로 쓴다.
+"""
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+NORM_PREFIX = "norm_"
+
+
+def norm_columns(columns: Iterable[str]):
+    return [f"{NORM_PREFIX}{c}" for c in columns]
+
+
+def validate_weights(weights, columns: Sequence[str]) -> Dict[str, float]:
+    """요청 가중치 검증: {지표명: 숫자}, 알 수 없는 지표/비숫자는 ValueError"""
+    if not isinstance(weights, dict):
+        raise ValueError("weights 는 {지표명: 숫자} 형태여야 합니다")
+    unknown = [k for k in weights if k not in columns]
+    if unknown:
+        raise ValueError(f"알 수 없는 지표: {unknown} (가능: {list(columns)})")
+    out = {}
+    for k, v in weights.items():
+        if isinstance(v, bool) or not isinstance(v, (int, float)) or not np.isfinite(v):
+            raise ValueError(f"가중치가 숫자가 아님: {k}={v!r}")
+        out[k] = float(v)
+    return out
+
+
+class ScoreMatrix:
+    """정규화 지표 행렬 (행: 후보, 열: columns 순서의 지표)"""
+
+    def __init__(self, normalized: np.ndarray, columns: Sequence[str]):
+        self.values = np.asarray(normalized, dtype=np.float64)
+        self.columns = list(columns)
+
+    @classmethod
+    def fit(cls, frame: pd.DataFrame, columns: Sequence[str]) -> "ScoreMatrix":
+        """frame 의 columns 를 MinMax 정규화 (inf/결측 → 0, 값이 모두 같은 지표는 0)"""
+        raw = frame[list(columns)].replace([np.inf, -np.inf], np.nan).fillna(0).to_numpy(dtype=np.float64)
+        if len(raw) == 0:
+            return cls(raw, columns)
+        lo = raw.min(axis=0)
+        span = raw.max(axis=0) - lo
+        span[span == 0] = 1.0
+        return cls((raw - lo) / span, columns)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, columns: Sequence[str]) -> "ScoreMatrix":
+        """norm_<지표> 열이 있으면 그대로 사용, 없으면 frame 기준으로 다시 정규화"""
+        cols = norm_columns(columns)
+        if all(c in frame.columns for c in cols):
+            return cls(frame[cols].to_numpy(dtype=np.float64), columns)
+        return cls.fit(frame, columns)
+
+    def __len__(self):
+        return len(self.values)
+
+    def normalized_frame(self, index=None) -> pd.DataFrame:
+        return pd.DataFrame(self.values, columns=norm_columns(self.columns), index=index)
+
+    def weight_vector(self, weights: Dict[str, float]) -> np.ndarray:
+        """지표 순서에 맞춘 가중치 벡터 (없는 지표는 0)"""
+        return np.array([float(weights.get(c, 0.0)) for c in self.columns], dtype=np.float64)
+
+    def score(self, weights: Dict[str, float]) -> np.ndarray:
+        """(후보,) 점수 — 행렬-벡터 곱"""
+        return self.values @ self.weight_vector(weights)
+
+    def score_many(self, weight_sets: Sequence[Dict[str, float]]) -> np.ndarray:
+        """(후보, 세트) 점수 — 행렬-행렬 곱"""
+        if not weight_sets:
+            return np.empty((len(self.values), 0))
+        return self.values @ np.column_stack([self.weight_vector(w) for w in weight_sets])
+
+
+def rerank(frame: pd.DataFrame, columns: Sequence[str], weights: Dict[str, float],
+           score_col: str, top_n: Optional[int] = None) -> pd.DataFrame:
+    """이미 계산된 결과 프레임을 새 가중치로 다시 점수화/정렬"""
+    matrix = ScoreMatrix.from_frame(frame, columns)
+    out = frame.reset_index(drop=True).assign(**{score_col: matrix.score(weights)})
+    out = out.sort_values(by=score_col, ascending=False).reset_index(drop=True)
+    return out.head(top_n) if top_n is not None else out
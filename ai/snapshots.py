@@ -0,0 +1,415 @@
+# ai/snapshots.py
+"""
+원본 테이블 스냅샷(<CACHE_DIR>/<table>/ Parquet 데이터셋) 관리 + 매니페스트.
+
+스냅샷은 연도(p_year) × 구 코드(p_gu, region_code 앞 5자리) 로 파티션해 세대(generation) 디렉터리에 저장하고
+CURRENT 파일이 서비스 중인 세대를 가리킨다 (ScoreStore 의 CURRENT 와 같은 방식).
+    <CACHE_DIR>/<table>/CURRENT                                   ← "g1718000000000000000"
+    <CACHE_DIR>/<table>/g1718000000000000000/p_year=2024/p_gu=11110/part-0.parquet
+(year / region_code 컬럼이 없는 테이블은 해당 파티션 값이 all)
+갱신은 새 세대를 끝까지 쓴 뒤 CURRENT 만 원자적으로 교체하므로 스냅샷이 "없는" 순간이 없고,
+직전 세대는 읽는 중인 프로세스를 위해 한 번 더 남겨 둔다.
+갱신(refresh/최초 적재)은 프로세스 간 파일 잠금으로 직렬화한다.
+read_snapshot(table, columns, gu, years) 는 필요한 파티션 디렉터리와 컬럼만 읽는다.
+
+manifest.json 에 테이블별 워터마크(최신 year/quarter)와 행 수를 기록하고,
+refresh 시에는 워터마크 이후 기간만 MySQL 에서 가져와 이어 붙인다.
+이미 있던 스냅샷이 바뀌면(최초 적재 제외) data_version 을 올리며, 하위 캐시(사전계산 점수 등)는
+이 값을 키로 사용해 오래된 결과를 걸러낸다.
+
+실행 (프로젝트 루트에서):
+    python -m ai.snapshots status
+    python -m ai.snapshots refresh                 # 전체 테이블 증분 갱신
+    python -m ai.snapshots refresh zone_table --full   # 특정 테이블 전체 재적재
+"""
+import os
+import re
+import sys
+import glob
+import json
+import time
+import shutil
+import argparse
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+try:
+    import fcntl
+except ImportError:   # Windows: 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+# CLI 실행 시 config.settings 임포트를 위해 back/ 경로 등록
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'back')))
+
+from config.settings import get_engine, CACHE_DIR, ANALYTICS_BACKEND
+
+MANIFEST_PATH = os.path.join(CACHE_DIR, "manifest.json")
+LOCK_PATH = os.path.join(CACHE_DIR, ".snapshots.lock")
+SALES_YEARS = [2022, 2023, 2024]
+
+# 스냅샷으로 관리하는 테이블 목록
+SNAPSHOT_TABLES: List[str] = [
+    "floating_population_stats",
+    "rental_price_stats",
+    "subcategory_avg_operating_period_stats",
+    "subcategory_store_count_stats",
+    "subcategory_startup_survival",
+    "subcategory_openclose_stats",
+    "zone_table",
+    "service_type",
+] + [f"{prefix}_{year}" for prefix in ("zone_store_count", "sales_by_gender_age", "sales_summary") for year in SALES_YEARS]
+
+# 리포트 집계에서만 쓰는 테이블 (ANALYTICS_BACKEND=duckdb 일 때 함께 스냅샷 관리)
+ANALYTICS_TABLES: List[str] = [
+    "openclose_stats",
+    "startup_survival_rate",
+    "store_count_stats",
+] + [f"{prefix}_{year}" for prefix in ("sales_by_day", "sales_by_hour") for year in SALES_YEARS]
+
+
+def managed_tables() -> List[str]:
+    """refresh 기본 대상 (분석 백엔드가 duckdb 면 리포트 테이블 포함)"""
+    return SNAPSHOT_TABLES + (ANALYTICS_TABLES if ANALYTICS_BACKEND == "duckdb" else [])
+
+_YEAR_SUFFIX_RE = re.compile(r"_(\d{4})$")
+_lock = threading.Lock()
+
+
+@contextmanager
+def _refresh_lock():
+    """스레드 잠금 + 프로세스 간 파일 잠금 (서버 여러 개/CLI 가 같은 CACHE_DIR 를 동시에 갱신하지 않도록)"""
+    with _lock:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(LOCK_PATH, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+# ====== 파티션 ======
+PARTITION_YEAR = "p_year"
+PARTITION_GU = "p_gu"
+PARTITION_ALL = "all"     # 파티션 컬럼이 없는 테이블의 값
+GU_CODE_LEN = 5
+SUCCESS_MARKER = "_SUCCESS"
+CURRENT_POINTER = "CURRENT"
+GENERATION_PREFIX = "g"
+
+_PARTITIONING = ds.partitioning(
+    pa.schema([(PARTITION_YEAR, pa.string()), (PARTITION_GU, pa.string())]), flavor="hive"
+)
+
+
+def _table_root(table: str) -> str:
+    return os.path.join(CACHE_DIR, table)
+
+
+def current_generation(table: str) -> Optional[str]:
+    try:
+        with open(os.path.join(_table_root(table), CURRENT_POINTER), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def snapshot_path(table: str) -> str:
+    """현재 세대의 스냅샷 데이터셋 디렉터리 (CURRENT 가 없으면 세대 없이 쓰던 이전 배치)"""
+    generation = current_generation(table)
+    root = _table_root(table)
+    return os.path.join(root, generation) if generation else root
+
+
+def snapshot_marker(table: str) -> str:
+    """
+    스냅샷 존재/변경 감지용 파일 (레지스트리 signature).
+    CURRENT 포인터 — 교체 시 inode/mtime 이 바뀐다. 세대 도입 전 배치면 루트의 _SUCCESS.
+    """
+    pointer = os.path.join(_table_root(table), CURRENT_POINTER)
+    if os.path.exists(pointer):
+        return pointer
+    return os.path.join(_table_root(table), SUCCESS_MARKER)
+
+
+def _legacy_path(table: str) -> str:
+    """이전 단일 feather 스냅샷 (있으면 첫 갱신 때 Parquet 로 옮김)"""
+    return os.path.join(CACHE_DIR, f"{table}.feather")
+
+
+def gu_of(region_code) -> str:
+    return str(region_code).strip()[:GU_CODE_LEN]
+
+
+def _partition_values(df: pd.DataFrame):
+    if "year" in df.columns:
+        years = pd.to_numeric(df["year"], errors="coerce").fillna(0).astype("int64").astype(str)
+    else:
+        years = pd.Series(PARTITION_ALL, index=df.index)
+    if "region_code" in df.columns:
+        gus = df["region_code"].astype(str).str.strip().str[:GU_CODE_LEN]
+    else:
+        gus = pd.Series(PARTITION_ALL, index=df.index)
+    return years, gus
+
+
+def _dataset(table: str):
+    generation = current_generation(table)
+    if generation:
+        return ds.dataset(os.path.join(_table_root(table), generation), format="parquet",
+                          partitioning=_PARTITIONING, exclude_invalid_files=True)
+    # 세대 도입 전 배치: 루트의 파티션 디렉터리만 (첫 갱신 중 생기는 새 세대 디렉터리는 제외)
+    root = _table_root(table)
+    files = sorted(glob.glob(os.path.join(root, f"{PARTITION_YEAR}=*", f"{PARTITION_GU}=*", "*.parquet")))
+    return ds.dataset(files, format="parquet", partitioning=_PARTITIONING, partition_base_dir=root)
+
+
+def read_snapshot(table: str, columns: Optional[Iterable[str]] = None,
+                  gu: Optional[str] = None, years: Optional[Iterable[int]] = None) -> pd.DataFrame:
+    """
+    스냅샷 읽기. columns 로 컬럼을, gu(구 코드 5자리)/years 로 파티션 디렉터리를 좁힌다.
+    구/연도 컬럼이 없는 테이블(파티션 값 all)은 조건과 무관하게 전체를 읽는다.
+    """
+    dataset = _dataset(table)
+    names = [n for n in dataset.schema.names if n not in (PARTITION_YEAR, PARTITION_GU)]
+    if columns is not None:
+        names = [c for c in columns if c in names]
+
+    condition = None
+    if gu is not None:
+        condition = ds.field(PARTITION_GU).isin([gu_of(gu), PARTITION_ALL])
+    if years is not None:
+        cond = ds.field(PARTITION_YEAR).isin([str(int(y)) for y in years] + [PARTITION_ALL])
+        condition = cond if condition is None else condition & cond
+    return dataset.to_table(columns=names, filter=condition).to_pandas()
+
+
+# ====== 매니페스트 ======
+def load_manifest() -> Dict:
+    if not os.path.exists(MANIFEST_PATH):
+        return {"data_version": 0, "updated_at": None, "tables": {}}
+    with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest: Dict) -> None:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{MANIFEST_PATH}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, MANIFEST_PATH)
+
+
+_version_cache = {"sig": None, "version": 0}
+
+def get_data_version() -> int:
+    """현재 스냅샷 데이터 버전 (매니페스트 mtime 이 바뀔 때만 다시 읽음)"""
+    try:
+        st = os.stat(MANIFEST_PATH)
+        sig = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return 0
+    if sig != _version_cache["sig"]:
+        _version_cache["version"] = int(load_manifest().get("data_version", 0))
+        _version_cache["sig"] = sig
+    return _version_cache["version"]
+
+
+# ====== 워터마크 ======
+def _watermark_mode(table: str, columns) -> str:
+    cols = set(columns)
+    if {"year", "quarter"} <= cols:
+        return "year_quarter"
+    if "quarter" in cols and _YEAR_SUFFIX_RE.search(table):
+        return "quarter"      # 연도별 테이블(sales_summary_2024 등)
+    return "full"             # 기간 컬럼 없음 → 행 수 변화 시 전체 재적재
+
+
+def _watermark(df: pd.DataFrame, mode: str) -> Optional[List[int]]:
+    if df.empty:
+        return None
+    if mode == "year_quarter":
+        key = (pd.to_numeric(df["year"]) * 10 + pd.to_numeric(df["quarter"])).max()
+        return [int(key // 10), int(key % 10)]
+    if mode == "quarter":
+        return [int(pd.to_numeric(df["quarter"]).max())]
+    return None
+
+
+def _write_snapshot(table: str, df: pd.DataFrame) -> None:
+    """
+    파티션별 Parquet 를 새 세대 디렉터리에 모두 쓴 뒤 CURRENT 를 원자적으로 교체.
+    (읽는 쪽은 항상 완성된 세대만 보며, 교체 중에도 스냅샷이 사라지는 순간이 없다)
+    """
+    root = _table_root(table)
+    os.makedirs(root, exist_ok=True)
+    previous = current_generation(table)
+    generation = f"{GENERATION_PREFIX}{time.time_ns()}"
+    gen_dir = os.path.join(root, generation)
+
+    df = df.reset_index(drop=True)
+    # 파티션마다 추론하면 결측만 있는 컬럼의 타입이 갈라지므로 전체 기준 스키마 하나로 씀
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    years, gus = _partition_values(df)
+    groups = df.groupby([years, gus], sort=True).indices if len(df) else {(PARTITION_ALL, PARTITION_ALL): []}
+    for (year, gu), rows in groups.items():
+        part_dir = os.path.join(gen_dir, f"{PARTITION_YEAR}={year}", f"{PARTITION_GU}={gu}")
+        os.makedirs(part_dir, exist_ok=True)
+        part = pa.Table.from_pandas(df.take(rows), schema=schema, preserve_index=False)
+        pq.write_table(part, os.path.join(part_dir, "part-0.parquet"))
+    open(os.path.join(gen_dir, SUCCESS_MARKER), "w").close()
+
+    pointer = os.path.join(root, CURRENT_POINTER)
+    tmp = f"{pointer}.tmp-{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(generation)
+    os.replace(tmp, pointer)
+    _cleanup_generations(table, keep={generation, previous})
+    if os.path.exists(_legacy_path(table)):
+        os.remove(_legacy_path(table))
+
+
+def _cleanup_generations(table: str, keep) -> None:
+    """현재/직전 세대만 남기고 정리 (세대 도입 전 루트 배치 파티션도 삭제)"""
+    root = _table_root(table)
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name in keep or name.startswith(CURRENT_POINTER):
+            continue
+        if name.startswith(GENERATION_PREFIX) or name.startswith(f"{PARTITION_YEAR}="):
+            shutil.rmtree(path, ignore_errors=True)
+        elif name == SUCCESS_MARKER:
+            os.remove(path)
+
+
+def _pull_new_rows(engine, table: str, mode: str, watermark: List[int]) -> pd.DataFrame:
+    if mode == "year_quarter":
+        year, quarter = watermark
+        return pd.read_sql_query(
+            f"SELECT * FROM {table} WHERE year > %s OR (year = %s AND quarter > %s)",
+            engine, params=(year, year, quarter),
+        )
+    return pd.read_sql_query(f"SELECT * FROM {table} WHERE quarter > %s", engine, params=(watermark[0],))
+
+
+def _refresh_one(engine, table: str, manifest: Dict, full: bool) -> bool:
+    """
+    테이블 하나를 갱신. 기존 스냅샷 내용이 바뀌었으면 True.
+    스냅샷이 처음 만들어지는 경우(최초 적재)는 바뀐 것으로 보지 않는다
+    → 요청 중 지연 적재가 data_version 을 올려 하위 캐시를 모두 무효화하지 않도록.
+    """
+    entry = manifest["tables"].get(table, {})
+
+    exists = os.path.exists(snapshot_marker(table))
+    legacy = os.path.exists(_legacy_path(table))
+    if not full and (exists or legacy):
+        if exists:
+            old = read_snapshot(table)
+        else:
+            old = pd.read_feather(_legacy_path(table))
+            _write_snapshot(table, old)
+            print(f"📦 {table}: feather → Parquet 파티션 변환 ({len(old)} rows)")
+        mode = _watermark_mode(table, old.columns)
+        watermark = _watermark(old, mode)
+
+        if mode != "full" and watermark is not None:
+            new = _pull_new_rows(engine, table, mode, watermark)
+            pulled = len(new)
+            if pulled:
+                new = new.astype(old.dtypes.to_dict(), errors="ignore")
+                old = pd.concat([old, new], ignore_index=True)
+                _write_snapshot(table, old)
+                watermark = _watermark(old, mode)
+            print(f"🔄 {table}: +{pulled} rows (watermark={watermark})")
+            manifest["tables"][table] = {
+                "mode": mode, "watermark": watermark, "rows": int(len(old)),
+                "refreshed_at": time.strftime("%Y-%m-%d %H:%M:%S"), "pulled_rows": pulled,
+            }
+            return pulled > 0
+
+        if mode == "full":
+            count = int(pd.read_sql(f"SELECT COUNT(*) AS n FROM {table}", engine)["n"].iloc[0])
+            if count == len(old):
+                print(f"✅ {table}: 변경 없음 ({count} rows)")
+                entry.update({"mode": mode, "rows": count, "refreshed_at": time.strftime("%Y-%m-%d %H:%M:%S"), "pulled_rows": 0})
+                manifest["tables"][table] = entry
+                return False
+
+    # 스냅샷 없음 / --full / 기간 컬럼 없는 테이블의 행 수 변경 → 전체 적재
+    df = pd.read_sql(f"SELECT * FROM {table}", engine)
+    _write_snapshot(table, df)
+    mode = _watermark_mode(table, df.columns)
+    initial = not (exists or legacy)
+    print(f"💾 {table}: {'최초' if initial else '전체'} 적재 {len(df)} rows")
+    manifest["tables"][table] = {
+        "mode": mode, "watermark": _watermark(df, mode), "rows": int(len(df)),
+        "refreshed_at": time.strftime("%Y-%m-%d %H:%M:%S"), "pulled_rows": int(len(df)),
+    }
+    return not initial
+
+
+def _bump_version(manifest: Dict) -> None:
+    manifest["data_version"] = int(manifest.get("data_version", 0)) + 1
+    manifest["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def refresh(tables: Optional[List[str]] = None, full: bool = False, engine=None) -> int:
+    """
+    스냅샷 증분 갱신. 기존 스냅샷이 하나라도 바뀌면 data_version 을 1 올린다 (최초 적재는 제외).
+    return: 갱신 후 data_version
+    """
+    engine = engine or get_engine()
+    with _refresh_lock():
+        manifest = load_manifest()
+        changed = False
+        for table in (tables or managed_tables()):
+            changed |= _refresh_one(engine, table, manifest, full)
+        if changed:
+            _bump_version(manifest)
+        _save_manifest(manifest)
+        return int(manifest["data_version"])
+
+
+def ensure_snapshot(table: str) -> str:
+    """
+    스냅샷이 없으면 적재(이전 feather 가 있으면 변환) 후 데이터셋 경로 반환 (레지스트리 최초 로드용).
+    최초 적재는 스냅샷과 워터마크만 기록하고 data_version 은 그대로 둔다.
+    """
+    if os.path.exists(snapshot_marker(table)):
+        return snapshot_path(table)
+    with _refresh_lock():
+        # 잠금을 기다리는 동안 다른 프로세스/스레드가 이미 적재했을 수 있음
+        if not os.path.exists(snapshot_marker(table)):
+            manifest = load_manifest()
+            if _refresh_one(get_engine(), table, manifest, full=False):
+                _bump_version(manifest)   # 이전 feather 변환 중 새 기간이 들어온 경우
+            _save_manifest(manifest)
+    return snapshot_path(table)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="원본 테이블 스냅샷 관리")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_refresh = sub.add_parser("refresh", help="워터마크 이후 기간만 증분 갱신")
+    p_refresh.add_argument("tables", nargs="*", help="대상 테이블 (미지정 시 전체)")
+    p_refresh.add_argument("--full", action="store_true", help="증분 대신 전체 재적재")
+    sub.add_parser("status", help="매니페스트 출력")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "refresh":
+        version = refresh(args.tables or None, full=args.full)
+        print(f"📌 data_version = {version}")
+    else:
+        print(json.dumps(load_manifest(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
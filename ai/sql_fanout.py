@@ -0,0 +1,83 @@
+# ai/sql_fanout.py
+"""
+서로 독립적인 SQL 조회를 공용 스레드 풀에서 동시에 실행하는 fan-out 실행기.
+
+- 프로세스 전역 ThreadPoolExecutor 하나를 공유 (SQL_FANOUT_WORKERS 로 상한 제어)
+  → 동시 요청이 많아도 DB 커넥션 풀(get_engine) 크기를 넘겨 대기열을 쌓지 않음
+- 쿼리별 대기/실행 시간을 기록해 가장 느린 쿼리를 로그로 남김
+- ANALYTICS_BACKEND=duckdb 이면 원격 DB 대신 로컬 스냅샷 위 DuckDB 에서 실행 (ai/analytics.py)
+
+사용 예:
+    fan = QueryFanout(engine, tag="report")
+    fan.submit("rent", "SELECT ... WHERE region_code = %s", (code,))
+    fan.submit("store", "SELECT ...", (code,))
+    rent_df = fan.result("rent")
+    fan.log_timings()
+"""
+import os
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from config.settings import get_engine
+from ai import analytics
+
+# 커넥션 풀(config.settings 의 DB_POOL_SIZE + DB_MAX_OVERFLOW) 보다 작게 유지해
+# 요청 스레드/비동기 작업 워커가 쓸 커넥션을 남겨 둠
+SQL_FANOUT_WORKERS = int(os.getenv("SQL_FANOUT_WORKERS", "8"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=SQL_FANOUT_WORKERS, thread_name_prefix="sql-fanout")
+    return _executor
+
+
+class QueryFanout:
+    """이름 → (SQL, params) 쿼리들을 병렬 실행하고 이름으로 결과(DataFrame)를 받는다."""
+
+    def __init__(self, engine=None, tag: str = "query"):
+        self.engine = engine or get_engine()
+        self.tag = tag
+        self._futures: Dict[str, Future] = {}
+        self.timings: Dict[str, Tuple[float, float]] = {}   # name → (대기 s, 실행 s)
+        self._started = time.perf_counter()
+
+    def _run(self, name: str, sql: str, params, submitted: float) -> pd.DataFrame:
+        started = time.perf_counter()
+        try:
+            return analytics.read_sql(sql, self.engine, params=params)
+        finally:
+            self.timings[name] = (started - submitted, time.perf_counter() - started)
+
+    def submit(self, name: str, sql: str, params=()) -> Future:
+        if name in self._futures:
+            raise ValueError(f"[sql_fanout] 중복된 쿼리 이름: {name}")
+        future = get_executor().submit(self._run, name, sql, params, time.perf_counter())
+        self._futures[name] = future
+        return future
+
+    def result(self, name: str) -> pd.DataFrame:
+        """쿼리 완료까지 대기. 실패한 쿼리는 예외를 그대로 전달."""
+        return self._futures[name].result()
+
+    def results(self) -> Dict[str, pd.DataFrame]:
+        return {name: self.result(name) for name in self._futures}
+
+    def log_timings(self) -> None:
+        if not self.timings:
+            return
+        wall = time.perf_counter() - self._started
+        total = sum(run for _, run in self.timings.values())
+        slowest, (wait, run) = max(self.timings.items(), key=lambda kv: kv[1][1])
+        print(f"⏱️ [{self.tag}] 쿼리 {len(self.timings)}개: 경과 {wall:.2f}s / 실행 합계 {total:.2f}s "
+              f"(최장 {slowest} {run:.2f}s, 대기 {wait:.2f}s)")
@@ -0,0 +1,146 @@
+# ai/table_index.py
+"""
+지역/업종/기간 조건 조회용 정렬 인덱스.
+
+테이블을 정수 키 (region_key, category_code, period_key) 순으로 정렬해 두고
+- 구/동(region_code 접두) 조회 → region_key 이진 탐색 1회로 연속 구간 슬라이스
+- 업종(+구/동) 조회       → (category_code, region_key) 보조 정렬 인덱스 이진 탐색
+- 최근 N분기 조회         → 선택된 구간에서만 period_key(year*10+quarter) 비교
+로 처리한다. 전체 행을 훑는 str.startswith / row-wise apply 를 대체한다.
+
+region_key 는 region_code 를 8자리로 0 패딩한 정수다.
+(구 11110 → 11110000, 동 11110515 → 11110515) 이렇게 하면 접두 일치가
+[prefix * 10^k, (prefix + 1) * 10^k) 정수 구간 조회가 된다.
+"""
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ai.dataset_registry import REGISTRY
+
+REGION_KEY_DIGITS = 8
+
+
+def region_keys(codes: pd.Series) -> np.ndarray:
+    padded = codes.astype(str).str.strip().str.ljust(REGION_KEY_DIGITS, "0")
+    return pd.to_numeric(padded, errors="coerce").fillna(-1).astype(np.int64).to_numpy()
+
+
+def region_range(prefix) -> Tuple[int, int]:
+    """region_code 접두 → region_key 반열린 구간 [lo, hi)"""
+    p = str(prefix).strip()
+    scale = 10 ** (REGION_KEY_DIGITS - len(p))
+    lo = int(p) * scale
+    return lo, lo + scale
+
+
+def period_keys(years, quarters) -> np.ndarray:
+    return (pd.to_numeric(years, errors="coerce").fillna(0).astype(np.int64).to_numpy() * 10
+            + pd.to_numeric(quarters, errors="coerce").fillna(0).astype(np.int64).to_numpy())
+
+
+class IndexedTable:
+    def __init__(self, df: pd.DataFrame, category_col: str = "category_small"):
+        region = region_keys(df["region_code"]) if "region_code" in df.columns else np.zeros(len(df), np.int64)
+        if "year" in df.columns and "quarter" in df.columns:
+            period = period_keys(df["year"], df["quarter"])
+        else:
+            period = np.zeros(len(df), np.int64)
+
+        if category_col in df.columns:
+            values = df[category_col].astype(str).to_numpy()
+            self.categories = np.unique(values)
+            category = np.searchsorted(self.categories, values)
+        else:
+            self.categories = np.array([], dtype=object)
+            category = np.zeros(len(df), np.int64)
+
+        # 기본 정렬: region → category → period
+        order = np.lexsort((period, category, region))
+        self.df = df.take(order).reset_index(drop=True)
+        self.region_key = region[order]
+        self.category_code = category[order]
+        self.period_key = period[order]
+
+        # 보조 인덱스: category → region → period (기본 정렬 위치를 가리킴)
+        self._by_category = np.lexsort((self.period_key, self.region_key, self.category_code))
+        self._cat_sorted = self.category_code[self._by_category]
+        self._cat_region = self.region_key[self._by_category]
+
+    def __len__(self):
+        return len(self.df)
+
+    def _category_code(self, category) -> Optional[int]:
+        pos = np.searchsorted(self.categories, str(category))
+        if pos < len(self.categories) and self.categories[pos] == str(category):
+            return int(pos)
+        return None
+
+    def positions(self, region=None, category=None, periods: Optional[Iterable[int]] = None):
+        """조건에 맞는 행 위치 (기본 정렬 기준, 오름차순)"""
+        if category is not None:
+            code = self._category_code(category)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            lo, hi = np.searchsorted(self._cat_sorted, [code, code + 1])
+            if region is not None:
+                r_lo, r_hi = region_range(region)
+                a, b = np.searchsorted(self._cat_region[lo:hi], [r_lo, r_hi])
+                lo, hi = lo + a, lo + b
+            pos = np.sort(self._by_category[lo:hi])
+        elif region is not None:
+            r_lo, r_hi = region_range(region)
+            lo, hi = np.searchsorted(self.region_key, [r_lo, r_hi])
+            pos = np.arange(lo, hi)
+        else:
+            pos = np.arange(len(self.df))
+
+        if periods is not None:
+            pos = pos[np.isin(self.period_key[pos], np.fromiter(periods, dtype=np.int64))]
+        return pos
+
+    def select(self, region=None, category=None, periods: Optional[Iterable[int]] = None, **equals) -> pd.DataFrame:
+        """
+        region: region_code 접두(구 5자리 / 동 8자리), category: 업종 소분류,
+        periods: period_key 집합, equals: 좁혀진 구간에 추가로 적용할 컬럼=값 조건
+        """
+        out = self.df.iloc[self.positions(region, category, periods)]
+        for col, val in equals.items():
+            out = out[out[col] == val]
+        return out
+
+
+def get_index(table: str, category_col: str = "category_small", gu: Optional[str] = None) -> IndexedTable:
+    """
+    스냅샷이 바뀔 때만 다시 만드는 테이블 인덱스 (프로세스 전역 공유).
+    gu 를 주면 그 구 파티션만 읽어 만든 인덱스 (구 단위 요청용)
+    """
+    return REGISTRY.derived(("index", table, category_col, gu), [(table, None, gu)],
+                            lambda df: IndexedTable(df, category_col=category_col))
+
+
+# ====== zone_id 조회 (상권 단위 연도별 테이블: sales_summary_YYYY, zone_store_count_YYYY …) ======
+def _zone_source(table: str, columns=None):
+    """columns 지정 시 zone_id 를 포함한 그 컬럼만 읽는 레지스트리 원본"""
+    if columns is None:
+        return (table, None)
+    return (table, tuple(dict.fromkeys(["zone_id", *columns])))
+
+
+def get_zone_positions(table: str, columns=None):
+    """zone_id → 행 위치 배열 (스냅샷이 바뀔 때만 다시 만듦)"""
+    source = _zone_source(table, columns)
+    return REGISTRY.derived(("zone_positions",) + source, [source],
+                            lambda df: df.groupby("zone_id", sort=False).indices)
+
+
+def select_zones(table: str, zone_ids: Iterable[str], columns=None) -> pd.DataFrame:
+    """zone_ids 에 해당하는 행만 잘라낸 프레임 (원본 행 순서 유지, columns 로 열만 읽어 보관/반환)"""
+    positions = get_zone_positions(table, columns)
+    hits = [positions[z] for z in {str(z) for z in zone_ids} if z in positions]
+    rows = np.sort(np.concatenate(hits)) if hits else np.empty(0, dtype=np.int64)
+    df = REGISTRY.get(*_zone_source(table, columns), copy=False)
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return df.take(rows).reset_index(drop=True)
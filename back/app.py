@@ -1,13 +1,23 @@
 # back/app.py
 import os
-from flask import Flask, jsonify, request
+import sys
+import time
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
 
+from config.settings import get_engine
+from config.pool import pool_stats
+
+# ai 패키지 경로 등록 (routes/* 와 동일)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from ai import metrics
+
 # --- Blueprints ---
 from routes.recommendIndustry import bp as recommend_industry_bp
 from routes.recommendArea import bp as recommend_area_bp
 from routes.report import bp as report_bp
 from routes.chat import bp as chat_bp
+from routes.jobs import bp as jobs_bp
 
 
 def create_app():
@@ -30,6 +40,27 @@ def create_app():
     app.register_blueprint(recommend_area_bp, url_prefix="/api")
     app.register_blueprint(report_bp, url_prefix="/api")
     app.register_blueprint(chat_bp, url_prefix="/api")
+    app.register_blueprint(jobs_bp, url_prefix="/api")
+
+    # 메트릭: 라우트별 요청 지연 + SQL 템플릿별 지연/행 수 (Engine 이벤트)
+    metrics.instrument_sqlalchemy()
+
+    @app.before_request
+    def _start_timer():
+        g._t0 = time.perf_counter()
+
+    @app.after_request
+    def _record_latency(response):
+        t0 = g.pop("_t0", None)
+        if t0 is not None:
+            # SSE 는 본문 생성 전 시점까지 (헤더 응답 지연)
+            metrics.HTTP_LATENCY.observe(time.perf_counter() - t0,
+                                         request.endpoint or "unmatched", request.method, response.status_code)
+        return response
+
+    @app.get("/metrics")
+    def prometheus_metrics():
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
 
     # 루트 & 헬스체크
     @app.get("/")
@@ -40,6 +71,14 @@ def create_app():
     def health():
         return jsonify(status="ok"), 200
 
+    # DB 커넥션 풀 상태 (체크아웃/유휴/overflow 수 + 획득 대기 시간) → 풀 크기 조정용
+    @app.get("/api/db/pool")
+    def db_pool():
+        try:
+            return jsonify(ok=True, **pool_stats(get_engine())), 200
+        except Exception as e:
+            return jsonify(ok=False, error="pool_unavailable", detail=str(e)), 503
+
     # 사전 플라이트(OPTIONS) 로깅/허용 (flask-cors가 처리하지만, 디버그용으로 상태만 반환)
     @app.route("/api/<path:_sub>", methods=["OPTIONS"])
     def cors_preflight(_sub):
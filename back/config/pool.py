@@ -0,0 +1,84 @@
+import time
+import threading
+from collections import deque
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+# 최근 N건의 커넥션 획득 대기 시간으로 p50/p95 계산
+_RECENT_WAITS = 1000
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool + 커넥션 획득 대기 시간 계측.
+    _do_get(풀에서 꺼내기 / overflow 생성 / 대기)을 감싸 건수·누적·최대 대기와 타임아웃 수를 집계한다.
+    (QueuePool._do_get 은 내부에서 재귀 호출하므로 바깥 호출 1번만 측정)
+    """
+
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self._waits = deque(maxlen=_RECENT_WAITS)
+        self._acquired = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _do_get(self):
+        if getattr(self._local, "timing", False):
+            return super()._do_get()
+        self._local.timing = True
+        t0 = time.perf_counter()
+        try:
+            rec = super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            self._local.timing = False
+        waited = time.perf_counter() - t0
+        with self._stats_lock:
+            self._acquired += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._waits.append(waited)
+        return rec
+
+    def wait_stats(self) -> dict:
+        with self._stats_lock:
+            recent = sorted(self._waits)
+            acquired, timeouts = self._acquired, self._timeouts
+            total, peak = self._wait_total, self._wait_max
+
+        def _pct(p):
+            return round(recent[min(len(recent) - 1, int(len(recent) * p))] * 1000, 2) if recent else 0.0
+
+        return {
+            "acquired": acquired,
+            "timeouts": timeouts,
+            "wait_avg_ms": round(total / acquired * 1000, 2) if acquired else 0.0,
+            "wait_p50_ms": _pct(0.50),
+            "wait_p95_ms": _pct(0.95),
+            "wait_max_ms": round(peak * 1000, 2),
+        }
+
+
+def pool_stats(engine) -> dict:
+    """체크아웃/유휴/overflow 커넥션 수 + 대기 시간 (TimedQueuePool 이 아니면 개수만)"""
+    pool = engine.pool
+    info = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        info.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_sec": pool.timeout(),
+        })
+    if isinstance(pool, TimedQueuePool):
+        info.update(pool.wait_stats())
+    return info
@@ -2,13 +2,31 @@ import os
 from functools import lru_cache
 from typing import Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from dotenv import load_dotenv
 
+from config.pool import TimedQueuePool
+
 # .env 자동 로드 (back/.env 또는 프로젝트 루트 .env)
 # 존재하지 않아도 에러내지 않음.
 load_dotenv()
 
+# 원본 테이블 스냅샷(Parquet 파티션, ai/snapshots.py)·LLM 캐시·사전계산 점수 저장 위치.
+# 기본값은 back/cache (app.py 실행 위치 기준과 동일)
+CACHE_DIR = os.path.abspath(
+    os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache"))
+)
+
+# DB 커넥션 풀 (요청 스레드 + SQL 팬아웃 워커 + 비동기 작업 워커 동시성에 맞춰 조정)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))   # MySQL wait_timeout 보다 짧게
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# 지표 집계 백엔드: mysql(기본, 원격 DB/pandas) | duckdb(로컬 스냅샷 위 내장 컬럼형 SQL, ai/analytics.py)
+ANALYTICS_BACKEND = os.getenv("ANALYTICS_BACKEND", "mysql").strip().lower()
+ANALYTICS_THREADS = int(os.getenv("ANALYTICS_THREADS", "0"))   # 0 이면 duckdb 기본값(코어 수)
+
 def _required(name: str) -> str:
     val = os.getenv(name)
     if not val or not val.strip():
@@ -17,6 +35,10 @@ def _required(name: str) -> str:
 
 @lru_cache(maxsize=1)
 def get_db_url() -> str:
+    # DATABASE_URL 이 있으면 그대로 사용 (벤치마크/로컬: sqlite:///bench.sqlite3 등)
+    url = os.getenv("DATABASE_URL", "").strip()
+    if url:
+        return url
     host = _required("DB_HOST")
     port = _required("DB_PORT")
     user = _required("DB_USER")
@@ -27,9 +49,31 @@ def get_db_url() -> str:
 @lru_cache(maxsize=1)
 def get_engine():
     url = get_db_url()
-    # utf8mb4 + pre_ping 권장
+    if url.startswith("sqlite"):
+        return _sqlite_engine(url)
+    # utf8mb4 + pre_ping 권장 (pre_ping 이 체크아웃마다 연결을 확인하므로 별도 SELECT 1 불필요)
     return create_engine(
         url,
         connect_args={"charset": "utf8mb4"},
+        poolclass=TimedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_timeout=DB_POOL_TIMEOUT,
         pool_pre_ping=True,
     )
+
+def _sqlite_engine(url: str):
+    """
+    내장 sqlite (벤치마크/오프라인 실행용).
+    쿼리는 pymysql 자리표시자(%s)로 작성되어 있으므로 실행 직전에 sqlite(?)로 바꿔준다.
+    """
+    engine = create_engine(url, connect_args={"check_same_thread": False},
+                           poolclass=TimedQueuePool, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW,
+                           pool_timeout=DB_POOL_TIMEOUT)
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def _qmark(conn, cursor, statement, parameters, context, executemany):
+        return statement.replace("%s", "?"), parameters
+
+    return engine
@@ -0,0 +1,136 @@
+# back/jobs.py
+"""
+오래 걸리는 파이프라인(지역/업종 추천, 리포트)을 위한 비동기 작업 관리자.
+
+- submit(): 작업 id 를 즉시 반환하고, 전용 스레드 풀(JOB_WORKERS)에서 실행
+- 대기 중인 작업이 JOB_MAX_QUEUED 를 넘으면 JobQueueFull (라우트에서 503)
+- 완료/실패한 작업은 JOB_RETENTION_SEC 동안 보관 후 조회 시점에 정리
+- 작업 함수는 (body: dict, status: int) 를 반환 (Flask 요청 컨텍스트 밖에서 실행)
+"""
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", "100"))
+JOB_RETENTION_SEC = int(os.getenv("JOB_RETENTION_SEC", "3600"))
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+class Job:
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"          # queued → running → done | error
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.body: Optional[dict] = None
+        self.http_status: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "error")
+
+    def to_dict(self) -> dict:
+        end = self.finished_at or time.time()
+        info = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_sec": round(end - (self.started_at or end), 3),
+        }
+        if self.error:
+            info["error"] = self.error
+        return info
+
+
+class JobManager:
+    def __init__(self, workers: int = JOB_WORKERS, max_queued: int = JOB_MAX_QUEUED,
+                 retention_sec: int = JOB_RETENTION_SEC):
+        self.max_queued = max_queued
+        self.retention_sec = retention_sec
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def _purge(self) -> None:
+        cutoff = time.time() - self.retention_sec
+        expired = [jid for jid, job in self._jobs.items()
+                   if job.finished and job.finished_at is not None and job.finished_at < cutoff]
+        for jid in expired:
+            del self._jobs[jid]
+
+    def _run(self, job: Job, fn: Callable, args, kwargs) -> None:
+        with self._lock:
+            job.started_at = time.time()
+            job.status = "running"
+        error = None
+        try:
+            body, http_status = fn(*args, **kwargs)
+        except Exception as e:
+            print(f"❌ job {job.kind}/{job.id} 실패: {e}")
+            error = str(e)
+            body, http_status = {"ok": False, "error": "internal_error", "detail": error}, 500
+        # 결과/finished_at 을 먼저 채우고 상태는 마지막에 (조회/정리 쪽은 완료 상태면 항상 finished_at 이 있음)
+        with self._lock:
+            job.body, job.http_status, job.error = body, http_status, error
+            job.finished_at = time.time()
+            job.status = "error" if error is not None else "done"
+
+    def submit(self, kind: str, fn: Callable, *args, **kwargs) -> Job:
+        with self._lock:
+            self._purge()
+            queued = sum(1 for job in self._jobs.values() if job.status == "queued")
+            if queued >= self.max_queued:
+                raise JobQueueFull(f"대기 중인 작업이 너무 많습니다 ({queued}/{self.max_queued})")
+            job = Job(kind)
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._purge()
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._purge()
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {"jobs": counts, "retention_sec": self.retention_sec, "max_queued": self.max_queued}
+
+
+JOBS = JobManager()
+
+
+def wants_async(args, data) -> bool:
+    """?async=1 또는 JSON body 의 "async": true 이면 작업 제출 모드"""
+    return str(args.get("async", "")).lower() in ("1", "true") or data.get("async") is True
+
+
+def submit_response(kind: str, fn: Callable, *args, **kwargs):
+    """작업 제출 → (202 응답 body, status). 라우트에서 jsonify 만 하면 됨"""
+    try:
+        job = JOBS.submit(kind, fn, *args, **kwargs)
+    except JobQueueFull as e:
+        return {"ok": False, "error": "queue_full", "detail": str(e)}, 503
+    info = job.to_dict()
+    info.update({
+        "ok": True,
+        "status_url": f"/api/jobs/{job.id}",
+        "result_url": f"/api/jobs/{job.id}/result",
+    })
+    return info, 202
@@ -0,0 +1,101 @@
+# back/result_cache.py
+"""
+추천 라우트 결과 캐시 (프로세스 메모리).
+
+- 키: (라우트, 정규화된 입력, data_version, 사전계산 점수 CURRENT 버전)
+  → 스냅샷 갱신 또는 precompute 배치 재실행 시 자연히 새 키
+- single-flight: 같은 키의 계산이 진행 중이면 새 요청은 그 결과를 기다려 공유
+  (프론트 fetchWithRetry 재시도가 파이프라인을 중복 실행하지 않음)
+- stale-while-revalidate: TTL 이 지난 항목은 STALE 구간 동안 즉시 반환하고
+  백그라운드에서 1회만 다시 계산
+- 항목 수 상한 초과 시 LRU 삭제
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable, Optional
+
+RESULT_CACHE_TTL_SEC = int(os.getenv("RESULT_CACHE_TTL_SEC", "1800"))
+RESULT_CACHE_STALE_SEC = int(os.getenv("RESULT_CACHE_STALE_SEC", "86400"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "512"))
+
+
+class ResultCache:
+    def __init__(self, ttl_sec: int = RESULT_CACHE_TTL_SEC, stale_sec: int = RESULT_CACHE_STALE_SEC,
+                 max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.ttl_sec = ttl_sec
+        self.stale_sec = stale_sec
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()   # key → (stored_at, value)
+        self._inflight = {}                                              # key → Future
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="result-refresh")
+        self.hits = self.stale_hits = self.misses = self.coalesced = 0
+
+    def _store(self, key, value) -> None:
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _compute(self, key, compute: Callable, cacheable: Callable, future: Future) -> None:
+        """future 소유자만 호출. 결과를 캐시에 넣고 대기 중인 요청에 전달"""
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            return
+        with self._lock:
+            if cacheable(value):
+                self._store(key, value)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def get_or_compute(self, key: Hashable, compute: Callable, cacheable: Optional[Callable] = None):
+        cacheable = cacheable or (lambda value: True)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.time() - entry[0]
+                if age <= self.ttl_sec:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                if age <= self.ttl_sec + self.stale_sec:
+                    self.stale_hits += 1
+                    if key not in self._inflight:
+                        future = Future()
+                        self._inflight[key] = future
+                        self._refresher.submit(self._compute, key, compute, cacheable, future)
+                    return entry[1]
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+
+        if owner:
+            self._compute(key, compute, cacheable, future)
+        return future.result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "inflight": len(self._inflight),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+            }
+
+
+RESULT_CACHE = ResultCache()
@@ -1,33 +1,75 @@
 # back/routes/chat.py
-from flask import Blueprint, request, jsonify
+import json
+
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 
 # ai 패키지에서 엔트리 임포트
-from ai.chat_ai.main import generate_chat_response
+from ai.chat_ai.main import generate_chat_response, stream_chat_response
 
 bp = Blueprint('chat', __name__)
 CORS(bp)
 
+def _chat_params():
+    data = request.get_json(force=True) or {}
+    messages = data.get('messages', [])
+
+    # 프론트에서 전달하는 리포트/맥락 정보를 그대로 넘겨줌
+    context = {
+        "role": data.get("role"),
+        "gu_name": data.get("gu_name"),
+        "region": data.get("region"),
+        "category_large": data.get("category_large"),
+        "category_small": data.get("category_small"),
+        "purpose": data.get("purpose"),
+        "report_text": data.get("report_text"),
+    }
+    return messages, context
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
 @bp.route('/chat', methods=['POST'])
 def chat():
     try:
-        data = request.get_json(force=True) or {}
-        messages = data.get('messages', [])
-
-        # 프론트에서 전달하는 리포트/맥락 정보를 그대로 넘겨줌
-        context = {
-            "role": data.get("role"),
-            "gu_name": data.get("gu_name"),
-            "region": data.get("region"),
-            "category_large": data.get("category_large"),
-            "category_small": data.get("category_small"),
-            "purpose": data.get("purpose"),
-            "report_text": data.get("report_text"),
-        }
-
+        messages, context = _chat_params()
         reply = generate_chat_response(messages, context=context)
         return jsonify({"response": reply})
 
     except Exception as e:
         print("[Error] /api/chat 실패:", e)
         return jsonify({"error": "챗봇 응답 실패"}), 500
+
+@bp.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    """
+    /api/chat 의 Server-Sent Events 버전.
+    event: route → {question_type, subject_type, source}  (라우팅 결정, 항상 첫 이벤트)
+    event: token → {text}                                   (답변 조각)
+    event: done  → {response}
+    event: error → {error}
+    """
+    try:
+        messages, context = _chat_params()
+    except Exception as e:
+        print("[Error] /api/chat/stream 실패:", e)
+        return jsonify({"error": "챗봇 응답 실패"}), 400
+
+    def events():
+        try:
+            for event, payload in stream_chat_response(messages, context=context):
+                if event == "route":
+                    yield _sse("route", payload)
+                elif event == "token":
+                    yield _sse("token", {"text": payload})
+                else:
+                    yield _sse("done", {"response": payload})
+        except Exception as e:
+            print("[Error] /api/chat/stream 실패:", e)
+            yield _sse("error", {"error": "챗봇 응답 실패"})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
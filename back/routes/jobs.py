@@ -0,0 +1,56 @@
+# back/routes/jobs.py
+"""
+비동기 작업 API
+- POST /api/jobs/<kind>          : kind = area | industry | report, body 는 기존 라우트와 동일 → 202 + job_id
+- GET  /api/jobs/<job_id>        : 상태 조회 (queued / running / done / error)
+- GET  /api/jobs/<job_id>/result : 완료 시 기존 라우트와 같은 응답, 진행 중이면 202 + 상태
+- GET  /api/jobs                 : 작업 수 통계
+기존 라우트에 ?async=1 (또는 body "async": true) 을 붙여도 같은 방식으로 제출된다.
+"""
+from flask import Blueprint, request, jsonify
+
+from jobs import JOBS, submit_response
+from routes.recommendArea import build_area_response
+from routes.recommendIndustry import build_industry_response
+from routes.report import build_report_response, normalize_report_params
+
+bp = Blueprint("jobs", __name__)
+
+JOB_HANDLERS = {
+    "area": build_area_response,
+    "industry": build_industry_response,
+    "report": lambda data: build_report_response(normalize_report_params(data)),
+}
+
+
+@bp.route("/jobs/<kind>", methods=["POST"])
+def submit_job(kind):
+    handler = JOB_HANDLERS.get(kind)
+    if handler is None:
+        return jsonify({"ok": False, "error": "unknown_job_kind", "kinds": list(JOB_HANDLERS)}), 404
+    data = request.get_json(silent=True) or {}
+    body, status = submit_response(kind, handler, data)
+    return jsonify(body), status
+
+
+@bp.route("/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"ok": False, "error": "job_not_found", "job_id": job_id}), 404
+    return jsonify({"ok": True, **job.to_dict()}), 200
+
+
+@bp.route("/jobs/<job_id>/result", methods=["GET"])
+def job_result(job_id):
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"ok": False, "error": "job_not_found", "job_id": job_id}), 404
+    if not job.finished:
+        return jsonify({"ok": True, **job.to_dict()}), 202
+    return jsonify(job.body), job.http_status
+
+
+@bp.route("/jobs", methods=["GET"])
+def job_stats():
+    return jsonify(JOBS.stats()), 200
@@ -1,6 +1,5 @@
 import sys
 import os
-import json
 import re
 import difflib
 from flask import Blueprint, request, jsonify
@@ -8,6 +7,10 @@ from flask import Blueprint, request, jsonify
 # ai 디렉토리 등록
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from ai import recommend_area  # 기대: run_recommendation(category_small, gu_name) -> dict(payload)
+from ai.snapshots import get_data_version
+from ai.scoring import validate_weights
+from jobs import wants_async, submit_response
+from result_cache import RESULT_CACHE
 
 bp = Blueprint('recommend_area', __name__)
 
@@ -48,64 +51,47 @@ def find_key_by_similarity(result_dict: dict, key_text: str):
         return norm_map[close[0]]
     return None
 
-def _load_recommendation_json():
+def _is_cacheable(result) -> bool:
+    """에러 폴백(빈 배열)은 캐시하지 않음 → 다음 요청에서 다시 계산"""
+    body, status = result
+    return status == 200 and bool(body.get('recommendations')) and 'error' not in body.get('meta', {})
+
+def build_area_response(data: dict):
     """
-    실행 환경에 따라 생성 위치가 달라질 수 있으므로 여러 후보 경로를 탐색한다.
+    /api/recommend/area 본문 처리 (요청 컨텍스트 불필요 → 비동기 작업에서도 호출)
+    (라우트, 입력, data_version, 사전계산 점수 버전) 단위로 RESULT_CACHE 를 거침
+    입력은 앞뒤 공백만 제거해 캐시 키와 계산에 같은 값을 씀 (키가 같으면 응답도 같음)
+    return: (응답 body, status)
     """
-    candidates = [
-        # 런타임/캐시 우선
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cache', 'runtime', 'recommendation_dong.json')),
-        # 하위 호환: routes/.., 프로젝트 루트, ai 폴더 등
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'recommendation_dong.json')),
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'recommendation_dong.json')),
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'ai', 'recommendation_dong.json')),
-        # 혹시 파일명이 다른 경우를 대비
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'recommendation_area.json')),
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'recommendation_area.json')),
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'ai', 'recommendation_area.json')),
-    ]
-    for p in candidates:
-        if os.path.exists(p):
-            with open(p, 'r', encoding='utf-8') as f:
-                return json.load(f), p
-    return {}, None
-
-@bp.route('/recommend/area', methods=['POST'])
-def recommend_area_route():
-    data = request.get_json(silent=True) or {}
-    category_small = data.get('category_small')  # 예: "커피-음료"
-    gu_name = data.get('gu_name')                # 예: "종로구"
+    category_small = str(data.get('category_small') or '').strip()  # 예: "커피-음료"
+    gu_name = str(data.get('gu_name') or '').strip()                # 예: "종로구"
 
     if not category_small or not gu_name:
-        return jsonify({'error': 'Missing category_small or gu_name'}), 400
+        return {'error': 'Missing category_small or gu_name'}, 400
 
-    try:
-        # 1) 추천 실행 (파일 생성/갱신 포함)
-        payload = recommend_area.run_recommendation(category_small, gu_name)
+    # (선택) 사용자 지정 가중치: {"유동인구": 0.4, ...} → 기본 WEIGHTS 에 덮어씀
+    weights = data.get('weights') or None
+    if weights is not None:
+        try:
+            weights = validate_weights(weights, recommend_area.ALL_SCORE_COLUMNS)
+        except ValueError as e:
+            return {'error': 'Invalid weights', 'detail': str(e)}, 400
+
+    key = ('area', category_small, gu_name,
+           tuple(sorted((weights or {}).items())), get_data_version(),
+           recommend_area.AREA_SCORE_STORE.current_version())
+    return RESULT_CACHE.get_or_compute(
+        key, lambda: _compute_area_response(category_small, gu_name, weights), cacheable=_is_cacheable
+    )
 
-        # ✅ 실행 결과(payload)가 dict이고, 우리가 찾는 키가 있으면 바로 사용 (파일 I/O race 회피)
-        if isinstance(payload, dict):
-            key = category_small if category_small in payload else find_key_by_similarity(payload, category_small)
-            if key:
-                items = payload.get(key, [])
-                # 필드 정리
-                norm = []
-                for it in (items if isinstance(items, list) else []):
-                    norm.append({
-                        'district': (it.get('district') or it.get('행정동명') or '').strip(),
-                        'reason': (it.get('reason') or it.get('사유') or '').strip(),
-                        'score': it.get('score') if isinstance(it.get('score'), (int, float)) else None,
-                    })
-                return jsonify({
-                    'recommendations': norm,
-                    'matched_category': key,
-                    'meta': {'gu_name': gu_name, 'requested_category': category_small, 'json_path': None}
-                }), 200
+def _compute_area_response(category_small: str, gu_name: str, weights=None):
+    try:
+        # 추천 실행 결과(payload)에서 바로 응답 구성 (파일 I/O 없음)
+        payload = recommend_area.run_recommendation(category_small, gu_name, weights=weights)
+        key = find_key_by_similarity(payload, category_small)
+        items = payload.get(key, []) if key else []
 
-        # 2) 파일 로드(fallback) + 키 매칭
-        result, json_path = _load_recommendation_json()
-        key = find_key_by_similarity(result, category_small)
-        items = result.get(key, []) if key else []
+        # 필드 정리
         norm = []
         for it in (items if isinstance(items, list) else []):
             norm.append({
@@ -113,18 +99,17 @@ def recommend_area_route():
                 'reason': (it.get('reason') or it.get('사유') or '').strip(),
                 'score': it.get('score') if isinstance(it.get('score'), (int, float)) else None,
             })
-
-        return jsonify({
+        return {
             'recommendations': norm,
             'matched_category': key,
-            'meta': {'gu_name': gu_name, 'requested_category': category_small, 'json_path': json_path}
-        }), 200
+            'meta': {'gu_name': gu_name, 'requested_category': category_small}
+        }, 200
 
     except Exception as e:
-        # 429/파일없음 등 포함 — 프런트가 끊기지 않도록 200 + 빈 배열
+        # 429 등 포함 — 프런트가 끊기지 않도록 200 + 빈 배열
         msg = str(e)
         print(f"[❌ Flask 라우트 에러] {msg}")
-        return jsonify({
+        return {
             'recommendations': [],
             'matched_category': None,
             'meta': {
@@ -133,4 +118,14 @@ def recommend_area_route():
                 'note': 'Error occurred but returning empty list.',
                 'error': msg
             }
-        }), 200
+        }, 200
+
+
+@bp.route('/recommend/area', methods=['POST'])
+def recommend_area_route():
+    data = request.get_json(silent=True) or {}
+    if wants_async(request.args, data):
+        body, status = submit_response('area', build_area_response, data)
+    else:
+        body, status = build_area_response(data)
+    return jsonify(body), status
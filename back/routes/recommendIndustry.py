@@ -1,6 +1,5 @@
 import sys
 import os
-import json
 import re
 import difflib
 from flask import Blueprint, request, jsonify
@@ -8,6 +7,10 @@ from flask import Blueprint, request, jsonify
 # ai 디렉토리 경로 등록
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from ai import recommend_industry  # run_industry_recommendation(region, gu_name)
+from ai.snapshots import get_data_version
+from ai.scoring import validate_weights
+from jobs import wants_async, submit_response
+from result_cache import RESULT_CACHE
 
 bp = Blueprint('recommend_industry', __name__)
 
@@ -47,79 +50,63 @@ def find_region_key(result_dict: dict, region: str):
         return norm_map[close[0]]
     return None
 
-def _load_recommendation_json():
-    # ✅ runtime 경로(감시 제외 디렉터리)를 우선 탐색
-    candidates = [
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cache', 'runtime', 'recommendation_industry.json')),
-        # 프로젝트 루트 기준 여러 위치 탐색 (하위 호환)
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'recommendation_industry.json')),
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'recommendation_industry.json')),
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'ai', 'recommendation_industry.json')),
-        # 과거 파일명 호환
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'recommendation_dong.json')),
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'recommendation_dong.json')),
-        os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'ai', 'recommendation_dong.json')),
-    ]
-    for p in candidates:
-        if os.path.exists(p):
-            with open(p, 'r', encoding='utf-8') as f:
-                return json.load(f), p
-    # 없으면 빈 결과 반환
-    return {}, None
+def _is_cacheable(result) -> bool:
+    """에러 폴백(빈 배열)은 캐시하지 않음 → 다음 요청에서 다시 계산"""
+    body, status = result
+    return status == 200 and bool(body.get('recommendations')) and 'error' not in body.get('meta', {})
 
-@bp.route('/recommend/industry', methods=['POST'])
-def recommend_industry_route():
-    data = request.get_json(silent=True) or {}
-    gu_name = data.get('gu_name')
-    region  = data.get('region')
+def build_industry_response(data: dict):
+    """
+    /api/recommend/industry 본문 처리 (요청 컨텍스트 불필요 → 비동기 작업에서도 호출)
+    (라우트, 입력, data_version, 사전계산 점수 버전) 단위로 RESULT_CACHE 를 거침
+    입력은 앞뒤 공백만 제거해 캐시 키와 계산에 같은 값을 씀 (키가 같으면 응답도 같음)
+    return: (응답 body, status)
+    """
+    gu_name = str(data.get('gu_name') or '').strip()
+    region  = str(data.get('region') or '').strip()
 
     if not gu_name or not region:
-        return jsonify({'error': 'Missing gu_name or region'}), 400
+        return {'error': 'Missing gu_name or region'}, 400
+
+    # (선택) 사용자 지정 가중치: {"점포수": 0.3, ...} → 기본 WEIGHTS 에 덮어씀
+    weights = data.get('weights') or None
+    if weights is not None:
+        try:
+            weights = validate_weights(weights, recommend_industry.SCORE_COLUMNS)
+        except ValueError as e:
+            return {'error': 'Invalid weights', 'detail': str(e)}, 400
+
+    key = ('industry', region, gu_name,
+           tuple(sorted((weights or {}).items())), get_data_version(),
+           recommend_industry.INDUSTRY_SCORE_STORE.current_version())
+    return RESULT_CACHE.get_or_compute(
+        key, lambda: _compute_industry_response(region, gu_name, weights), cacheable=_is_cacheable
+    )
 
+def _compute_industry_response(region: str, gu_name: str, weights=None):
     try:
-        # 1) 추천 실행 (파일 생성/갱신도 수행)
-        payload = recommend_industry.run_industry_recommendation(region, gu_name)
-
-        # ✅ 실행 결과(payload)가 있으면 바로 사용 (파일 I/O race 회피)
-        if isinstance(payload, dict) and region in payload:
-            items = payload.get(region, [])
-            for item in items:
-                if 'category_small' in item and isinstance(item['category_small'], str):
-                    item['category_small'] = item['category_small'].strip().replace('\r','')
-            return jsonify({
-                'recommendations': items,
-                'matched_region': region,
-                'meta': {'gu_name': gu_name, 'requested_region': region, 'json_path': None}
-            }), 200
-
-        # 2) JSON 로드(파일 기준) + 지역 매칭 (fallback)
-        result, json_path = _load_recommendation_json()
-        key = find_region_key(result, region)
-        print(f"[recommend_industry] requested='{region}', matched='{key}', json='{json_path}'")
-
-        items = result.get(key, []) if key else []
+        # 추천 실행 결과(payload)에서 바로 응답 구성 (파일 I/O 없음)
+        payload = recommend_industry.run_industry_recommendation(region, gu_name, weights=weights)
+        key = find_region_key(payload, region)
+        items = payload.get(key, []) if key else []
+
         # 문자열 꼬임 제거
         for item in items:
             if 'category_small' in item and isinstance(item['category_small'], str):
                 item['category_small'] = item['category_small'].strip().replace('\r','')
 
-        response = {
+        # ✅ 항상 200으로 응답 (빈 배열 가능)
+        return {
             'recommendations': items,
             'matched_region': key,
-            'meta': {
-                'gu_name': gu_name,
-                'requested_region': region,
-                'json_path': json_path
-            }
-        }
-        # ✅ 항상 200으로 응답 (빈 배열 가능)
-        return jsonify(response), 200
+            'meta': {'gu_name': gu_name, 'requested_region': region}
+        }, 200
 
     except Exception as e:
         # LLM 429 등 포함 → 끊지 말고 200 + 빈 배열 반환
         msg = str(e)
         print(f"[❌ Flask 라우트 에러] {msg}")
-        return jsonify({
+        return {
             'recommendations': [],
             'matched_region': None,
             'meta': {
@@ -128,4 +115,14 @@ def recommend_industry_route():
                 'note': 'Error occurred but returning empty list.',
                 'error': msg
             }
-        }), 200
+        }, 200
+
+
+@bp.route('/recommend/industry', methods=['POST'])
+def recommend_industry_route():
+    data = request.get_json(silent=True) or {}
+    if wants_async(request.args, data):
+        body, status = submit_response('industry', build_industry_response, data)
+    else:
+        body, status = build_industry_response(data)
+    return jsonify(body), status
@@ -1,29 +1,24 @@
 import re
+import json
 import pandas as pd
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 
 from config.settings import get_engine  # ✅ 환경변수에서 안전하게 로드
-from ai.report_ai import generate_report
+from ai.report_ai import generate_report, stream_report
+from jobs import wants_async, submit_response
 
 bp = Blueprint("report", __name__)
 
+def normalize_report_params(data: dict, args=None):
+    """JSON body 우선, 없으면 쿼리스트링(args)에서 가져와 공백 정리"""
+    args = args or {}
+    def _get(key):
+        return (data.get(key) or args.get(key) or "").strip()
+    return {key: _get(key) for key in ("region", "gu_name", "category_small", "purpose", "category_large", "role")}
+
 def _pick_params():
     """1) JSON body 우선, 없으면 2) 쿼리스트링에서 가져오는 헬퍼"""
-    data = request.get_json(silent=True) or {}
-    region = (data.get("region") or request.args.get("region") or "").strip()
-    gu_name = (data.get("gu_name") or request.args.get("gu_name") or "").strip()
-    category_small = (data.get("category_small") or request.args.get("category_small") or "").strip()
-    purpose = (data.get("purpose") or request.args.get("purpose") or "").strip()
-    category_large = (data.get("category_large") or request.args.get("category_large") or "").strip()
-    role = (data.get("role") or request.args.get("role") or "").strip()
-    return {
-        "region": region,
-        "gu_name": gu_name,
-        "category_small": category_small,
-        "purpose": purpose,
-        "category_large": category_large,
-        "role": role,
-    }
+    return normalize_report_params(request.get_json(silent=True) or {}, request.args)
 
 # ✅ '구 동'으로 들어와도 '동'만 뽑아 쓰도록 정규화
 def _dong_only(name: str, gu: str) -> str:
@@ -87,85 +82,165 @@ def _parse_sections(text: str):
 
     return sections
 
-@bp.route("/report", methods=["GET", "POST"])
-def report():
+REQUIRED_PARAMS = ["region", "gu_name", "category_small", "purpose"]
+PARAMS_HINT = "예: ?region=연남동&gu_name=마포구&category_small=한식음식점&purpose=창업 준비"
+
+
+def _resolve_report_inputs(params):
+    """
+    요청 파라미터 → generate_report/stream_report 인자.
+    return: (kwargs, None) 또는 (None, (응답 body, status))
+    """
+    missing = [k for k in REQUIRED_PARAMS if not params[k]]
+    if missing:
+        return None, ({
+            "ok": False,
+            "error": "missing_required_params",
+            "missing": missing,
+            "hint": PARAMS_HINT,
+        }, 400)
+
+    # 입력 region 정규화: '마포구 연남동' -> '연남동'
+    region_only = _dong_only(params["region"], params["gu_name"])
+
+    engine = get_engine()  # ✅ 안전한 엔진 로드
+
+    # 1) category_large
+    large_df = pd.read_sql_query(
+        "SELECT category_large FROM subcategory_avg_operating_period_stats WHERE category_small = %s LIMIT 1",
+        engine, params=(params["category_small"],)
+    )
+    if large_df.empty:
+        return None, ({"ok": False, "error": "not_found", "detail": "category_large를 찾을 수 없음"}, 404)
+    category_large = large_df["category_large"].iloc[0]
+
+    # 2) service_code
+    code_df = pd.read_sql_query(
+        "SELECT service_code FROM service_type WHERE service_name LIKE %s LIMIT 1",
+        engine, params=(f"%{params['category_small']}%",)
+    )
+    if code_df.empty:
+        return None, ({"ok": False, "error": "not_found", "detail": "service_code를 찾을 수 없음"}, 404)
+    service_code = code_df["service_code"].iloc[0]
+
+    # 3) region_code  ← 여기서부터 region_only 사용
+    region_df = pd.read_sql_query(
+        "SELECT region_code FROM avg_operating_period_stats WHERE region_name = %s LIMIT 1",
+        engine, params=(region_only,)
+    )
+    if region_df.empty:
+        return None, ({"ok": False, "error": "not_found", "detail": "region_code를 찾을 수 없음"}, 404)
+    region_code = region_df["region_code"].iloc[0]
+
+    # 4) zone_ids
+    zone_ids_df = pd.read_sql_query(
+        "SELECT zone_id FROM zone_table WHERE region_name = %s",
+        engine, params=(region_only,)
+    )
+    zone_ids = zone_ids_df["zone_id"].astype(str).tolist()
+    if not zone_ids:
+        return None, ({"ok": False, "error": "not_found", "detail": "zone_id가 없음"}, 404)
+
+    return {
+        "gu_name": params["gu_name"],
+        "region": region_only,
+        "category_large": category_large,
+        "category_small": params["category_small"],
+        "purpose": params["purpose"],
+        "region_code": region_code,
+        "service_code": service_code,
+        "zone_ids": zone_ids,
+    }, None
+
+
+def _summary(inputs):
+    return f"{inputs['gu_name']} {inputs['region']} · {inputs['category_small']} · {inputs['purpose']}"
+
+
+def build_report_response(params):
+    """
+    /api/report 본문 처리 (요청 컨텍스트 불필요 → 비동기 작업에서도 호출)
+    return: (응답 body, status)
+    """
     try:
-        params = _pick_params()
-        print("📥 /api/report params =", params)
-
-        missing = [k for k in ["region", "gu_name", "category_small", "purpose"] if not params[k]]
-        if missing:
-            return jsonify({
-                "ok": False,
-                "error": "missing_required_params",
-                "missing": missing,
-                "hint": "예: ?region=연남동&gu_name=마포구&category_small=한식음식점&purpose=창업 준비",
-            }), 400
-
-        # 입력 region 정규화: '마포구 연남동' -> '연남동'
-        region_only = _dong_only(params["region"], params["gu_name"])
-
-        engine = get_engine()  # ✅ 안전한 엔진 로드
-
-        # 1) category_large
-        large_df = pd.read_sql_query(
-            "SELECT category_large FROM subcategory_avg_operating_period_stats WHERE category_small = %s LIMIT 1",
-            engine, params=(params["category_small"],)
-        )
-        if large_df.empty:
-            return jsonify({"ok": False, "error": "not_found", "detail": "category_large를 찾을 수 없음"}), 404
-        category_large = large_df["category_large"].iloc[0]
-
-        # 2) service_code
-        code_df = pd.read_sql_query(
-            "SELECT service_code FROM service_type WHERE service_name LIKE %s LIMIT 1",
-            engine, params=(f"%{params['category_small']}%",)
-        )
-        if code_df.empty:
-            return jsonify({"ok": False, "error": "not_found", "detail": "service_code를 찾을 수 없음"}), 404
-        service_code = code_df["service_code"].iloc[0]
-
-        # 3) region_code  ← 여기서부터 region_only 사용
-        region_df = pd.read_sql_query(
-            "SELECT region_code FROM avg_operating_period_stats WHERE region_name = %s LIMIT 1",
-            engine, params=(region_only,)
-        )
-        if region_df.empty:
-            return jsonify({"ok": False, "error": "not_found", "detail": "region_code를 찾을 수 없음"}), 404
-        region_code = region_df["region_code"].iloc[0]
-
-        # 4) zone_ids
-        zone_ids_df = pd.read_sql_query(
-            "SELECT zone_id FROM zone_table WHERE region_name = %s",
-            engine, params=(region_only,)
-        )
-        zone_ids = zone_ids_df["zone_id"].astype(str).tolist()
-        if not zone_ids:
-            return jsonify({"ok": False, "error": "not_found", "detail": "zone_id가 없음"}), 404
+        inputs, error = _resolve_report_inputs(params)
+        if error:
+            return error
 
         # 리포트 생성 (텍스트/차트/존 설명)
-        report_text, chart_data, zone_ids_str, zone_texts = generate_report(
-            gu_name=params["gu_name"],
-            region=region_only,
-            category_large=category_large,
-            category_small=params["category_small"],
-            purpose=params["purpose"],
-            region_code=region_code,
-            service_code=service_code,
-            zone_ids=zone_ids,
-        )
+        report_text, chart_data, zone_ids_str, zone_texts = generate_report(**inputs)
 
         sections = _parse_sections(report_text)
 
-        return jsonify({
+        return {
             "ok": True,
-            "summary": f"{params['gu_name']} {region_only} · {params['category_small']} · {params['purpose']}",
+            "summary": _summary(inputs),
             "sections": sections,
             "chart_data": chart_data,
-            "zone_ids": [str(z) for z in zone_ids],
+            "zone_ids": [str(z) for z in inputs["zone_ids"]],
             "zone_texts": zone_texts,
             "report_text": report_text,
-        })
+        }, 200
     except Exception as e:
         print("❌ /api/report error:", e)
+        return {"ok": False, "error": "internal_error", "detail": str(e)}, 500
+
+
+@bp.route("/report", methods=["GET", "POST"])
+def report():
+    params = _pick_params()
+    print("📥 /api/report params =", params)
+    if wants_async(request.args, request.get_json(silent=True) or {}):
+        body, status = submit_response("report", build_report_response, params)
+    else:
+        body, status = build_report_response(params)
+    return jsonify(body), status
+
+
+def _json_default(o):
+    # numpy 스칼라(int64 등) → 파이썬 기본형
+    return o.item() if hasattr(o, "item") else str(o)
+
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False, default=_json_default)}\n\n"
+
+
+@bp.route("/report/stream", methods=["GET", "POST"])
+def report_stream():
+    """
+    /api/report 의 Server-Sent Events 버전.
+    event: data  → {summary, chart_data, zone_ids, zone_texts}  (DB 집계 직후)
+    event: token → {text}                                       (리포트 본문 조각)
+    event: done  → {ok, sections, report_text}
+    event: error → {ok: false, error, detail}
+    """
+    params = _pick_params()
+    print("📥 /api/report/stream params =", params)
+    try:
+        inputs, error = _resolve_report_inputs(params)
+    except Exception as e:
+        print("❌ /api/report/stream error:", e)
         return jsonify({"ok": False, "error": "internal_error", "detail": str(e)}), 500
+    if error:
+        body, status = error
+        return jsonify(body), status
+
+    def events():
+        try:
+            for event, payload in stream_report(**inputs):
+                if event == "data":
+                    yield _sse("data", {"summary": _summary(inputs), **payload})
+                elif event == "token":
+                    yield _sse("token", {"text": payload})
+                else:
+                    yield _sse("done", {"ok": True, "sections": _parse_sections(payload), "report_text": payload})
+        except Exception as e:
+            print("❌ /api/report/stream error:", e)
+            yield _sse("error", {"ok": False, "error": "internal_error", "detail": str(e)})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
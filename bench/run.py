@@ -0,0 +1,270 @@
+# bench/run.py
+"""
+핵심 파이프라인 3종(지역 추천 / 업종 추천 / 리포트) 오프라인 벤치마크.
+
+- 합성 데이터셋(bench/synth_data.py)을 내장 sqlite 에 만들고 DATABASE_URL 로 연결
+- LLM(Gemini/OpenAI)은 고정 응답 스텁으로 대체 (--llm-latency 로 지연 흉내 가능)
+- 단계별 실행 시간: 첫 실행(cold, 스냅샷 생성 포함)과 반복 실행의 min/median/max
+- 단계별 최대 메모리: tracemalloc 으로 별도 1회 측정 (시간 측정과 분리)
+- --json 으로 결과 저장, --compare 로 이전 결과와 median 비교
+
+실행 (프로젝트 루트에서):
+    python -m bench.run
+    python -m bench.run --gu 10 --categories 40 --repeat 10 --json bench/.data/before.json
+    python -m bench.run --compare bench/.data/before.json
+"""
+import os
+import sys
+import json
+import time
+import types
+import argparse
+import platform
+import shutil
+import statistics
+import tracemalloc
+from collections import OrderedDict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BENCH_DIR = os.path.join(ROOT, 'bench', '.data')
+
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'back'))
+
+from bench.synth_data import SynthSpec, add_spec_args, generate, spec_from_args
+
+STUB_TEXT = (
+    "합성 응답 요약\n합성 응답 해석\n1. 기본 지역 정보\n벤치마크용 고정 텍스트입니다.\n"
+    "👉 종합 평가\n벤치마크용 고정 평가입니다."
+)
+
+
+# ====== 환경/스텁 (ai 모듈 임포트 전에 호출) ======
+def configure_env(spec: SynthSpec, regen: bool = False) -> str:
+    tag = f"g{spec.gu}-d{spec.dongs_per_gu}-c{spec.categories}-z{spec.zones_per_dong}-s{spec.seed}"
+    data_dir = os.path.join(BENCH_DIR, tag)
+    db_path = os.path.join(data_dir, "bench.sqlite3")
+    if regen or not os.path.exists(db_path):
+        generate(db_path, spec)
+        # DB 가 바뀌면 스냅샷(테이블별 세대 디렉터리)·사전계산 점수도 다시 만들도록 통째로 삭제
+        for stale in ("cache", "precomputed"):
+            shutil.rmtree(os.path.join(data_dir, stale), ignore_errors=True)
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["CACHE_DIR"] = os.path.join(data_dir, "cache")
+    os.environ["PRECOMPUTED_DIR"] = os.path.join(data_dir, "precomputed")
+    os.environ["USE_PRECOMPUTED"] = "0"       # 전체 파이프라인 측정
+    os.environ["LLM_CACHE_ENABLED"] = "0"     # 매 실행 LLM 스텁 호출
+    os.environ["EXPORT_ARTIFACTS"] = "0"
+    os.environ.setdefault("GEMINI_API_KEY", "bench")
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    return data_dir
+
+
+def install_llm_stubs(latency: float = 0.0) -> None:
+    """google.generativeai / openai 를 고정 응답 스텁으로 교체 (네트워크/과금 없음)"""
+    def _wait():
+        if latency:
+            time.sleep(latency)
+
+    class _GenResponse:
+        text = STUB_TEXT
+
+    class _GenerativeModel:
+        def __init__(self, model_name=None, **kw):
+            self.model_name = model_name
+
+        def generate_content(self, prompt, **kw):
+            _wait()
+            return _GenResponse()
+
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = lambda **kw: None
+    genai.GenerativeModel = _GenerativeModel
+    exceptions = types.ModuleType("google.api_core.exceptions")
+    exceptions.ResourceExhausted = type("ResourceExhausted", (Exception,), {})
+    exceptions.GoogleAPIError = type("GoogleAPIError", (Exception,), {})
+    api_core = types.ModuleType("google.api_core")
+    api_core.exceptions = exceptions
+    google = sys.modules.get("google") or types.ModuleType("google")
+    google.generativeai = genai
+    google.api_core = api_core
+    sys.modules.update({
+        "google": google,
+        "google.generativeai": genai,
+        "google.api_core": api_core,
+        "google.api_core.exceptions": exceptions,
+    })
+
+    def _message(content):
+        return types.SimpleNamespace(message=types.SimpleNamespace(content=content))
+
+    def _delta(content):
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=content))])
+
+    class _Completions:
+        def create(self, **kw):
+            _wait()
+            if kw.get("stream"):
+                return iter([_delta(STUB_TEXT[i:i + 16]) for i in range(0, len(STUB_TEXT), 16)])
+            return types.SimpleNamespace(choices=[_message(STUB_TEXT)])
+
+    class OpenAI:
+        def __init__(self, **kw):
+            self.chat = types.SimpleNamespace(completions=_Completions())
+
+    openai = types.ModuleType("openai")
+    openai.OpenAI = OpenAI
+    sys.modules["openai"] = openai
+
+
+# ====== 측정 ======
+class Bench:
+    def __init__(self, repeat: int):
+        self.repeat = repeat
+        self.samples = OrderedDict()   # stage → [sec, ...] (첫 값이 cold)
+        self.peaks = {}                # stage → bytes
+
+    def time(self, stage, fn, *args, **kwargs):
+        t0 = time.perf_counter()
+        out = fn(*args, **kwargs)
+        self.samples.setdefault(stage, []).append(time.perf_counter() - t0)
+        return out
+
+    def peak(self, stage, fn, *args, **kwargs):
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        try:
+            out = fn(*args, **kwargs)
+            self.peaks[stage] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return out
+
+    def summary(self):
+        out = OrderedDict()
+        for stage, xs in self.samples.items():
+            warm = xs[1:] or xs
+            out[stage] = {
+                "cold_ms": round(xs[0] * 1000, 2),
+                "min_ms": round(min(warm) * 1000, 2),
+                "median_ms": round(statistics.median(warm) * 1000, 2),
+                "max_ms": round(max(warm) * 1000, 2),
+                "peak_mb": round(self.peaks.get(stage, 0) / 2 ** 20, 2),
+            }
+        return out
+
+
+def pick_inputs(engine):
+    """합성 DB 에서 벤치마크 입력 1세트 선택 (항상 같은 값)"""
+    import pandas as pd
+    gu = pd.read_sql("SELECT region_name, region_code FROM floating_population_stats "
+                     "WHERE length(region_code) = 5 ORDER BY region_code LIMIT 1", engine).iloc[0]
+    dong = pd.read_sql("SELECT region_name, region_code FROM avg_operating_period_stats "
+                       "WHERE region_code LIKE %s ORDER BY region_code LIMIT 1",
+                       engine, params=(f"{gu['region_code']}___",)).iloc[0]
+    cat = pd.read_sql("SELECT DISTINCT category_large, category_small FROM subcategory_store_count_stats "
+                      "ORDER BY category_small LIMIT 1", engine).iloc[0]
+    service_code = pd.read_sql("SELECT service_code FROM service_type WHERE service_name = %s",
+                               engine, params=(cat['category_small'],)).iloc[0, 0]
+    zone_ids = pd.read_sql("SELECT zone_id FROM zone_table WHERE region_name = %s",
+                           engine, params=(dong['region_name'],))['zone_id'].astype(str).tolist()
+    return {
+        "gu_name": gu['region_name'], "gu_code": str(gu['region_code']),
+        "region": dong['region_name'], "region_code": str(dong['region_code']),
+        "category_large": cat['category_large'], "category_small": cat['category_small'],
+        "service_code": service_code, "zone_ids": zone_ids, "purpose": "창업 준비",
+    }
+
+
+def run_pipelines(bench: Bench, inp: dict, measure):
+    """세 파이프라인을 단계별로 1회씩 실행. measure 는 bench.time 또는 bench.peak"""
+    from config.settings import get_engine
+    from ai import recommend_area, recommend_industry, report_ai
+
+    engine = get_engine()
+    report_args = (inp["gu_name"], inp["region"], inp["category_large"], inp["category_small"],
+                   inp["purpose"], inp["region_code"], inp["service_code"], inp["zone_ids"])
+
+    # 지역 추천
+    gu_code = measure("area.get_gu_code", recommend_area.get_gu_code, engine, inp["gu_name"])
+    tables = measure("area.load_tables", recommend_area.load_area_tables, gu_code)
+    final_result = measure("area.compute_scores", recommend_area.compute_area_scores,
+                           inp["category_small"], gu_code, tables)
+    measure("area.llm_reasons", recommend_area.generate_area_recommendations,
+            final_result, inp["gu_name"], inp["category_small"])
+    measure("area.total", recommend_area.run_recommendation, inp["category_small"], inp["gu_name"])
+
+    # 업종 추천
+    measure("industry.compute_scores", recommend_industry.compute_industry_scores,
+            inp["region"], inp["region_code"])
+    measure("industry.total", recommend_industry.run_industry_recommendation, inp["region"], inp["gu_name"])
+
+    # 리포트
+    measure("report.collect_data", report_ai.collect_report_data, *report_args)
+    measure("report.total", report_ai.generate_report, *report_args)
+
+
+def print_summary(summary, baseline=None):
+    header = f"{'stage':<26}{'cold':>10}{'min':>10}{'median':>10}{'max':>10}{'peakMB':>9}"
+    if baseline:
+        header += f"{'Δmedian':>10}"
+    print(header)
+    print("-" * len(header))
+    for stage, s in summary.items():
+        line = f"{stage:<26}{s['cold_ms']:>10.1f}{s['min_ms']:>10.1f}{s['median_ms']:>10.1f}{s['max_ms']:>10.1f}{s['peak_mb']:>9.1f}"
+        if baseline:
+            prev = baseline.get(stage, {}).get("median_ms")
+            line += f"{(s['median_ms'] - prev) / prev * 100:>+9.1f}%" if prev else f"{'-':>10}"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="핵심 파이프라인 오프라인 벤치마크 (합성 데이터 + LLM 스텁)")
+    add_spec_args(parser)
+    parser.add_argument('--repeat', type=int, default=5, help="cold 실행 이후 반복 횟수")
+    parser.add_argument('--llm-latency', type=float, default=0.0, help="LLM 스텁 응답 지연(초)")
+    parser.add_argument('--regen', action='store_true', help="합성 DB 다시 생성")
+    parser.add_argument('--no-memory', action='store_true', help="tracemalloc 측정 생략")
+    parser.add_argument('--json', help="결과 저장 경로")
+    parser.add_argument('--compare', help="이전 --json 결과와 median 비교")
+    args = parser.parse_args(argv)
+
+    spec = spec_from_args(args)
+    configure_env(spec, regen=args.regen)
+    install_llm_stubs(args.llm_latency)
+
+    from config.settings import get_engine
+    inp = pick_inputs(get_engine())
+    print(f"🎯 입력: {inp['gu_name']} / {inp['region']} / {inp['category_small']} (zones {len(inp['zone_ids'])})")
+
+    bench = Bench(args.repeat)
+    for _ in range(1 + args.repeat):
+        run_pipelines(bench, inp, bench.time)
+    if not args.no_memory:
+        run_pipelines(bench, inp, bench.peak)
+
+    summary = bench.summary()
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["stages"]
+    print_summary(summary, baseline)
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "spec": vars(spec),
+                "repeat": args.repeat,
+                "llm_latency": args.llm_latency,
+                "python": platform.python_version(),
+                "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "stages": summary,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json}")
+    return summary
+
+
+if __name__ == '__main__':
+    main()
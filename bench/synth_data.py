@@ -0,0 +1,219 @@
+# bench/synth_data.py
+"""
+벤치마크용 합성 데이터셋 생성기 (운영 MySQL 스키마와 같은 테이블/컬럼, 내장 sqlite 에 적재).
+
+규모는 구 수 × 구당 행정동 수 × 업종 수 × 행정동당 상권(zone) 수로 조절하고,
+같은 seed 면 항상 같은 데이터가 만들어진다 (최적화 전/후 비교용).
+
+실행 (프로젝트 루트에서):
+    python -m bench.synth_data bench/.data/bench.sqlite3 --gu 5 --dongs-per-gu 8 --categories 20
+"""
+import os
+import argparse
+from dataclasses import dataclass
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+YEARS = (2022, 2023, 2024)
+STAT_YEARS = (2022, 2023, 2024, 2025)
+QUARTERS = (1, 2, 3, 4)
+GENDERS = ("남성", "여성")
+AGE_GROUPS = ("20", "30", "40", "50")
+DAYS = ("월", "화", "수", "목", "금", "토", "일")
+TIME_RANGES = ("00~06", "06~11", "11~14", "14~17", "17~21", "21~24")
+
+
+@dataclass
+class SynthSpec:
+    gu: int = 5
+    dongs_per_gu: int = 8
+    categories: int = 20
+    zones_per_dong: int = 3
+    seed: int = 42
+
+
+@dataclass
+class SynthInfo:
+    """생성된 키 목록 (벤치마크 입력 선택용)"""
+    gus: pd.DataFrame        # region_name, region_code
+    dongs: pd.DataFrame      # region_name, region_code, gu_name
+    categories: pd.DataFrame # service_code, service_name, category_large
+    zones: pd.DataFrame      # zone_id, zone_name, region_name
+
+
+def _grid(**axes) -> pd.DataFrame:
+    """축들의 데카르트 곱 → DataFrame (축 이름이 컬럼)"""
+    return pd.DataFrame(list(product(*axes.values())), columns=list(axes.keys()))
+
+
+def _keys(spec: SynthSpec) -> SynthInfo:
+    gus = pd.DataFrame({
+        "region_name": [f"합성{i + 1}구" for i in range(spec.gu)],
+        "region_code": [str(11110 + 10 * i) for i in range(spec.gu)],
+    })
+    dongs = pd.DataFrame([
+        {"region_name": f"가상{i + 1}-{j + 1}동", "region_code": f"{gu_code}{500 + 5 * j:03d}", "gu_name": gu_name}
+        for i, (gu_name, gu_code) in enumerate(zip(gus["region_name"], gus["region_code"]))
+        for j in range(spec.dongs_per_gu)
+    ])
+    categories = pd.DataFrame({
+        "service_code": [f"CS1{k:05d}" for k in range(spec.categories)],
+        "service_name": [f"합성업종{k + 1}" for k in range(spec.categories)],
+        "category_large": [f"대분류{k % 4 + 1}" for k in range(spec.categories)],
+    })
+    zones = pd.DataFrame([
+        {"zone_id": 3000000 + n, "zone_name": f"{dong}상권{z + 1}", "region_name": dong}
+        for n, (dong, z) in enumerate(product(dongs["region_name"], range(spec.zones_per_dong)))
+    ])
+    return SynthInfo(gus, dongs, categories, zones)
+
+
+def build_tables(spec: SynthSpec):
+    """{테이블명: DataFrame} 과 SynthInfo 반환"""
+    rng = np.random.default_rng(spec.seed)
+    info = _keys(spec)
+    regions = pd.concat([info.gus, info.dongs[["region_name", "region_code"]]], ignore_index=True)
+    periods = list(product(STAT_YEARS, QUARTERS))
+
+    def uniform(n, lo, hi):
+        return rng.uniform(lo, hi, n).round(2)
+
+    def per_region_period():
+        df = _grid(r=range(len(regions)), p=range(len(periods)))
+        out = regions.iloc[df["r"]].reset_index(drop=True)
+        out["year"] = [periods[p][0] for p in df["p"]]
+        out["quarter"] = [periods[p][1] for p in df["p"]]
+        return out
+
+    def per_region_category_period():
+        df = _grid(r=range(len(regions)), c=range(len(info.categories)), p=range(len(periods)))
+        out = regions.iloc[df["r"]].reset_index(drop=True)
+        cats = info.categories.iloc[df["c"]].reset_index(drop=True)
+        out["category_large"] = cats["category_large"]
+        out["category_small"] = cats["service_name"]
+        out["year"] = [periods[p][0] for p in df["p"]]
+        out["quarter"] = [periods[p][1] for p in df["p"]]
+        return out
+
+    tables = {}
+
+    # ── 지역 단위 통계 ────────────────────────────────────────────────────
+    df = per_region_period()
+    tables["floating_population_stats"] = df.assign(
+        floating_population=uniform(len(df), 1e3, 9e4),
+        residential_population=uniform(len(df), 10, 200),
+        working_population=uniform(len(df), 10, 200),
+    )
+    df = per_region_period()
+    tables["rental_price_stats"] = df.assign(
+        rent_total=uniform(len(df), 5e4, 2e5),
+        rent_first_floor=uniform(len(df), 1e5, 2.5e5),
+        rent_other_floors=uniform(len(df), 5e4, 1.2e5),
+    )
+    df = per_region_period()
+    tables["startup_survival_rate"] = df.assign(
+        survival_rate_1yr=uniform(len(df), 60, 95),
+        survival_rate_3yr=uniform(len(df), 40, 70),
+        survival_rate_5yr=uniform(len(df), 20, 50),
+    )
+    yearly = _grid(r=range(len(regions)), year=STAT_YEARS)
+    base = regions.iloc[yearly["r"]].reset_index(drop=True).assign(year=yearly["year"].to_numpy())
+    tables["openclose_stats"] = base.assign(
+        num_open=rng.integers(1, 40, len(base)), num_close=rng.integers(1, 40, len(base)),
+    )
+    franchise = rng.integers(10, 90, len(base))
+    nonfranchise = rng.integers(100, 800, len(base))
+    tables["store_count_stats"] = base.assign(
+        store_total=franchise + nonfranchise, store_franchise=franchise, store_nonfranchise=nonfranchise,
+    )
+    tables["avg_operating_period_stats"] = regions.copy()
+
+    # ── 업종(소분류) 단위 통계 ─────────────────────────────────────────────
+    df = per_region_category_period()
+    tables["subcategory_avg_operating_period_stats"] = pd.concat([
+        df.assign(indicator="avg_operating_years_10", value=uniform(len(df), 1, 10)),
+        df.assign(indicator="avg_operating_years_30", value=uniform(len(df), 1, 30)),
+    ], ignore_index=True)
+    df = per_region_category_period()
+    tables["subcategory_store_count_stats"] = df.assign(indicator="store_total", value=uniform(len(df), 1, 300))
+    df = per_region_category_period()
+    tables["subcategory_startup_survival"] = df.assign(
+        survival_1yr=uniform(len(df), 60, 95), survival_3yr=uniform(len(df), 40, 70), survival_5yr=uniform(len(df), 20, 50),
+    )
+    df = per_region_category_period()
+    tables["subcategory_openclose_stats"] = df.assign(
+        num_open=uniform(len(df), 0, 30), num_close=uniform(len(df), 0, 30),
+    )
+
+    # ── 상권(zone) 단위 연도별 매출 ────────────────────────────────────────
+    tables["zone_table"] = info.zones
+    tables["service_type"] = info.categories[["service_code", "service_name"]]
+    zone_region = dict(zip(info.zones["zone_id"], info.zones["region_name"]))
+    cat_name = dict(zip(info.categories["service_code"], info.categories["service_name"]))
+
+    for year in YEARS:
+        base = _grid(zone_id=info.zones["zone_id"], service_code=info.categories["service_code"], quarter=QUARTERS)
+        base.insert(2, "year", year)
+        names = base["service_code"].map(cat_name)
+        tables[f"zone_store_count_{year}"] = base.assign(service_name=names, count=rng.integers(1, 30, len(base)))
+        tables[f"sales_summary_{year}"] = base.assign(
+            service_name=names,
+            region_name=base["zone_id"].map(zone_region),
+            monthly_sales=uniform(len(base), 1e6, 1e8),
+            monthly_count=uniform(len(base), 100, 5000),
+            weekday_sales=uniform(len(base), 1e6, 5e7),
+            weekend_sales=uniform(len(base), 1e6, 5e7),
+        )
+
+        def expand(col, values):
+            out = base.loc[base.index.repeat(len(values))].reset_index(drop=True)
+            out[col] = np.tile(values, len(base))
+            return out.assign(sales_amount=uniform(len(out), 1e5, 1e7))
+
+        gender = expand("gender", GENDERS).assign(age_group="전체")
+        age = expand("age_group", AGE_GROUPS).assign(gender="전체")
+        tables[f"sales_by_gender_age_{year}"] = pd.concat([gender, age], ignore_index=True)
+        tables[f"sales_by_day_{year}"] = expand("day_of_week", DAYS)
+        tables[f"sales_by_hour_{year}"] = expand("time_range", TIME_RANGES)
+
+    return tables, info
+
+
+def generate(db_path: str, spec: SynthSpec = SynthSpec()) -> SynthInfo:
+    """db_path(sqlite)에 합성 테이블을 새로 생성 (기존 파일은 덮어씀)"""
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    tables, info = build_tables(spec)
+    engine = create_engine(f"sqlite:///{os.path.abspath(db_path)}")
+    with engine.begin() as conn:
+        for name, df in tables.items():
+            df.to_sql(name, conn, index=False, chunksize=50000)
+    engine.dispose()
+    rows = sum(len(df) for df in tables.values())
+    print(f"🧪 합성 데이터 생성: {db_path} ({len(tables)} tables, {rows:,} rows)")
+    return info
+
+
+def add_spec_args(parser: argparse.ArgumentParser) -> None:
+    defaults = SynthSpec()
+    parser.add_argument('--gu', type=int, default=defaults.gu, help="구 수")
+    parser.add_argument('--dongs-per-gu', type=int, default=defaults.dongs_per_gu, help="구당 행정동 수")
+    parser.add_argument('--categories', type=int, default=defaults.categories, help="업종 소분류 수")
+    parser.add_argument('--zones-per-dong', type=int, default=defaults.zones_per_dong, help="행정동당 상권 수")
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+
+
+def spec_from_args(args) -> SynthSpec:
+    return SynthSpec(args.gu, args.dongs_per_gu, args.categories, args.zones_per_dong, args.seed)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 데이터셋 생성")
+    parser.add_argument('db_path')
+    add_spec_args(parser)
+    args = parser.parse_args()
+    generate(args.db_path, spec_from_args(args))
@@ -22,14 +22,47 @@ function ChatbotPanel() {
     setMessages(prev => [...prev, userMessage]);
     setInput('');
 
+    // 마지막 bot 말풍선 내용 갱신 (스트리밍 토큰 누적)
+    const updateBotMessage = (content) =>
+      setMessages(prev => [...prev.slice(0, -1), { role: 'bot', content }]);
+
     try {
-      const res = await fetch('http://localhost:5001/api/chat', {
+      const res = await fetch('http://localhost:5001/api/chat/stream', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ messages: [...messages, userMessage] }),
       });
-      const data = await res.json();
-      setMessages(prev => [...prev, { role: 'bot', content: data.response }]);
+      if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`);
+
+      setMessages(prev => [...prev, { role: 'bot', content: '' }]);
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let answer = '';
+
+      // SSE: "event: x\ndata: {...}\n\n" 블록 단위로 파싱
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const blocks = buffer.split('\n\n');
+        buffer = blocks.pop();
+        for (const block of blocks) {
+          const event = (block.match(/^event: (.*)$/m) || [])[1];
+          const data = (block.match(/^data: (.*)$/m) || [])[1];
+          if (!event || !data) continue;
+          const payload = JSON.parse(data);
+          if (event === 'token') {
+            answer += payload.text;
+            updateBotMessage(answer);
+          } else if (event === 'done') {
+            answer = payload.response;
+            updateBotMessage(answer);
+          } else if (event === 'error') {
+            updateBotMessage(answer || payload.error);
+          }
+        }
+      }
     } catch (err) {
       console.error('챗봇 응답 실패:', err);
     }
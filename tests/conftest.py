@@ -0,0 +1,20 @@
+# tests/conftest.py
+"""
+공용 pytest 설정.
+
+- 프로젝트 루트(ai 패키지)와 back/(config, result_cache) 를 import 경로에 등록
+- CACHE_DIR 을 임시 디렉터리로 돌려 테스트가 back/cache 를 건드리지 않게 함
+
+실행 (프로젝트 루트에서):
+    python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+for path in (ROOT, os.path.join(ROOT, 'back')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="test-cache-"))
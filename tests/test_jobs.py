@@ -0,0 +1,90 @@
+# tests/test_jobs.py
+"""JobManager: 완료 결과 조회, 실패 처리, 작업이 끝나는 도중의 폴링/정리"""
+import sys
+import threading
+import time
+
+from jobs import Job, JobManager
+
+
+def _wait(manager, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job is None or job.finished:
+            return job
+        time.sleep(0.005)
+    raise AssertionError("작업이 끝나지 않음")
+
+
+def test_done_job_has_result_and_finished_at():
+    manager = JobManager(workers=1)
+    job = manager.submit("area", lambda x: ({"value": x}, 200), 7)
+    job = _wait(manager, job.id)
+    assert job.status == "done"
+    assert (job.body, job.http_status) == ({"value": 7}, 200)
+    assert job.finished_at is not None and job.finished_at >= job.started_at
+
+
+def test_failed_job_is_reported():
+    manager = JobManager(workers=1)
+
+    def boom():
+        raise ValueError("실패")
+
+    job = _wait(manager, manager.submit("report", boom).id)
+    assert job.status == "error" and job.error == "실패"
+    assert job.http_status == 500 and job.body["error"] == "internal_error"
+
+
+def test_polling_while_jobs_finish():
+    """완료 직전/직후 창에서 get/stats/submit 이 정리(_purge)를 돌려도 예외가 없어야 함"""
+    manager = JobManager(workers=8, max_queued=10_000, retention_sec=0)
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)   # 스레드 전환을 잦게 해서 상태/finished_at 대입 사이 창을 드러냄
+    stop = threading.Event()
+    errors = []
+    job_ids = []
+
+    def poll():
+        while not stop.is_set():
+            try:
+                manager.stats()
+                for job_id in list(job_ids[-20:]):
+                    job = manager.get(job_id)
+                    if job is not None and job.finished:
+                        assert job.finished_at is not None and job.http_status is not None
+            except Exception as e:   # TypeError 등 → 실패로 기록
+                errors.append(e)
+
+    pollers = [threading.Thread(target=poll) for _ in range(4)]
+    for t in pollers:
+        t.start()
+    try:
+        for i in range(2000):
+            job_ids.append(manager.submit("area", lambda i=i: ({"i": i}, 200)).id)
+    except Exception as e:
+        errors.append(e)
+    finally:
+        time.sleep(0.2)
+        stop.set()
+        for t in pollers:
+            t.join(5)
+        sys.setswitchinterval(switch_interval)
+
+    assert errors == []
+    assert manager.stats()["jobs"].get("running", 0) == 0
+
+
+def test_purge_skips_job_without_finished_at():
+    """완료 상태인데 finished_at 이 아직 없는 작업이 있어도 조회/제출이 실패하지 않음"""
+    manager = JobManager(workers=1, retention_sec=0)
+    job = manager.submit("area", lambda: ({}, 200))
+    _wait(manager, job.id)
+
+    pending = Job("report")
+    pending.status = "done"
+    manager._jobs[pending.id] = pending
+    assert manager.get(pending.id) is pending
+    manager.stats()
+    manager.submit("area", lambda: ({}, 200))
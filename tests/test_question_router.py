@@ -0,0 +1,65 @@
+# tests/test_question_router.py
+"""question_router.NaiveBayes 학습/예측과 JSON 저장 왕복"""
+import json
+
+import pytest
+
+from ai.chat_ai.question_router import NaiveBayes, char_ngrams
+
+SAMPLES = [
+    ("연남동 임대료 얼마야", "수치"),
+    ("서교동 유동인구는 몇 명이야", "수치"),
+    ("망원동 카페 평균 매출 알려줘", "수치"),
+    ("연남동이랑 서교동 중에 어디가 더 좋아", "비교"),
+    ("합정동보다 망원동 임대료가 싼가", "비교"),
+    ("두 동네 매출 차이 비교해줘", "비교"),
+    ("인스타 마케팅 어떻게 해야 돼", "전략아이디어"),
+    ("카페 홍보 전략 추천해줘", "전략아이디어"),
+    ("고객 유치 이벤트 아이디어 줘", "전략아이디어"),
+]
+LABELS = ("수치", "비교", "전략아이디어")
+
+
+@pytest.fixture
+def model():
+    texts, labels = zip(*SAMPLES)
+    return NaiveBayes(LABELS).fit(texts, labels)
+
+
+def test_char_ngrams_normalizes():
+    assert char_ngrams("A  B") == char_ngrams(" a b ")
+    assert " a" in char_ngrams("ab") and "ab " in char_ngrams("ab")
+
+
+@pytest.mark.parametrize("question, label", [
+    ("합정동 임대료 얼마야", "수치"),
+    ("연남동이랑 망원동 어디가 더 좋아", "비교"),
+    ("인스타 홍보 아이디어 추천해줘", "전략아이디어"),
+])
+def test_predicts_trained_label(model, question, label):
+    proba = model.predict_proba(question)
+    assert max(proba, key=proba.get) == label
+    assert sum(proba.values()) == pytest.approx(1.0)
+
+
+def test_unknown_text_is_uniform(model):
+    proba = model.predict_proba("★★★")
+    assert all(p == pytest.approx(1 / len(LABELS)) for p in proba.values())
+
+
+def test_untrained_model_is_uniform():
+    proba = NaiveBayes(LABELS).predict_proba("연남동 임대료 얼마야")
+    assert all(p == pytest.approx(1 / len(LABELS)) for p in proba.values())
+
+
+def test_ignores_unknown_labels(model):
+    before = model.samples
+    model.fit(["무시될 질문"], ["없는라벨"])
+    assert model.samples == before == len(SAMPLES)
+
+
+def test_json_round_trip(model):
+    restored = NaiveBayes.from_dict(json.loads(json.dumps(model.to_dict(), ensure_ascii=False)))
+    assert restored.vocab == model.vocab
+    for question, _ in SAMPLES:
+        assert restored.predict_proba(question) == pytest.approx(model.predict_proba(question))
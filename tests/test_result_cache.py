@@ -0,0 +1,103 @@
+# tests/test_result_cache.py
+"""ResultCache: 적중, single-flight, 캐시 제외, stale-while-revalidate, LRU"""
+import threading
+import time
+
+import pytest
+
+from result_cache import ResultCache
+
+
+def test_hit_after_miss():
+    cache = ResultCache(ttl_sec=60)
+    calls = []
+    compute = lambda: calls.append(1) or "value"
+
+    assert cache.get_or_compute("k", compute) == "value"
+    assert cache.get_or_compute("k", compute) == "value"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_single_flight_coalesces_concurrent_requests():
+    cache = ResultCache(ttl_sec=60)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    owner = threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+    owner.start()
+    started.wait(5)
+    waiters = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+               for _ in range(3)]
+    for t in waiters:
+        t.start()
+    while cache.stats()["coalesced"] < 3:
+        time.sleep(0.01)
+    release.set()
+    for t in [owner, *waiters]:
+        t.join(5)
+
+    assert results == ["value"] * 4
+    assert len(calls) == 1
+
+
+def test_not_cacheable_is_recomputed():
+    cache = ResultCache(ttl_sec=60)
+    calls = []
+    compute = lambda: calls.append(1) or []
+
+    cache.get_or_compute("k", compute, cacheable=bool)
+    cache.get_or_compute("k", compute, cacheable=bool)
+    assert len(calls) == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_exception_is_shared_and_not_cached():
+    cache = ResultCache(ttl_sec=60)
+
+    def boom():
+        raise RuntimeError("실패")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("k", boom)
+    assert cache.stats()["inflight"] == 0
+    assert cache.get_or_compute("k", lambda: "ok") == "ok"
+
+
+def test_stale_value_returned_while_refreshing():
+    cache = ResultCache(ttl_sec=0, stale_sec=60)
+    cache.get_or_compute("k", lambda: "old")
+    time.sleep(0.01)
+
+    refreshed = threading.Event()
+
+    def refresh():
+        refreshed.set()
+        return "new"
+
+    assert cache.get_or_compute("k", refresh) == "old"
+    assert refreshed.wait(5)
+    deadline = time.time() + 5
+    while cache.stats()["inflight"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.get_or_compute("k", lambda: "newer") == "new"
+    assert cache.stats()["stale_hits"] == 2
+
+
+def test_lru_eviction():
+    cache = ResultCache(ttl_sec=60, max_entries=2)
+    for key in ("a", "b"):
+        cache.get_or_compute(key, lambda: key)
+    cache.get_or_compute("a", lambda: "a")      # a 를 최근으로
+    cache.get_or_compute("c", lambda: "c")      # b 삭제
+    calls = []
+    cache.get_or_compute("b", lambda: calls.append(1) or "b")
+    assert calls == [1]
+    assert cache.stats()["entries"] == 2
@@ -0,0 +1,81 @@
+# tests/test_scoring.py
+"""ScoreMatrix/rerank 가 기존 MinMaxScaler + 가중합 경로와 같은 점수·순서를 내는지 확인"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai.scoring import ScoreMatrix, norm_columns, rerank, validate_weights
+
+COLUMNS = ['점포수', '3년 생존율(%)', '평균 폐업수', '2024_평균매출']
+WEIGHTS = {'점포수': 0.3, '3년 생존율(%)': 0.2, '평균 폐업수': -0.1, '2024_평균매출': 0.6}
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame(rng.uniform(0, 100, size=(40, len(COLUMNS))), columns=COLUMNS)
+    df.loc[3, '점포수'] = np.nan          # 결측 → 0
+    df.loc[5, '2024_평균매출'] = np.inf   # inf → 0
+    df['평균 폐업수'] = 4.0                # 값이 모두 같은 지표 → 0
+    df['업종명'] = [f"업종{i}" for i in range(len(df))]
+    return df
+
+
+def _legacy_scores(df):
+    """기존 경로: MinMaxScaler 정규화 후 norm_* 열 가중합"""
+    preprocessing = pytest.importorskip("sklearn.preprocessing")
+    clean = df[COLUMNS].replace([np.inf, -np.inf], np.nan).fillna(0)
+    normalized = preprocessing.MinMaxScaler().fit_transform(clean)
+    return normalized, normalized @ np.array([WEIGHTS[c] for c in COLUMNS])
+
+
+def test_fit_matches_minmax_scaler(frame):
+    normalized, scores = _legacy_scores(frame)
+    matrix = ScoreMatrix.fit(frame, COLUMNS)
+    np.testing.assert_allclose(matrix.values, normalized)
+    np.testing.assert_allclose(matrix.score(WEIGHTS), scores)
+
+
+def test_rerank_matches_legacy_order(frame):
+    _, scores = _legacy_scores(frame)
+    expected = frame.assign(score=scores).sort_values('score', ascending=False)['업종명'].tolist()
+
+    out = rerank(frame, COLUMNS, WEIGHTS, 'score')
+    assert out['업종명'].tolist() == expected
+    assert rerank(frame, COLUMNS, WEIGHTS, 'score', top_n=5)['업종명'].tolist() == expected[:5]
+
+
+def test_rerank_reuses_stored_normalization(frame):
+    """norm_* 열이 있으면 잘린 후보 집합에서도 원래 정규화를 그대로 씀"""
+    matrix = ScoreMatrix.fit(frame, COLUMNS)
+    stored = pd.concat([frame, matrix.normalized_frame()], axis=1)
+    subset = stored.iloc[10:20]
+
+    out = rerank(subset, COLUMNS, WEIGHTS, 'score')
+    expected = dict(zip(frame['업종명'], matrix.score(WEIGHTS)))
+    np.testing.assert_allclose(out['score'], [expected[n] for n in out['업종명']])
+    assert set(norm_columns(COLUMNS)) <= set(out.columns)
+
+
+def test_score_many_matches_repeated_score(frame):
+    matrix = ScoreMatrix.fit(frame, COLUMNS)
+    weight_sets = [WEIGHTS, {'점포수': 1.0}, {'2024_평균매출': 0.5, '3년 생존율(%)': -0.2}, {}]
+
+    scores = matrix.score_many(weight_sets)
+    assert scores.shape == (len(frame), len(weight_sets))
+    for j, weights in enumerate(weight_sets):
+        np.testing.assert_allclose(scores[:, j], matrix.score(weights))
+    assert matrix.score_many([]).shape == (len(frame), 0)
+
+
+def test_fit_empty_frame():
+    matrix = ScoreMatrix.fit(pd.DataFrame(columns=COLUMNS), COLUMNS)
+    assert len(matrix) == 0
+    assert matrix.score(WEIGHTS).shape == (0,)
+
+
+def test_validate_weights():
+    assert validate_weights({'점포수': 1}, COLUMNS) == {'점포수': 1.0}
+    for bad in ({'없는지표': 1.0}, {'점포수': '1'}, {'점포수': True}, {'점포수': float('nan')}, [1.0]):
+        with pytest.raises(ValueError):
+            validate_weights(bad, COLUMNS)
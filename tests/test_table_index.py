@@ -0,0 +1,66 @@
+# tests/test_table_index.py
+"""region_range/IndexedTable 조회가 region_code 접두(구 5자리 / 동 8자리) 필터와 같은지 확인"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai.table_index import IndexedTable, region_keys, region_range
+
+CODES = ['11110', '11110515', '11110530', '11140', '11140520', '11680510', '11620685', '11']
+
+
+@pytest.fixture
+def table():
+    rows = [
+        {'region_code': code, 'category_small': cat, 'year': year, 'quarter': q, 'value': i}
+        for i, (code, cat, year, q) in enumerate(
+            (code, cat, year, q)
+            for code in CODES
+            for cat in ('커피-음료', '한식음식점', '편의점')
+            for year in (2023, 2024)
+            for q in (1, 2, 3, 4)
+        )
+    ]
+    df = pd.DataFrame(rows).sample(frac=1.0, random_state=3).reset_index(drop=True)
+    return df, IndexedTable(df)
+
+
+@pytest.mark.parametrize("prefix", ['11110', '11140', '11680', '11110515', '11620685', '99999'])
+def test_region_range_matches_prefix(prefix):
+    keys = region_keys(pd.Series(CODES))
+    lo, hi = region_range(prefix)
+    in_range = [c for c, k in zip(CODES, keys) if lo <= k < hi]
+    assert in_range == [c for c in CODES if c.startswith(prefix)]
+
+
+def test_region_range_bounds():
+    assert region_range('11110') == (11110000, 11111000)
+    assert region_range('11110515') == (11110515, 11110516)
+
+
+def _values(df):
+    return sorted(df['value'].tolist())
+
+
+@pytest.mark.parametrize("prefix", ['11110', '11140520', '11680510'])
+def test_select_region(table, prefix):
+    df, index = table
+    assert _values(index.select(region=prefix)) == _values(df[df['region_code'].str.startswith(prefix)])
+
+
+@pytest.mark.parametrize("prefix", [None, '11110', '11110530'])
+def test_select_category_region_periods(table, prefix):
+    df, index = table
+    periods = {20241, 20244}
+    got = index.select(region=prefix, category='한식음식점', periods=periods)
+
+    mask = (df['category_small'] == '한식음식점') & (df['year'] * 10 + df['quarter']).isin(periods)
+    if prefix is not None:
+        mask &= df['region_code'].str.startswith(prefix)
+    assert _values(got) == _values(df[mask])
+
+
+def test_select_unknown_category(table):
+    _, index = table
+    assert index.select(category='없는업종').empty
+    assert np.array_equal(index.positions(category='없는업종'), np.empty(0, dtype=np.int64))